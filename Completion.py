@@ -0,0 +1,18 @@
+class Completion:
+    """Signals that a statement did not simply run to its end.
+
+    `break` and `continue` return one of the two instances below from
+    `Interpreter.execute`. Blocks and ifs pass it outward until the enclosing
+    loop acts on it, which avoids raising a Python exception per jump.
+    """
+    name: str
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"Completion({self.name})"
+
+
+BREAK = Completion("break")
+CONTINUE = Completion("continue")
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from typing import Optional
+from Engine import Context, Script
+
+
+class ScriptCancelled(Exception):
+    """Raised inside a cooperative run to unwind the script after its task was cancelled."""
+
+
+class CooperativeRun:
+    """Passes control back and forth between a script thread and an event loop.
+
+    Only one side runs at a time. The loop resumes the script and blocks until
+    the script reaches its next pause point or finishes. Only then does the loop
+    yield to other tasks, and the script stays parked until it is resumed. Host
+    code running on the loop can therefore never race with the script, and a
+    cancelled task stops the script at its next pause point.
+    """
+
+    def __init__(self):
+        self.resume = threading.Event()
+        self.parked = threading.Event()
+        self.finished = False
+        self.cancelled = False
+        self.error: Optional[BaseException] = None
+
+    def pause(self) -> None:
+        self.parked.set()
+        self.resume.wait()
+        self.resume.clear()
+        if self.cancelled:
+            raise ScriptCancelled()
+
+    def run_thread(self, context: Context, script: Script, pause_every: int) -> None:
+        try:
+            self.resume.wait()
+            self.resume.clear()
+            if not self.cancelled:
+                context.execute(script, self.pause, pause_every)
+        except ScriptCancelled:
+            pass
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.finished = True
+            self.parked.set()
+
+    def step(self) -> None:
+        self.parked.clear()
+        self.resume.set()
+        self.parked.wait()
+
+    async def run(self, context: Context, script: Script, pause_every: int) -> None:
+        thread = threading.Thread(target=self.run_thread, args=(context, script, pause_every), daemon=True)
+        thread.start()
+        try:
+            while True:
+                self.step()
+                if self.finished:
+                    break
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            while not self.finished:
+                self.step()
+            raise
+        finally:
+            thread.join()
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,278 @@
+from typing import Any, Callable, Dict, List, Optional
+import Expr
+import Stmt
+from Scanner import Scanner
+from Token import Token, TokenType
+from Parser import Parser
+from Resolver import Resolver
+from Interpreter import Interpreter
+from NativeFunction import Arity, NativeFunction
+from Environment import Environment
+from JSClass import JSInstance
+from ResourceLimits import ResourceLimits
+from Output import CapturedOutput, Output
+from Rope import flatten
+from HostProxy import wrap
+from JSTypedArray import map_file
+from ModuleLoader import ModuleCache
+from TypeInference import TypeInference, TypeReport
+from RuntimeErrorException import RuntimeErrorException
+
+
+class Script:
+    """Parsed and resolved source that can be executed by any number of contexts.
+
+    `path` is the file the source was read from, if any. Imports are resolved
+    relative to it. `types` reports what type inference proved about it.
+    """
+    statements: List[Stmt.Stmt]
+    locals: Dict[Expr.Expr, int]
+    path: Optional[str]
+    types: Optional[TypeReport]
+
+    def __init__(self, statements: List[Stmt.Stmt], path: Optional[str] = None):
+        self.statements = statements
+        self.locals = {}
+        self.path = path
+        self.types = None
+
+    def resolve(self, expr: Expr.Expr, depth: int) -> None:
+        self.locals[expr] = depth
+
+
+class Context:
+    """An isolated execution context.
+
+    Each context owns its globals, the resolver state of the interpreter and its
+    error flags, so contexts never observe each other's variables and can be run
+    from different threads.
+    """
+
+    def __init__(self, globals: Optional[Environment] = None, limits: Optional[ResourceLimits] = None,
+                 output: Optional[Output] = None, module_cache: Optional[ModuleCache] = None):
+        self.had_error = False
+        self.had_runtime_error = False
+        # Whether compiled scripts are annotated with the types inference proves.
+        self.infer_types = True
+        # Whether compiled scripts cache loop-invariant and repeated expressions and
+        # inline calls to small functions. See Optimizer and Inliner.
+        self.optimize = False
+        self.interpreter = Interpreter(limits, globals, self, output, module_cache)
+        self.output = self.interpreter.output
+
+    def report(self, line: int, where: str, message: str) -> None:
+        self.output.write(f"[line {line}] Error{where}: {message}\n")
+        self.output.flush()
+
+    def error_with_token(self, token: Token, message: str) -> None:
+        if token.type == TokenType.EOF:
+            self.report(token.line, " at end", message)
+        else:
+            self.report(token.line, f" at '{token.lexeme}'", message)
+        self.had_error = True
+
+    def runtime_error(self, error: RuntimeErrorException) -> None:
+        self.output.write(f"{error.message}\n[line {error.token.line}]\n")
+        self.output.flush()
+        self.had_runtime_error = True
+
+    def error(self, line: int, message: str) -> None:
+        self.report(line, "", message)
+        self.had_error = True
+
+    def define(self, name: str, value: Any) -> None:
+        self.interpreter.globals.define(name, value)
+
+    def define_native(self, name: str, arity: Arity, function: Callable[..., Any], pure: bool = False,
+                      with_interpreter: bool = False) -> None:
+        self.interpreter.define_native(name, arity, function, pure, with_interpreter)
+
+    def bind(self, name: str, value: Any, writable: bool = True) -> None:
+        """Exposes a host dict, list or buffer to scripts as `name` without copying it."""
+        self.define(name, wrap(value, writable))
+
+    def map_file(self, name: str, path: str, kind: str = "Uint8Array", writable: bool = False) -> None:
+        """Exposes a memory-mapped file to scripts as the typed array `name`."""
+        self.define(name, map_file(path, kind, writable))
+
+    def get(self, name: str) -> Any:
+        return flatten(self.interpreter.globals.values[name])
+
+    def compile(self, source: str, path: Optional[str] = None) -> Optional[Script]:
+        self.had_error = False
+
+        tokens = Scanner(source, self).scan_tokens()
+        script = Script(Parser(tokens, self).parse(), path)
+
+        if self.had_error:
+            return None
+
+        try:
+            Resolver(script).resolve(script.statements)
+        except RuntimeErrorException as e:
+            self.error_with_token(e.token, e.message)
+
+        if self.had_error:
+            return None
+
+        if self.optimize:
+            # Optimizing is opt-in, so runs that do not ask for it never load the optimizer.
+            from Optimizer import Optimizer
+            from Inliner import Inliner
+            Optimizer(script.locals).optimize(script.statements)
+            Inliner(script.locals).inline(script.statements)
+            # The passes add locals and nodes of their own, so the distances are worked out again.
+            script.locals.clear()
+            Resolver(script).resolve(script.statements)
+
+        if self.infer_types:
+            script.types = TypeInference(script.locals).infer(script.statements)
+        return script
+
+    def execute(self, script: Script, pause=None, pause_every: int = 0) -> None:
+        self.had_runtime_error = False
+        self.interpreter.locals.update(script.locals)
+        self.interpreter.module_path = script.path
+        self.interpreter.interpret(script.statements, pause, pause_every)
+
+    def run(self, source: str, path: Optional[str] = None) -> None:
+        self.had_runtime_error = False
+        script = self.compile(source, path)
+        if script is not None:
+            self.execute(script)
+
+    async def run_async(self, source: str, pause_every: int = 1000) -> None:
+        """Runs `source` in slices of `pause_every` steps, yielding to the event loop between slices.
+
+        Each slice blocks the loop while it runs. A context must not be run again
+        while one of its runs is still in progress.
+        """
+        self.had_runtime_error = False
+        script = self.compile(source)
+        if script is not None:
+            # asyncio takes longer to import than the rest of the engine, so only async runs load it.
+            from CooperativeRun import CooperativeRun
+            await CooperativeRun().run(self, script, pause_every)
+
+
+# Bumped whenever a change to the AST or the runtime classes makes older snapshot files unreadable.
+SNAPSHOT_VERSION = 5
+
+
+class Snapshot:
+    """A fully initialized global environment that can be saved to a file and restored by an Engine.
+
+    A snapshot holds the builtins and whatever an optional prelude script left
+    in the globals, together with the resolved locals of the prelude so that
+    the functions it defined keep working. Loading one unpickles these objects
+    instead of rebuilding the builtins and scanning, parsing, resolving and
+    running the prelude again. Snapshot files are pickles, so only load files
+    you trust.
+    """
+    values: Dict[str, Any]
+    locals: Dict[Expr.Expr, int]
+
+    def __init__(self, values: Dict[str, Any], locals: Dict[Expr.Expr, int]):
+        self.values = values
+        self.locals = locals
+
+    @classmethod
+    def create(cls, prelude: Optional[str] = None, limits: Optional[ResourceLimits] = None) -> "Snapshot":
+        """Builds the builtins and runs `prelude` on top of them. Anything the prelude prints is discarded."""
+        output = CapturedOutput()
+        context = Context(limits=limits, output=output)
+        if prelude is not None:
+            context.run(prelude)
+            if context.had_error or context.had_runtime_error:
+                raise ValueError(f"Prelude failed: {output.getvalue().strip()}")
+        return cls(context.interpreter.globals.values, context.interpreter.locals)
+
+    def save(self, path: str) -> None:
+        import pickle
+        with open(path, "wb") as file:
+            pickle.dump(SNAPSHOT_VERSION, file)
+            pickle.dump((self.values, self.locals), file, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        import pickle
+        with open(path, "rb") as file:
+            version = pickle.load(file)
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Snapshot {path} has version {version}, expected {SNAPSHOT_VERSION}.")
+            values, locals = pickle.load(file)
+        return cls(values, locals)
+
+
+class Engine:
+    """Creates isolated contexts from a pre-initialized snapshot of the builtins.
+
+    The snapshot is built in memory unless one restored with Snapshot.load is
+    passed in. The contexts share one ModuleCache, so a module imported by many
+    scripts is compiled once per engine and evaluated once per context. With
+    `optimize`, the contexts and the module cache run the Optimizer and the
+    Inliner on what they compile.
+    """
+
+    def __init__(self, limits: Optional[ResourceLimits] = None, snapshot: Optional[Snapshot] = None,
+                 optimize: bool = False):
+        self.limits = limits
+        self.optimize = optimize
+        self.module_cache = ModuleCache(optimize)
+        self.snapshot: Optional[bytes] = None
+        if snapshot is None:
+            self.builtins = Interpreter().globals
+            self.locals: Dict[Expr.Expr, int] = {}
+        else:
+            self.builtins = None
+            self.locals = snapshot.locals
+            self.shared: List[Any] = []
+            self.snapshot = self.freeze(snapshot.values)
+
+    def freeze(self, values: Dict[str, Any]) -> bytes:
+        """Pickles the snapshot globals for create_context, keeping syntax trees and natives out of the pickle.
+
+        Those never change once created, so all the contexts share them and the
+        resolved locals of the snapshot stay valid. Everything else, such as the
+        maps, arrays and objects a prelude created, is unpickled again for each
+        context.
+        """
+        import io
+        import pickle
+        indices: Dict[int, int] = {}
+
+        def persistent_id(value: Any) -> Optional[int]:
+            if not isinstance(value, (Expr.Expr, Stmt.Stmt, NativeFunction)):
+                return None
+            if id(value) not in indices:
+                indices[id(value)] = len(self.shared)
+                self.shared.append(value)
+            return indices[id(value)]
+
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = persistent_id
+        pickler.dump(values)
+        return buffer.getvalue()
+
+    def create_context(self, output: Optional[Output] = None) -> Context:
+        if self.snapshot is not None:
+            import io
+            import pickle
+            unpickler = pickle.Unpickler(io.BytesIO(self.snapshot))
+            unpickler.persistent_load = self.shared.__getitem__
+            values = unpickler.load()
+        else:
+            # Builtin objects such as `console` are copied one level deep so that a
+            # context assigning to their fields does not leak into other contexts.
+            values = {}
+            for name, value in self.builtins.values.items():
+                if isinstance(value, JSInstance):
+                    value = value.copy()
+                values[name] = value
+        globals = Environment()
+        globals.values = values
+        context = Context(globals, self.limits, output, self.module_cache)
+        context.optimize = self.optimize
+        context.interpreter.locals.update(self.locals)
+        return context
@@ -0,0 +1,222 @@
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from Engine import Engine, Script
+from ResourceLimits import ResourceLimits
+from Output import CapturedOutput
+
+
+class JobResult:
+    """Outcome of one script: its captured output, any error and how long it took."""
+    job_id: int
+    output: str
+    error: Optional[str]
+    run_time: float
+    latency: float
+
+    def __init__(self, job_id: int, output: str, error: Optional[str], run_time: float, latency: float = 0.0):
+        self.job_id = job_id
+        self.output = output
+        self.error = error
+        self.run_time = run_time
+        self.latency = latency
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return f"JobResult({self.job_id}, ok={self.ok}, latency={self.latency:.6f})"
+
+
+class ExecutorMetrics:
+    """Throughput and latency of the jobs run by a ScriptExecutor."""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.worker_restarts = 0
+        self.elapsed = 0.0
+        self.latencies: List[float] = []
+
+    @property
+    def throughput(self) -> float:
+        if self.elapsed == 0:
+            return 0.0
+        return self.completed / self.elapsed
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def __str__(self):
+        return (f"{self.completed} jobs ({self.failed} failed) in {self.elapsed:.3f}s, "
+                f"{self.throughput:.0f} jobs/s, "
+                f"latency p50={self.latency_percentile(50) * 1000:.2f}ms "
+                f"p95={self.latency_percentile(95) * 1000:.2f}ms "
+                f"max={self.latency_percentile(100) * 1000:.2f}ms, "
+                f"{self.worker_restarts} worker restarts")
+
+
+# State of a worker process. Each worker keeps one warm engine and an LRU
+# cache of compiled scripts keyed by source text.
+_engine: Optional[Engine] = None
+_scripts: "OrderedDict[str, Script]" = OrderedDict()
+_cache_size = 0
+
+
+def _init_worker(limits: Optional[ResourceLimits], cache_size: int) -> None:
+    global _engine, _cache_size
+    _engine = Engine(limits)
+    _cache_size = cache_size
+    _scripts.clear()
+
+
+def _run_job(job_id: int, source: str, globals: Dict[str, Any]) -> JobResult:
+    start = time.perf_counter()
+    output = CapturedOutput()
+    try:
+        context = _engine.create_context(output)
+        for name, value in globals.items():
+            context.define(name, value)
+
+        script = _scripts.get(source)
+        if script is None:
+            script = context.compile(source)
+            if script is not None and _cache_size > 0:
+                _scripts[source] = script
+                if len(_scripts) > _cache_size:
+                    _scripts.popitem(last=False)
+        else:
+            _scripts.move_to_end(source)
+
+        if script is not None:
+            context.execute(script)
+    except Exception as e:
+        return JobResult(job_id, output.getvalue(), f"Internal error: {e!r}", time.perf_counter() - start)
+
+    error = None
+    if context.had_error:
+        error = "Compile error."
+    elif context.had_runtime_error:
+        error = "Runtime error."
+    return JobResult(job_id, output.getvalue(), error, time.perf_counter() - start)
+
+
+class ScriptExecutor:
+    """Runs many small independent scripts across a pool of worker processes.
+
+    Jobs are (source, globals) pairs. Results are yielded as soon as they finish,
+    not in submission order. When a worker dies, the jobs that were on the pool
+    are retried one at a time on a fresh pool, and a job that still kills its
+    worker after `max_attempts` attempts is reported as failed.
+    """
+
+    def __init__(self, workers: Optional[int] = None, limits: Optional[ResourceLimits] = None,
+                 cache_size: int = 256, max_attempts: int = 3, max_in_flight: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.limits = limits
+        self.cache_size = cache_size
+        self.max_attempts = max_attempts
+        self.max_in_flight = max_in_flight or self.workers * 4
+        self.metrics = ExecutorMetrics()
+        self.pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ScriptExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def start_pool(self) -> ProcessPoolExecutor:
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=(self.limits, self.cache_size))
+        return self.pool
+
+    def restart_pool(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        self.metrics.worker_restarts += 1
+
+    def run(self, jobs: Iterable[Tuple[str, Dict[str, Any]]]) -> Iterator[JobResult]:
+        metrics = self.metrics
+        started = time.perf_counter()
+        pending = iter(enumerate(jobs))
+        retries: List[Tuple[int, str, Dict[str, Any]]] = []
+        attempts: Dict[int, int] = {}
+        submitted_at: Dict[int, float] = {}
+        in_flight = {}
+        exhausted = False
+
+        while True:
+            if retries:
+                # Jobs that were on a pool when it broke are retried one at a
+                # time, so a job that kills its worker cannot fail the others.
+                if not in_flight:
+                    job = retries.pop()
+                    attempts[job[0]] += 1
+                    in_flight[self.start_pool().submit(_run_job, *job)] = job
+            else:
+                while not exhausted and len(in_flight) < self.max_in_flight:
+                    try:
+                        job_id, (source, globals) = next(pending)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    job = (job_id, source, globals)
+                    submitted_at[job_id] = time.perf_counter()
+                    attempts[job_id] = 1
+                    metrics.submitted += 1
+                    in_flight[self.start_pool().submit(_run_job, *job)] = job
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job = in_flight.pop(future)
+                job_id = job[0]
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    if attempts[job_id] < self.max_attempts:
+                        retries.append(job)
+                        continue
+                    result = JobResult(job_id, "", "Worker process died.", 0.0)
+                except Exception as e:
+                    # For example the job's globals could not be pickled.
+                    result = JobResult(job_id, "", f"Internal error: {e!r}", 0.0)
+
+                result.latency = time.perf_counter() - submitted_at.pop(job_id)
+                del attempts[job_id]
+                metrics.completed += 1
+                if not result.ok:
+                    metrics.failed += 1
+                metrics.latencies.append(result.latency)
+                metrics.elapsed = time.perf_counter() - started
+                yield result
+
+            if broken:
+                for future, job in in_flight.items():
+                    future.cancel()
+                    retries.append(job)
+                in_flight.clear()
+                self.restart_pool()
+
+        metrics.elapsed = time.perf_counter() - started
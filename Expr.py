@@ -5,12 +5,27 @@ class Expr:
         return visitor.visit_expr(self)
 
 class Visitor:
+    def visit_array_expr(self, expr):
+        pass
+
     def visit_assign_expr(self, expr):
         pass
 
+    def visit_cached_expr(self, expr):
+        pass
+
     def visit_call_expr(self, expr):
         pass
 
+    def visit_compoundassign_expr(self, expr):
+        pass
+
+    def visit_compoundset_expr(self, expr):
+        pass
+
+    def visit_compoundsetindex_expr(self, expr):
+        pass
+
     def visit_get_expr(self, expr):
         pass
 
@@ -20,15 +35,27 @@ class Visitor:
     def visit_grouping_expr(self, expr):
         pass
 
+    def visit_index_expr(self, expr):
+        pass
+
+    def visit_inlined_expr(self, expr):
+        pass
+
     def visit_literal_expr(self, expr):
         pass
 
     def visit_logical_expr(self, expr):
         pass
 
+    def visit_parameter_expr(self, expr):
+        pass
+
     def visit_set_expr(self, expr):
         pass
 
+    def visit_setindex_expr(self, expr):
+        pass
+
     def visit_super_expr(self, expr):
         pass
 
@@ -41,6 +68,14 @@ class Visitor:
     def visit_variable_expr(self, expr):
         pass
 
+class Array(Expr):
+    def __init__(self, bracket, elements, ):
+        self.bracket = bracket
+        self.elements = elements
+
+    def accept(self, visitor):
+        return visitor.visit_array_expr(self)
+
 class Assign(Expr):
     def __init__(self, name, value, ):
         self.name = name
@@ -49,6 +84,14 @@ class Assign(Expr):
     def accept(self, visitor):
         return visitor.visit_assign_expr(self)
 
+class Cached(Expr):
+    def __init__(self, name, expression, ):
+        self.name = name
+        self.expression = expression
+
+    def accept(self, visitor):
+        return visitor.visit_cached_expr(self)
+
 class Call(Expr):
     def __init__(self, callee, paren, arguments, has_new_keyword, ):
         self.callee = callee
@@ -59,6 +102,40 @@ class Call(Expr):
     def accept(self, visitor):
         return visitor.visit_call_expr(self)
 
+class CompoundAssign(Expr):
+    def __init__(self, name, operator, value, postfix, operation, ):
+        self.name = name
+        self.operator = operator
+        self.value = value
+        self.postfix = postfix
+        self.operation = operation
+
+    def accept(self, visitor):
+        return visitor.visit_compoundassign_expr(self)
+
+class CompoundSet(Expr):
+    def __init__(self, object, name, operator, value, postfix, ):
+        self.object = object
+        self.name = name
+        self.operator = operator
+        self.value = value
+        self.postfix = postfix
+
+    def accept(self, visitor):
+        return visitor.visit_compoundset_expr(self)
+
+class CompoundSetIndex(Expr):
+    def __init__(self, object, bracket, index, operator, value, postfix, ):
+        self.object = object
+        self.bracket = bracket
+        self.index = index
+        self.operator = operator
+        self.value = value
+        self.postfix = postfix
+
+    def accept(self, visitor):
+        return visitor.visit_compoundsetindex_expr(self)
+
 class Get(Expr):
     def __init__(self, object, name, ):
         self.object = object
@@ -68,10 +145,11 @@ class Get(Expr):
         return visitor.visit_get_expr(self)
 
 class Binary(Expr):
-    def __init__(self, left, operator, right, ):
+    def __init__(self, left, operator, right, operation, ):
         self.left = left
         self.operator = operator
         self.right = right
+        self.operation = operation
 
     def accept(self, visitor):
         return visitor.visit_binary_expr(self)
@@ -83,6 +161,24 @@ class Grouping(Expr):
     def accept(self, visitor):
         return visitor.visit_grouping_expr(self)
 
+class Index(Expr):
+    def __init__(self, object, bracket, index, ):
+        self.object = object
+        self.bracket = bracket
+        self.index = index
+
+    def accept(self, visitor):
+        return visitor.visit_index_expr(self)
+
+class Inlined(Expr):
+    def __init__(self, call, function, body, ):
+        self.call = call
+        self.function = function
+        self.body = body
+
+    def accept(self, visitor):
+        return visitor.visit_inlined_expr(self)
+
 class Literal(Expr):
     def __init__(self, value, ):
         self.value = value
@@ -99,6 +195,14 @@ class Logical(Expr):
     def accept(self, visitor):
         return visitor.visit_logical_expr(self)
 
+class Parameter(Expr):
+    def __init__(self, name, index, ):
+        self.name = name
+        self.index = index
+
+    def accept(self, visitor):
+        return visitor.visit_parameter_expr(self)
+
 class Set(Expr):
     def __init__(self, object, name, value, ):
         self.object = object
@@ -108,6 +212,16 @@ class Set(Expr):
     def accept(self, visitor):
         return visitor.visit_set_expr(self)
 
+class SetIndex(Expr):
+    def __init__(self, object, bracket, index, value, ):
+        self.object = object
+        self.bracket = bracket
+        self.index = index
+        self.value = value
+
+    def accept(self, visitor):
+        return visitor.visit_setindex_expr(self)
+
 class Super(Expr):
     def __init__(self, keyword, method, ):
         self.keyword = keyword
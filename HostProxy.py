@@ -0,0 +1,157 @@
+import mmap
+from array import array
+from typing import Any, Dict, List
+from Token import Token
+from JSArray import check_index
+from Rope import Rope
+from RuntimeErrorException import RuntimeErrorException
+
+# Buffer-protocol types wrapped automatically. Other buffers, such as NumPy
+# arrays, can be wrapped explicitly with HostBuffer.
+BUFFER_TYPES = (bytes, bytearray, memoryview, array, mmap.mmap)
+
+
+class HostProxy:
+    """Base of the views that expose host Python data to scripts without copying it.
+
+    Reads go straight to the wrapped object, and nested dicts, lists and
+    buffers are wrapped when they are read. Writes from a script change the
+    host object in place unless the proxy is read-only.
+    """
+    writable: bool
+
+    def check_writable(self, token: Token) -> None:
+        if not self.writable:
+            raise RuntimeErrorException(token, "Cannot assign to a read-only host value.")
+
+
+class HostObject(HostProxy):
+    """A host dict seen by scripts as an object whose properties are its string keys."""
+    value: Dict[str, Any]
+
+    def __init__(self, value: Dict[str, Any], writable: bool = True):
+        self.value = value
+        self.writable = writable
+
+    def __str__(self):
+        return "[object Object]"
+
+    def get(self, name: Token) -> Any:
+        try:
+            return wrap(self.value[name.lexeme], self.writable)
+        except KeyError:
+            raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
+
+    def set(self, name: Token, value: Any) -> None:
+        self.check_writable(name)
+        self.value[name.lexeme] = unwrap(value)
+
+
+class HostList(HostProxy):
+    """A host list seen by scripts as an array."""
+    value: List[Any]
+
+    def __init__(self, value: List[Any], writable: bool = True):
+        self.value = value
+        self.writable = writable
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        position = 0
+        while position < len(self.value):
+            yield wrap(self.value[position], self.writable)
+            position += 1
+
+    def get(self, name: Token) -> Any:
+        if name.lexeme == "length":
+            return len(self.value)
+        raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
+
+    def get_index(self, token: Token, index: Any) -> Any:
+        position = check_index(token, index)
+        if position < len(self.value):
+            return wrap(self.value[position], self.writable)
+        return None
+
+    def set_index(self, token: Token, index: Any, value: Any) -> None:
+        self.check_writable(token)
+        position = check_index(token, index)
+        if position >= len(self.value):
+            raise RuntimeErrorException(token, "Index is out of range of the host list.")
+        self.value[position] = unwrap(value)
+
+
+class HostBuffer(HostProxy):
+    """Any buffer-protocol object seen by scripts as an array of its elements.
+
+    Reads and writes index a memoryview of the buffer, so a script scans even
+    a very large buffer in place. Buffers with more than one dimension are
+    viewed as bytes.
+    """
+    view: memoryview
+
+    def __init__(self, value: Any, writable: bool = True):
+        view = value if isinstance(value, memoryview) else memoryview(value)
+        if view.ndim != 1:
+            view = view.cast("B")
+        self.view = view
+        self.writable = writable and not view.readonly
+
+    def __len__(self):
+        return len(self.view)
+
+    def __iter__(self):
+        return iter(self.view)
+
+    def __str__(self):
+        return f"[object HostBuffer({len(self.view)})]"
+
+    def get(self, name: Token) -> Any:
+        if name.lexeme == "length":
+            return len(self.view)
+        raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
+
+    def get_index(self, token: Token, index: Any) -> Any:
+        if type(index) is int and 0 <= index < len(self.view):
+            return self.view[index]
+        position = check_index(token, index)
+        if position < len(self.view):
+            return self.view[position]
+        return None
+
+    def set_index(self, token: Token, index: Any, value: Any) -> None:
+        self.check_writable(token)
+        position = check_index(token, index)
+        if position >= len(self.view):
+            raise RuntimeErrorException(token, "Index is out of range of the host buffer.")
+        try:
+            self.view[position] = value
+        except (TypeError, ValueError):
+            raise RuntimeErrorException(token, f"Cannot store this value in a host buffer of format '{self.view.format}'.")
+
+
+def wrap(value: Any, writable: bool = True) -> Any:
+    """Returns the script-side view of a host value. Scalars are returned as they are."""
+    kind = type(value)
+    if kind is int or kind is float or kind is str or kind is bool or value is None:
+        return value
+    if kind is dict:
+        return HostObject(value, writable)
+    if kind is list:
+        return HostList(value, writable)
+    if isinstance(value, BUFFER_TYPES):
+        return HostBuffer(value, writable)
+    return value
+
+
+def unwrap(value: Any) -> Any:
+    """Returns the host value a script value stands for when it is stored into host data."""
+    if type(value) is Rope:
+        return value.flatten()
+    if isinstance(value, (HostObject, HostList)):
+        return value.value
+    if isinstance(value, HostBuffer):
+        return value.view
+    return value
@@ -0,0 +1,114 @@
+import copy
+from typing import Any, Dict, List, Optional
+import Expr
+import Stmt
+from Optimizer import Bindings, children
+
+# Bodies with more nodes than this are left out of line, so that inlining never makes a script much bigger.
+MAX_INLINED_NODES = 16
+
+# The expressions an inlined body may be built from. Calls, writes and `this` keep a function out of line.
+INLINABLE = (Expr.Literal, Expr.Variable, Expr.Get, Expr.Index, Expr.Binary, Expr.Logical, Expr.Unary,
+             Expr.Grouping, Expr.Array)
+
+
+class Inliner:
+    """Replaces calls to small leaf functions with a copy of their body.
+
+    A function can be inlined when it is a plain function whose body is one
+    `return` of a small expression that makes no calls, assigns nothing and
+    reads no variables but its parameters and globals. Such a function is not
+    recursive and does not depend on the closure it was created in. A call is
+    inlined when its callee is a variable the resolver bound to the function's
+    declaration and it passes one argument per parameter.
+
+    The Inlined node that replaces the call still evaluates the callee, and
+    makes the call as written unless the callee is a function created from
+    that declaration, so reassigning the variable or calling a global the host
+    replaced behaves as before. Otherwise the body is evaluated with Parameter
+    nodes reading the arguments, without the Environment, the Return
+    exception and the checks of a call. Inlined calls still count towards the
+    step and call depth limits.
+
+    The inlined script has to be resolved again.
+    """
+
+    def __init__(self, locals: Dict[Expr.Expr, int]):
+        self.locals = locals
+        self.bindings = Bindings(locals)
+        # The function each variable declared by a function statement refers to. Globals are keyed by name,
+        # and a global declared by two function statements by None.
+        self.functions: Dict[Any, Optional[Stmt.Function]] = {}
+        self.inlined = 0
+
+    def inline(self, statements: List[Stmt.Stmt], module: bool = False) -> int:
+        """Inlines every call that can be inlined and returns how many were."""
+        self.bindings.analyze(statements, module)
+        for statement in statements:
+            self.find_functions(statement)
+        statements[:] = [self.rewrite(statement) for statement in statements]
+        return self.inlined
+
+    def find_functions(self, node: Any) -> None:
+        if isinstance(node, Stmt.Function) and node in self.bindings.declarations:
+            key = self.bindings.declarations[node] or node.name.lexeme
+            if key in self.functions:
+                self.functions[key] = None
+            elif self.inlinable(node):
+                self.functions[key] = node
+        for child in children(node):
+            self.find_functions(child)
+
+    def inlinable(self, function: Stmt.Function) -> bool:
+        if function.is_generator or len(function.body) != 1:
+            return False
+        statement = function.body[0]
+        if not isinstance(statement, Stmt.Return) or statement.value is None:
+            return False
+        params = {param.lexeme for param in function.params}
+        return self.leaf(statement.value, params) and self.size(statement.value) <= MAX_INLINED_NODES
+
+    def leaf(self, expr: Expr.Expr, params) -> bool:
+        if not isinstance(expr, INLINABLE):
+            return False
+        if isinstance(expr, Expr.Variable) and expr in self.locals and expr.name.lexeme not in params:
+            # A variable of an enclosing function, which the call site may not be able to see.
+            return False
+        return all(self.leaf(child, params) for child in children(expr))
+
+    def size(self, expr: Expr.Expr) -> int:
+        return 1 + sum(self.size(child) for child in children(expr))
+
+    def rewrite(self, node: Any) -> Any:
+        for name, value in vars(node).items():
+            if isinstance(value, (Expr.Expr, Stmt.Stmt)):
+                setattr(node, name, self.rewrite(value))
+            elif isinstance(value, list):
+                value[:] = [self.rewrite(element) if isinstance(element, (Expr.Expr, Stmt.Stmt)) else element
+                            for element in value]
+        if isinstance(node, Expr.Call):
+            return self.inline_call(node)
+        return node
+
+    def inline_call(self, call: Expr.Call) -> Expr.Expr:
+        callee = call.callee
+        if call.has_new_keyword or not isinstance(callee, Expr.Variable):
+            return call
+        function = self.functions.get(self.bindings.targets.get(callee) or callee.name.lexeme)
+        if function is None or len(function.params) != len(call.arguments):
+            return call
+        self.inlined += 1
+        params = {param.lexeme: index for index, param in enumerate(function.params)}
+        return Expr.Inlined(call, function, self.instantiate(function.body[0].value, params))
+
+    def instantiate(self, expr: Expr.Expr, params: Dict[str, int]) -> Expr.Expr:
+        """Copies a function body, turning the reads of its parameters into Parameter nodes."""
+        if isinstance(expr, Expr.Variable) and expr in self.locals:
+            return Expr.Parameter(expr.name, params[expr.name.lexeme])
+        clone = copy.copy(expr)
+        for name, value in vars(clone).items():
+            if isinstance(value, Expr.Expr):
+                setattr(clone, name, self.instantiate(value, params))
+            elif isinstance(value, list):
+                setattr(clone, name, [self.instantiate(element, params) for element in value])
+        return clone
@@ -1,36 +1,86 @@
-from typing import List, cast, Dict
+import os
+from functools import partial
+from typing import Any, Callable, Generator, Iterator, List, Dict, Optional
 from Token import Token, TokenType
 import Expr
 import Stmt
 from RuntimeErrorException import RuntimeErrorException
 from Environment import Environment
 from JSCallable import JSCallable
-from JSFunction import JSFunction
+from JSFunction import JSFunction, TailCall
+from MemoizedFunction import MemoizedFunction, directive_size, memoize
 from JSClass import JSClass, JSInstance
+from JSArray import JSArray
+from JSMap import JSMap, JSSet
+from JSGenerator import JSGenerator
+from HostProxy import HostBuffer, HostList, HostObject, HostProxy
+from JSTypedArray import KINDS, JSTypedArray
+from NativeFunction import Arity, NativeError, NativeFunction
+from JSMath import create_math
+from JSJson import create_json
+from NativeClass import NativeClass
+from Rope import Rope, concat, flatten, length
+import JSNumber
+from JSNumber import MAX_SAFE_INTEGER, is_number
 from Return import Return
+from Completion import BREAK, CONTINUE
+from ResourceLimits import ResourceLimits, ResourceGuard
+from Output import Output, BufferedOutput
+from Reporter import Reporter
+from ModuleLoader import Module, ModuleCache, ModuleError
 
-class Log(JSFunction):
-    def call(self, interpreter, arguments):
-        for argument in arguments:
-            print(interpreter.stringify(argument))
-        return None
+def log(interpreter, *arguments):
+    interpreter.output.write(" ".join(interpreter.stringify(argument) for argument in arguments) + "\n")
+    return None
 
-    def arity(self):
-        return 1
+# Values whose properties visit_get_expr reads through their `get` method.
+PROPERTY_OWNERS = (JSInstance, JSArray, JSTypedArray, JSMap, JSSet, JSGenerator, HostProxy)
+# Values that support get_index and set_index.
+INDEXABLE = (JSArray, JSTypedArray, HostList, HostBuffer)
 
 class Interpreter(Expr.Visitor, Stmt.Visitor):
-    _globals = Environment()
 
-    def __init__(self):
-        self.environment = self._globals
+    def __init__(self, limits: Optional[ResourceLimits] = None, globals: Optional[Environment] = None, reporter=None,
+                 output: Optional[Output] = None, module_cache: Optional[ModuleCache] = None):
+        self.globals = globals if globals is not None else Environment()
+        self.environment = self.globals
         self.locals: Dict[Expr.Expr, int] = {}
+        self.limits = limits if limits is not None else ResourceLimits()
+        self.guard = ResourceGuard(self.limits)
+        self.reporter = reporter if reporter is not None else Reporter
+        self.output = output if output is not None else BufferedOutput()
+        # Modules evaluated by this interpreter, keyed by path, and the file whose top-level code is running.
+        self.modules: Dict[str, Module] = {}
+        self.module_cache = module_cache if module_cache is not None else ModuleCache()
+        self.module_path: Optional[str] = None
+        # The arguments of the inlined call whose body is being evaluated, read by Parameter nodes.
+        self.arguments: List[Any] = []
+        if globals is None:
+            self.define_builtins()
+
+    def define_builtins(self):
         console = JSClass("Console", None, {}).call(self, [])
-        console.set(Token(TokenType.IDENTIFIER, "log", 0, 0),  Log(Stmt.Function(Token(TokenType.IDENTIFIER, "log", None, 1), [], []), self.environment, False))
-        self.environment.define("console", console)
+        console.fields["log"] = NativeFunction("log", (0, None), log, with_interpreter=True)
+        self.globals.define("console", console)
+        self.globals.define("Math", create_math())
+        self.globals.define("JSON", create_json())
+        for name, kind in KINDS.items():
+            self.globals.define(name, NativeClass(name, 1, partial(JSTypedArray.create, kind)))
+        self.globals.define("Map", NativeClass("Map", 0, JSMap))
+        self.globals.define("Set", NativeClass("Set", 0, JSSet))
+        self.globals.define("memoize", NativeFunction("memoize", (1, 2), memoize))
+
+    def define_native(self, name: str, arity: Arity, function: Callable[..., Any], pure: bool = False,
+                      with_interpreter: bool = False):
+        """Registers a Python callable as the global function `name`."""
+        self.globals.define(name, NativeFunction(name, arity, function, pure, with_interpreter))
 
     def visit_literal_expr(self, expr: Expr.Literal):
         return expr.value
 
+    def visit_grouping_expr(self, expr: Expr.Grouping):
+        return self.evaluate(expr.expression)
+
     def visit_logical_expr(self, expr: Expr.Logical):
         left = self.evaluate(expr.left)
         if expr.operator.type == TokenType.OR:
@@ -43,7 +93,7 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
 
     def visit_set_expr(self, expr: Expr.Set):
         object = self.evaluate(expr.object)
-        if not isinstance(object, JSInstance):
+        if not isinstance(object, (JSInstance, HostObject)):
             raise RuntimeErrorException(expr.name, "Only instances have fields.")
         value = self.evaluate(expr.value)
         object.set(expr.name, value)
@@ -65,7 +115,7 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         return expr.accept(self)
 
     def execute(self, stmt: Stmt.Stmt):
-        stmt.accept(self)
+        return stmt.accept(self)
 
     def resolve(self, expr: Expr.Expr, depth: int):
         self.locals[expr] = depth
@@ -75,13 +125,29 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         try:
             self.environment = environment
             for statement in statements:
-                self.execute(statement)
+                completion = self.execute(statement)
+                if completion is not None:
+                    return completion
         finally:
             self.environment = previous
 
     def visit_block_stmt(self, stmt: Stmt.Block):
-        self.execute_block(stmt.statements, Environment(self.environment))
-        return None
+        return self.execute_block(stmt.statements, Environment(self.environment))
+
+    def visit_cachescope_stmt(self, stmt: Stmt.CacheScope):
+        # The cached values are stored next to the enclosing scope's variables and
+        # cleared on entry, so that every run of the scope computes them afresh.
+        values = self.environment.values
+        for name in stmt.names:
+            values.pop(name.lexeme, None)
+        try:
+            for statement in stmt.body:
+                completion = self.execute(statement)
+                if completion is not None:
+                    return completion
+        finally:
+            for name in stmt.names:
+                values.pop(name.lexeme, None)
 
     def visit_class_stmt(self, stmt: Stmt.Class):
         superclass = None
@@ -116,12 +182,12 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         return True
 
     def check_number_operand(self, operator, operand):
-        if isinstance(operand, float):
+        if is_number(operand):
             return
-        raise RuntimeError(operator, "Operand must be a number.")
+        raise RuntimeErrorException(operator, "Operand must be a number.")
 
     def check_number_operand_2(self, operator, left, right):
-        if isinstance(left, float) and isinstance(right, float):
+        if is_number(left) and is_number(right):
             return
         raise RuntimeErrorException(operator, "Operands must be numbers.")
 
@@ -129,7 +195,7 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         right = self.evaluate(expr.right)
         if expr.operator.type == TokenType.MINUS:
             self.check_number_operand(expr.operator, right)
-            return -float(right)
+            return JSNumber.negate(right)
         elif expr.operator.type == TokenType.BANG:
             return not self.is_truthy(right)
         return None
@@ -139,47 +205,176 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
             return True
         if a is None:
             return False
+        if type(a) is bool or type(b) is bool:
+            # Python considers True == 1, JS does not.
+            return a is b
+        if type(a) is Rope:
+            a = a.flatten()
+        if type(b) is Rope:
+            b = b.flatten()
         return a == b
 
     def visit_binary_expr(self, expr: Expr.Binary):
-        left = self.evaluate(expr.left)
-        right = self.evaluate(expr.right)
-        if expr.operator.type == TokenType.MINUS:
-            self.check_number_operand_2(expr.operator, left, right)
-            return float(left) - float(right)
-        elif expr.operator.type == TokenType.PLUS:
-            if isinstance(left, float) and isinstance(right, float):
-                return float(left) + float(right)
-            elif isinstance(left, str) and isinstance(right, str):
-                return str(left) + str(right)
-
-            raise RuntimeErrorException(expr.operator, "Operands must be two numbers or two strings.")
-        elif expr.operator.type == TokenType.SLASH:
-            self.check_number_operand_2(expr.operator, left, right)
-            return float(left) / float(right)
-        elif expr.operator.type == TokenType.STAR:
-            self.check_number_operand_2(expr.operator, left, right)
-            return float(left) * float(right)
-        elif expr.operator.type == TokenType.GREATER:
-            self.check_number_operand_2(expr.operator, left, right)
-            return float(left) > float(right)
-        elif expr.operator.type == TokenType.GREATER_EQUAL:
-            self.check_number_operand_2(expr.operator, left, right)
-            return float(left) >= float(right)
-        elif expr.operator.type == TokenType.LESS:
-            self.check_number_operand_2(expr.operator, left, right)
-            return float(left) < float(right)
-        elif expr.operator.type == TokenType.LESS_EQUAL:
-            self.check_number_operand_2(expr.operator, left, right)
-            return float(left) <= float(right)
-        elif expr.operator.type == TokenType.BANG_EQUAL:
+        operation = expr.operation
+        if operation is not None:
+            # Type inference proved both operands are numbers.
+            return operation(self.evaluate(expr.left), self.evaluate(expr.right))
+        return self.binary(expr.operator, self.evaluate(expr.left), self.evaluate(expr.right))
+
+    def binary(self, token: Token, left, right):
+        operator = token.type
+        if type(left) is int and type(right) is int:
+            # Loop counters and indices: exact integer arithmetic needs no
+            # conversion until a result leaves the exact-double range.
+            if operator == TokenType.PLUS:
+                result = left + right
+            elif operator == TokenType.MINUS:
+                result = left - right
+            elif operator == TokenType.LESS:
+                return left < right
+            elif operator == TokenType.LESS_EQUAL:
+                return left <= right
+            elif operator == TokenType.GREATER:
+                return left > right
+            elif operator == TokenType.GREATER_EQUAL:
+                return left >= right
+            elif operator == TokenType.EQUAL_EQUAL:
+                return left == right
+            elif operator == TokenType.BANG_EQUAL:
+                return left != right
+            elif operator == TokenType.STAR:
+                return JSNumber.multiply(left, right)
+            elif operator == TokenType.SLASH:
+                return JSNumber.divide(left, right)
+            elif operator == TokenType.MODULO:
+                return JSNumber.modulo(left, right)
+            else:
+                return None
+            if -MAX_SAFE_INTEGER <= result <= MAX_SAFE_INTEGER:
+                return result
+            return float(result)
+
+        if operator == TokenType.MINUS:
+            self.check_number_operand_2(token, left, right)
+            return JSNumber.subtract(left, right)
+        elif operator == TokenType.PLUS:
+            if is_number(left) and is_number(right):
+                return JSNumber.add(left, right)
+            elif isinstance(left, (str, Rope)) and isinstance(right, (str, Rope)):
+                result = concat(left, right)
+                if type(result) is Rope:
+                    # A rope holds its characters without allocating them, so
+                    # charge its growth to the memory limit explicitly.
+                    self.guard.charged += length(right)
+                return result
+
+            raise RuntimeErrorException(token, "Operands must be two numbers or two strings.")
+        elif operator == TokenType.SLASH:
+            self.check_number_operand_2(token, left, right)
+            return JSNumber.divide(left, right)
+        elif operator == TokenType.STAR:
+            self.check_number_operand_2(token, left, right)
+            return JSNumber.multiply(left, right)
+        elif operator == TokenType.MODULO:
+            self.check_number_operand_2(token, left, right)
+            return JSNumber.modulo(left, right)
+        elif operator == TokenType.GREATER:
+            self.check_number_operand_2(token, left, right)
+            return left > right
+        elif operator == TokenType.GREATER_EQUAL:
+            self.check_number_operand_2(token, left, right)
+            return left >= right
+        elif operator == TokenType.LESS:
+            self.check_number_operand_2(token, left, right)
+            return left < right
+        elif operator == TokenType.LESS_EQUAL:
+            self.check_number_operand_2(token, left, right)
+            return left <= right
+        elif operator == TokenType.BANG_EQUAL:
             return not self.is_equal(left, right)
-        elif expr.operator.type == TokenType.EQUAL_EQUAL:
+        elif operator == TokenType.EQUAL_EQUAL:
             return self.is_equal(left, right)
 
         return None
 
+    def visit_compoundassign_expr(self, expr: Expr.CompoundAssign):
+        distance = self.locals.get(expr)
+        environment = self.environment.ancestor(distance) if distance is not None else self.globals
+        values = environment.values
+        name = expr.name.lexeme
+        if name not in values:
+            raise RuntimeErrorException(expr.name, f"Undefined variable '{name}'.")
+        old = values[name]
+        operation = expr.operation
+        if operation is not None:
+            value = operation(old, self.evaluate(expr.value))
+        else:
+            value = self.binary(expr.operator, old, self.evaluate(expr.value))
+        values[name] = value
+        return old if expr.postfix else value
+
+    def visit_compoundset_expr(self, expr: Expr.CompoundSet):
+        obj = self.evaluate(expr.object)
+        if isinstance(obj, HostObject):
+            old = obj.get(expr.name)
+            value = self.binary(expr.operator, old, self.evaluate(expr.value))
+            obj.set(expr.name, value)
+            return old if expr.postfix else value
+        if not isinstance(obj, JSInstance):
+            raise RuntimeErrorException(expr.name, "Only instances have fields.")
+        fields = obj.fields
+        name = expr.name.lexeme
+        old = fields[name] if name in fields else obj.get(expr.name)
+        value = self.binary(expr.operator, old, self.evaluate(expr.value))
+        fields[name] = value
+        return old if expr.postfix else value
+
+    def visit_compoundsetindex_expr(self, expr: Expr.CompoundSetIndex):
+        obj = self.evaluate(expr.object)
+        index = self.evaluate(expr.index)
+        if not isinstance(obj, INDEXABLE):
+            raise RuntimeErrorException(expr.bracket, "Only arrays can be indexed.")
+        old = obj.get_index(expr.bracket, index)
+        value = self.binary(expr.operator, old, self.evaluate(expr.value))
+        obj.set_index(expr.bracket, index, value)
+        return old if expr.postfix else value
+
+    def visit_cached_expr(self, expr: Expr.Cached):
+        distance = self.locals.get(expr)
+        values = self.environment.ancestor(distance).values if distance is not None else self.globals.values
+        name = expr.name.lexeme
+        if name in values:
+            return values[name]
+        value = values[name] = self.evaluate(expr.expression)
+        return value
+
+    def visit_inlined_expr(self, expr: Expr.Inlined):
+        call = expr.call
+        callee = self.evaluate(call.callee)
+        if type(callee) is not JSFunction or callee.declaration is not expr.function:
+            # The name no longer refers to the inlined function, so the call is made as written.
+            return self.visit_call_expr(call)
+        arguments = [self.evaluate(argument) for argument in call.arguments]
+        name = expr.function.name
+        guard = self.guard
+        enclosing = self.arguments
+        try:
+            guard.enter_call(name)
+            self.tick(name)
+            self.arguments = arguments
+            return self.evaluate(expr.body)
+        finally:
+            guard.call_depth -= 1
+            self.arguments = enclosing
+
+    def visit_parameter_expr(self, expr: Expr.Parameter):
+        return self.arguments[expr.index]
+
     def visit_call_expr(self, expr: Expr.Call):
+        callee, arguments = self.prepare_call(expr)
+        return self.call(expr, callee, arguments)
+
+    def prepare_call(self, expr: Expr.Call):
         callee = self.evaluate(expr.callee)
         arguments = []
         for argument in expr.arguments:
@@ -187,29 +382,66 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         if not isinstance(callee, JSCallable):
             raise RuntimeErrorException(expr.paren, "Can only call functions and classes.")
 
-        if len(arguments) != callee.arity():
-            raise RuntimeErrorException(expr.paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
-        if isinstance(callee, JSClass) and not expr.has_new_keyword:
+        if not callee.accepts(len(arguments)):
+            raise RuntimeErrorException(expr.paren, f"Expected {callee.expected_arguments()} arguments but got {len(arguments)}.")
+        if isinstance(callee, (JSClass, NativeClass)) and not expr.has_new_keyword:
             raise RuntimeErrorException(expr.paren, "Cannot call a class like a function. Use 'new' keyword to initialize new instance.")
-        return callee.call(self, arguments)
+        return callee, arguments
+
+    def call(self, expr: Expr.Call, callee: JSCallable, arguments: List):
+        try:
+            return callee.call(self, arguments)
+        except NativeError as e:
+            raise RuntimeErrorException(expr.paren, str(e))
 
     def visit_get_expr(self, expr: Expr.Get):
         obj = self.evaluate(expr.object)
-        if isinstance(obj, JSInstance):
+        if isinstance(obj, PROPERTY_OWNERS):
             return obj.get(expr.name)
         raise RuntimeErrorException(expr.name, "Only instances have properties.")
 
+    def visit_array_expr(self, expr: Expr.Array):
+        return JSArray([self.evaluate(element) for element in expr.elements])
+
+    def visit_index_expr(self, expr: Expr.Index):
+        obj = self.evaluate(expr.object)
+        index = self.evaluate(expr.index)
+        if isinstance(obj, INDEXABLE):
+            return obj.get_index(expr.bracket, index)
+        raise RuntimeErrorException(expr.bracket, "Only arrays can be indexed.")
+
+    def visit_setindex_expr(self, expr: Expr.SetIndex):
+        obj = self.evaluate(expr.object)
+        index = self.evaluate(expr.index)
+        if not isinstance(obj, INDEXABLE):
+            raise RuntimeErrorException(expr.bracket, "Only arrays can be indexed.")
+        value = self.evaluate(expr.value)
+        obj.set_index(expr.bracket, index, value)
+        return value
+
     def visit_print_stmt(self, stmt: Stmt.Print):
         value = self.evaluate(stmt.expression)
-        print(self.stringify(value))
+        self.output.write(self.stringify(value) + "\n")
         return None
 
     def visit_return_stmt(self, stmt: Stmt.Return):
         value = stmt.value
-        if stmt.value is not None:
-            value = self.evaluate(stmt.value)
+        if stmt.tail_call:
+            callee, arguments = self.prepare_call(value)
+            if type(callee) is JSFunction and not callee.is_initializer and not callee.declaration.is_generator:
+                # The calling JSFunction runs the callee in its own loop.
+                raise Return(TailCall(callee, arguments))
+            raise Return(self.call(value, callee, arguments))
+        if value is not None:
+            value = self.evaluate(value)
         raise Return(value)
 
+    def visit_break_stmt(self, stmt: Stmt.Break):
+        return BREAK
+
+    def visit_continue_stmt(self, stmt: Stmt.Continue):
+        return CONTINUE
+
     def visit_var_stmt(self, stmt: Stmt.Var):
         value = None
         if stmt.initializer is not None:
@@ -217,17 +449,188 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         self.environment.define(stmt.name.lexeme, value)
         return None
 
+    def visit_import_stmt(self, stmt: Stmt.Import):
+        module = self.import_module(stmt.path)
+        if stmt.namespace is not None:
+            self.environment.define(stmt.namespace.lexeme, module.namespace())
+        else:
+            for name, alias in zip(stmt.names, stmt.aliases):
+                self.environment.define(alias.lexeme, module.export(name))
+        return None
+
+    def visit_export_stmt(self, stmt: Stmt.Export):
+        if stmt.declaration is not None:
+            return self.execute(stmt.declaration)
+        return None
+
+    def import_module(self, token: Token) -> Module:
+        """Returns the module named by the string `token`, evaluating it the first time it is imported.
+
+        Paths are relative to the file whose top-level code is running, or to
+        the working directory for a script that was not loaded from a file.
+        """
+        specifier = token.literal
+        directory = os.path.dirname(self.module_path) if self.module_path is not None else os.getcwd()
+        path = os.path.realpath(os.path.join(directory, specifier))
+        module = self.modules.get(path)
+        if module is not None:
+            if not module.evaluated:
+                raise RuntimeErrorException(token, f"Circular import of module '{specifier}'.")
+            return module
+
+        try:
+            compiled = self.module_cache.get(path)
+        except OSError:
+            raise RuntimeErrorException(token, f"Cannot find module '{specifier}'.")
+        except ModuleError as e:
+            raise RuntimeErrorException(token, f"Module '{specifier}' has errors:\n{e}")
+
+        module = Module(compiled, Environment(self.globals))
+        for name in compiled.names:
+            module.environment.define(name, None)
+        self.locals.update(compiled.locals)
+        self.modules[path] = module
+        previous = self.module_path
+        self.module_path = path
+        try:
+            self.execute_block(compiled.statements, module.environment)
+        except BaseException:
+            del self.modules[path]
+            raise
+        finally:
+            self.module_path = previous
+        module.evaluated = True
+        return module
+
     def visit_while_stmt(self, stmt: Stmt.While):
+        guard = self.guard
         while self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.body)
+            if self.execute(stmt.body) is BREAK:
+                break
+            if stmt.increment is not None:
+                self.evaluate(stmt.increment)
+            guard.steps += 1
+            if guard.steps >= guard.next_check:
+                guard.check(stmt.keyword)
         return None
 
+    def iterate(self, token: Token, value) -> Iterator:
+        """Returns a Python iterator over the values `for ... of` visits in `value`."""
+        if isinstance(value, (JSArray, JSMap, JSSet, JSGenerator)):
+            return iter(value)
+        if isinstance(value, (str, Rope)):
+            return iter(flatten(value))
+        if value is None or isinstance(value, (bool, int, float, JSInstance, JSCallable)):
+            raise RuntimeErrorException(token, "Value is not iterable.")
+        try:
+            # Any other Python iterable was provided by the host.
+            return iter(value)
+        except TypeError:
+            raise RuntimeErrorException(token, "Value is not iterable.")
+
+    def assign_loop_variable(self, stmt: Stmt.ForOf, value) -> None:
+        if stmt.declare:
+            self.environment.values[stmt.name.lexeme] = value
+            return
+        distance = self.locals.get(stmt)
+        if distance is not None:
+            self.environment.assign_at(distance, stmt.name, value)
+        else:
+            self.globals.assign(stmt.name, value)
+
+    def visit_forof_stmt(self, stmt: Stmt.ForOf):
+        iterator = self.iterate(stmt.keyword, self.evaluate(stmt.iterable))
+        guard = self.guard
+        previous = self.environment
+        if stmt.declare:
+            self.environment = Environment(previous)
+            self.environment.define(stmt.name.lexeme, None)
+        try:
+            for value in iterator:
+                self.assign_loop_variable(stmt, value)
+                if self.execute(stmt.body) is BREAK:
+                    break
+                guard.steps += 1
+                if guard.steps >= guard.next_check:
+                    guard.check(stmt.keyword)
+        finally:
+            self.environment = previous
+        return None
+
+    def visit_yield_stmt(self, stmt: Stmt.Yield):
+        # Generator bodies run through run_generator, which handles yield itself.
+        raise RuntimeErrorException(stmt.keyword, "Cannot use 'yield' outside of a generator function.")
+
+    def run_generator(self, body: List[Stmt.Stmt], environment: Environment) -> Generator:
+        """Runs the body of a generator function, yielding the value of each `yield` statement."""
+        try:
+            yield from self.generate_block(body, environment)
+        except Return:
+            pass
+
+    def generate_block(self, statements: List[Stmt.Stmt], environment: Environment) -> Generator:
+        # The environment is restored without try/finally: a suspended
+        # generator may be closed at any time, and JSGenerator restores the
+        # caller's environment itself when the body raises.
+        previous = self.environment
+        self.environment = environment
+        for statement in statements:
+            completion = yield from self.generate(statement)
+            if completion is not None:
+                self.environment = previous
+                return completion
+        self.environment = previous
+        return None
+
+    def generate(self, stmt: Stmt.Stmt) -> Generator:
+        """Generator counterpart of `execute` for the statements a `yield` can be nested in."""
+        kind = type(stmt)
+        if kind is Stmt.Yield:
+            yield None if stmt.value is None else self.evaluate(stmt.value)
+            return None
+        if kind is Stmt.Block:
+            return (yield from self.generate_block(stmt.statements, Environment(self.environment)))
+        if kind is Stmt.If:
+            if self.is_truthy(self.evaluate(stmt.condition)):
+                return (yield from self.generate(stmt.then_branch))
+            elif stmt.else_branch is not None:
+                return (yield from self.generate(stmt.else_branch))
+            return None
+        if kind is Stmt.While:
+            guard = self.guard
+            while self.is_truthy(self.evaluate(stmt.condition)):
+                if (yield from self.generate(stmt.body)) is BREAK:
+                    break
+                if stmt.increment is not None:
+                    self.evaluate(stmt.increment)
+                guard.steps += 1
+                if guard.steps >= guard.next_check:
+                    guard.check(stmt.keyword)
+            return None
+        if kind is Stmt.ForOf:
+            iterator = self.iterate(stmt.keyword, self.evaluate(stmt.iterable))
+            guard = self.guard
+            previous = self.environment
+            if stmt.declare:
+                self.environment = Environment(previous)
+                self.environment.define(stmt.name.lexeme, None)
+            for value in iterator:
+                self.assign_loop_variable(stmt, value)
+                if (yield from self.generate(stmt.body)) is BREAK:
+                    break
+                guard.steps += 1
+                if guard.steps >= guard.next_check:
+                    guard.check(stmt.keyword)
+            self.environment = previous
+            return None
+        return self.execute(stmt)
+
     def look_up_variable(self, name: Token, expr: Expr.Expr):
         distance = self.locals.get(expr)
         if distance is not None:
             return self.environment.get_at(distance, name.lexeme)
         else:
-            return self._globals.get(name)
+            return self.globals.get(name)
 
     def visit_variable_expr(self, expr: Expr.Variable):
         return self.look_up_variable(expr.name, expr)
@@ -238,7 +641,7 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         if distance is not None:
             self.environment.assign_at(distance, expr.name, value)
         else:
-            self._globals.assign(expr.name, value)
+            self.globals.assign(expr.name, value)
         return value
 
     def visit_expression_stmt(self, stmt: Stmt.Expression):
@@ -246,31 +649,47 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         return None
 
     def visit_function_stmt(self, stmt: Stmt.Function):
-        function = JSFunction(stmt, self.environment, stmt.name.lexeme == "constructor")
+        size = directive_size(stmt)
+        if size is not None:
+            function = MemoizedFunction(stmt, self.environment, stmt.name.lexeme == "constructor", size)
+        else:
+            function = JSFunction(stmt, self.environment, stmt.name.lexeme == "constructor")
         self.environment.define(stmt.name.lexeme, function)
         return None
 
     def visit_if_stmt(self, stmt: Stmt.If):
         if self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.then_branch)
+            return self.execute(stmt.then_branch)
         elif stmt.else_branch is not None:
-            self.execute(stmt.else_branch)
+            return self.execute(stmt.else_branch)
         return None
 
     def stringify(self, obj):
         if obj is None:
             return "null"
-        if isinstance(obj, float):
-            text = str(obj)
-            if text.endswith(".0"):
-                text = text[:-2]
-            return text
+        if is_number(obj):
+            return JSNumber.to_string(obj)
+        if isinstance(obj, Rope):
+            return obj.flatten()
+        if isinstance(obj, (JSArray, JSTypedArray, HostList)):
+            return "[" + ", ".join(self.stringify(element) for element in obj) + "]"
         return str(obj)
 
-    def interpret(self, statements: List[Stmt.Stmt]):
+    def tick(self, token: Token):
+        guard = self.guard
+        guard.steps += 1
+        if guard.steps >= guard.next_check:
+            guard.check(token)
+
+    def interpret(self, statements: List[Stmt.Stmt], pause: Optional[Callable[[], None]] = None, pause_every: int = 0):
+        self.guard = ResourceGuard(self.limits, pause, pause_every)
+        self.guard.start()
         try:
             for statement in statements:
                 self.execute(statement)
         except RuntimeErrorException as e:
-            from JavaScript import JavaScript
-            JavaScript.runtime_error(e)
+            self.output.flush()
+            self.reporter.runtime_error(e)
+        finally:
+            self.output.flush()
+
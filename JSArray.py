@@ -0,0 +1,124 @@
+from array import array
+from typing import Any, Dict, List, Union
+from Token import Token
+from NativeFunction import NativeFunction
+from RuntimeErrorException import RuntimeErrorException
+from JSNumber import is_number
+
+
+def check_index(token: Token, index: Any) -> int:
+    """Returns `index` as a position, or raises if it is not a non-negative integral number."""
+    if type(index) is int and index >= 0:
+        return index
+    if type(index) is not float or not index.is_integer() or index < 0:
+        raise RuntimeErrorException(token, "Array index must be a non-negative integer.")
+    return int(index)
+
+
+class JSArray:
+    """A JS array backed by contiguous storage.
+
+    While every element is a number the elements live in a packed array('d'),
+    which stores raw doubles instead of boxed Python numbers, so integers read
+    back from a packed array as floats. The first non-number stored switches
+    the array to a plain Python list for good.
+    """
+    elements: Union[array, List[Any]]
+    methods: Dict[str, NativeFunction]
+
+    def __init__(self, elements: List[Any]):
+        self.methods = {}
+        for element in elements:
+            if not is_number(element):
+                self.elements = elements
+                return
+        self.elements = array("d", elements)
+
+    @classmethod
+    def packed(cls, elements: array) -> "JSArray":
+        """Wraps an existing array('d') without copying it."""
+        instance = cls.__new__(cls)
+        instance.methods = {}
+        instance.elements = elements
+        return instance
+
+    @property
+    def is_packed(self) -> bool:
+        return isinstance(self.elements, array)
+
+    def unpack(self) -> None:
+        self.elements = self.elements.tolist()
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        # By position, so elements pushed during a `for ... of` are visited too.
+        position = 0
+        while position < len(self.elements):
+            yield self.elements[position]
+            position += 1
+
+    def get(self, name: Token):
+        if name.lexeme == "length":
+            return len(self.elements)
+        method = self.methods.get(name.lexeme)
+        if method is not None:
+            return method
+        if name.lexeme in ARRAY_METHODS:
+            # Bound once per array and reused by every later access.
+            arity, function = ARRAY_METHODS[name.lexeme]
+            method = NativeFunction(name.lexeme, arity, function.__get__(self))
+            self.methods[name.lexeme] = method
+            return method
+        raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
+
+    def check_index(self, token: Token, index: Any) -> int:
+        return check_index(token, index)
+
+    def get_index(self, token: Token, index: Any) -> Any:
+        if type(index) is int:
+            if 0 <= index < len(self.elements):
+                return self.elements[index]
+        elif type(index) is float:
+            position = int(index)
+            if position == index and 0 <= position < len(self.elements):
+                return self.elements[position]
+        position = self.check_index(token, index)
+        if position < len(self.elements):
+            return self.elements[position]
+        return None
+
+    def set_index(self, token: Token, index: Any, value: Any) -> None:
+        position = self.check_index(token, index)
+        elements = self.elements
+        if not is_number(value) and isinstance(elements, array):
+            self.unpack()
+            elements = self.elements
+        if position < len(elements):
+            elements[position] = value
+            return
+        if position > len(elements):
+            # Writing past the end leaves holes, which read back as null.
+            if isinstance(elements, array):
+                self.unpack()
+                elements = self.elements
+            elements.extend([None] * (position - len(elements)))
+        elements.append(value)
+
+    def push(self, value: Any) -> int:
+        if not is_number(value) and isinstance(self.elements, array):
+            self.unpack()
+        self.elements.append(value)
+        return len(self.elements)
+
+    def pop(self) -> Any:
+        if not self.elements:
+            return None
+        return self.elements.pop()
+
+
+ARRAY_METHODS = {
+    "push": (1, JSArray.push),
+    "pop": (0, JSArray.pop),
+}
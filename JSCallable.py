@@ -1,4 +1,3 @@
-
 from typing import Any, List
 
 
@@ -8,3 +7,9 @@ class JSCallable:
 
     def arity(self):
         pass
+
+    def accepts(self, count: int) -> bool:
+        return count == self.arity()
+
+    def expected_arguments(self) -> str:
+        return str(self.arity())
@@ -2,13 +2,20 @@ from typing import Dict, Any, Optional
 from JSFunction import JSFunction
 from JSCallable import JSCallable
 from Token import Token
+from RuntimeErrorException import RuntimeErrorException
 
 class JSInstance:
     _class: "JSClass"
-    fields: Dict[str, Any] = {}
+    fields: Dict[str, Any]
 
     def __init__(self, cls: "JSClass"):
         self._class = cls
+        self.fields = {}
+
+    def copy(self) -> "JSInstance":
+        instance = JSInstance(self._class)
+        instance.fields = dict(self.fields)
+        return instance
 
     def __str__(self):
         return self._class.name + " instance"
@@ -22,7 +29,7 @@ class JSInstance:
         if method is not None:
             return method.bind(self)
 
-        raise RuntimeError(f"Undefined property '{name.lexeme}'.")
+        raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
 
     def set(self, name: Token, value: Any):
         self.fields[name.lexeme] = value
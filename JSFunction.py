@@ -1,17 +1,30 @@
+from typing import List
 from JSCallable import JSCallable
 import Stmt
 from Environment import Environment
 from Return import Return
-from copy import deepcopy
+from RuntimeErrorException import RuntimeErrorException
+
+
+class TailCall:
+    """Returned by `return f(...)` in place of a value: the function to run next and its arguments."""
+    __slots__ = ("function", "arguments")
+
+    def __init__(self, function: "JSFunction", arguments: List):
+        self.function = function
+        self.arguments = arguments
+
 
 class JSFunction(JSCallable):
     decalaration: Stmt.Function
     closure: Environment
     is_initializer: bool
+    # Whether calls look up and store their results in the cache of a MemoizedFunction.
+    memoized = False
 
     def __init__(self, declaration: Stmt.Function, closure: Environment, is_initializer: bool):
         self.declaration = declaration
-        self.closure = deepcopy(closure)
+        self.closure = closure
         self.is_initializer = is_initializer
 
     def bind(self, js_instance):
@@ -20,22 +33,58 @@ class JSFunction(JSCallable):
         return JSFunction(self.declaration, environment, self.is_initializer)
 
     def call(self, interpreter, arguments):
-        environment = Environment(self.closure)
-        for i in range(len(self.declaration.params)):
-            environment.define(self.declaration.params[i].lexeme, arguments[i])
+        if self.declaration.is_generator:
+            return self.start_generator(interpreter, arguments)
 
+        key = None
+        if self.memoized:
+            key = self.key(arguments)
+            if key in self.entries:
+                return self.hit(key)
+
+        guard = interpreter.guard
+        function = self
         try:
-            interpreter.execute_block(self.declaration.body, environment)
-        except Return as returnValue:
-            if self.is_initializer:
-                return self.closure.get_at(0, "this")
+            guard.enter_call(self.declaration.name)
+
+            # Tail calls are trampolined: instead of nesting a Python call per
+            # JS call, the callee replaces the current function in this loop.
+            while True:
+                declaration = function.declaration
+                interpreter.tick(declaration.name)
+
+                environment = Environment(function.closure)
+                for i in range(len(declaration.params)):
+                    environment.define(declaration.params[i].lexeme, arguments[i])
+
+                value = None
+                try:
+                    interpreter.execute_block(declaration.body, environment)
+                except Return as returnValue:
+                    value = returnValue.value
+                    if type(value) is TailCall:
+                        function = value.function
+                        arguments = value.arguments
+                        continue
+                except RecursionError:
+                    raise RuntimeErrorException(declaration.name, "Maximum call stack size exceeded.")
+                break
+        finally:
+            guard.call_depth -= 1
 
-            return returnValue.value
+        if function.is_initializer:
+            return function.closure.get_at(0, "this")
+        if key is not None:
+            self.store(key, value)
 
-        if self.is_initializer:
-            return self.closure.get_at(0, "this")
+        return value
 
-        return None
+    def start_generator(self, interpreter, arguments):
+        from JSGenerator import JSGenerator
+        environment = Environment(self.closure)
+        for i in range(len(self.declaration.params)):
+            environment.define(self.declaration.params[i].lexeme, arguments[i])
+        return JSGenerator(interpreter, interpreter.run_generator(self.declaration.body, environment))
 
     def arity(self):
         return len(self.declaration.params)
@@ -0,0 +1,69 @@
+from typing import Any, Dict, Generator
+from Token import Token
+from JSClass import JSClass, JSInstance
+from NativeFunction import NativeFunction
+from RuntimeErrorException import RuntimeErrorException
+
+ITERATOR_RESULT = JSClass("IteratorResult", None, {})
+
+
+class JSGenerator:
+    """The object returned by calling a `function*`.
+
+    The body runs inside `frames`, a Python generator produced by
+    `Interpreter.run_generator`, and is suspended at each `yield`. Resuming it
+    walks one `yield from` chain as deep as the statements around the yield,
+    so no Python frames are added per produced value. JSGenerator is also a
+    Python iterator, which lets `for ... of` and the host pull values from it.
+    """
+    frames: Generator[Any, None, None]
+    methods: Dict[str, NativeFunction]
+
+    def __init__(self, interpreter: Any, frames: Generator[Any, None, None]):
+        self.interpreter = interpreter
+        self.frames = frames
+        # The environment the body was suspended in, restored on resumption.
+        self.environment = interpreter.environment
+        self.done = False
+        self.methods = {}
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Any:
+        if self.done:
+            raise StopIteration
+        interpreter = self.interpreter
+        previous = interpreter.environment
+        interpreter.environment = self.environment
+        try:
+            return next(self.frames)
+        except BaseException:
+            self.done = True
+            raise
+        finally:
+            self.environment = interpreter.environment
+            interpreter.environment = previous
+
+    def __str__(self):
+        return "[object Generator]"
+
+    def next(self) -> JSInstance:
+        result = JSInstance(ITERATOR_RESULT)
+        try:
+            result.fields["value"] = next(self)
+            result.fields["done"] = False
+        except StopIteration:
+            result.fields["value"] = None
+            result.fields["done"] = True
+        return result
+
+    def get(self, name: Token):
+        method = self.methods.get(name.lexeme)
+        if method is not None:
+            return method
+        if name.lexeme == "next":
+            method = NativeFunction("next", 0, self.next)
+            self.methods["next"] = method
+            return method
+        raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
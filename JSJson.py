@@ -0,0 +1,113 @@
+import math
+from typing import Any, List, Set, Tuple
+from JSClass import JSClass, JSInstance
+from JSArray import JSArray
+from JSCallable import JSCallable
+from HostProxy import HostBuffer, HostList, HostObject, wrap
+from JSNumber import normalize
+from NativeFunction import NativeError, NativeFunction
+from Rope import Rope
+from JSTypedArray import JSTypedArray
+
+# Class of the plain objects JSON.parse creates for JSON objects.
+OBJECT = JSClass("Object", None, {})
+
+
+def to_object(pairs: List[Tuple[str, Any]]) -> JSInstance:
+    instance = JSInstance(OBJECT)
+    fields = instance.fields
+    for key, value in pairs:
+        fields[key] = to_array(value) if type(value) is list else value
+    return instance
+
+
+def to_array(values: List[Any]) -> JSArray:
+    # json.loads has no hook for arrays. Objects convert their own values, so
+    # only lists directly inside lists are left to convert here.
+    return JSArray([to_array(value) if type(value) is list else value for value in values])
+
+
+def reject_constant(name: str) -> Any:
+    raise ValueError(f"Unexpected token {name} in JSON")
+
+
+def parse(text: Any) -> Any:
+    if not isinstance(text, str):
+        raise NativeError("JSON.parse expects a string.")
+    # json is only imported by scripts that use it, to keep it out of the startup of every run.
+    import json
+    try:
+        value = json.loads(text, object_pairs_hook=to_object, parse_int=lambda digits: normalize(int(digits)),
+                           parse_constant=reject_constant)
+    except ValueError as e:
+        raise NativeError(f"Invalid JSON: {e}.")
+    return to_array(value) if type(value) is list else value
+
+
+class Converter:
+    """Turns engine values into the plain Python values json.dumps understands."""
+
+    def __init__(self):
+        self.active: Set[int] = set()
+
+    def convert(self, value: Any) -> Any:
+        kind = type(value)
+        if kind is float:
+            if not math.isfinite(value):
+                return None
+            if value.is_integer() and abs(value) < 1e16:
+                # JS prints integral numbers without a fraction.
+                return int(value)
+            return value
+        if value is None or kind is int or kind is bool or kind is str:
+            return value
+        if kind is Rope:
+            return value.flatten()
+        if isinstance(value, JSArray):
+            return self.container(value, lambda: [None if isinstance(element, JSCallable) else self.convert(element)
+                                                  for element in value.elements])
+        if isinstance(value, JSInstance):
+            return self.container(value, lambda: {key: self.convert(field) for key, field in value.fields.items()
+                                                  if not isinstance(field, JSCallable)})
+        if isinstance(value, HostObject):
+            return self.container(value, lambda: {key: self.convert(wrap(field, value.writable))
+                                                  for key, field in value.value.items()})
+        if isinstance(value, (HostList, HostBuffer, JSTypedArray)):
+            # Each iterates over the elements a script reads through get_index.
+            return self.container(value, lambda: [self.convert(element) for element in value])
+        if isinstance(value, JSCallable):
+            return None
+        return {}
+
+    def container(self, value: Any, build) -> Any:
+        if id(value) in self.active:
+            raise NativeError("Converting circular structure to JSON.")
+        self.active.add(id(value))
+        try:
+            return build()
+        finally:
+            self.active.discard(id(value))
+
+
+def stringify(value: Any, replacer: Any = None, indent: Any = None) -> Any:
+    if replacer is not None:
+        raise NativeError("JSON.stringify does not support a replacer.")
+    if isinstance(value, JSCallable):
+        return None
+    if type(indent) in (int, float):
+        indent = min(10, max(0, int(indent))) or None
+    elif isinstance(indent, str):
+        indent = indent[:10] or None
+    else:
+        indent = None
+    separators = (",", ": ") if indent is not None else (",", ":")
+    import json
+    return json.dumps(Converter().convert(value), ensure_ascii=False, indent=indent, separators=separators)
+
+
+def create_json() -> JSInstance:
+    """Builds the `JSON` namespace object."""
+    namespace = JSInstance(JSClass("JSON", None, {}))
+    namespace.fields["parse"] = NativeFunction("parse", 1, parse, pure=True)
+    namespace.fields["stringify"] = NativeFunction("stringify", (1, 3), stringify, pure=True)
+    return namespace
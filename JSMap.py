@@ -0,0 +1,142 @@
+from typing import Any, Dict, Tuple
+from Token import Token
+from NativeFunction import NativeFunction
+from JSArray import JSArray
+from Rope import Rope
+from RuntimeErrorException import RuntimeErrorException
+
+
+class NaNKey:
+    """Stands in for NaN in a key, which would otherwise never equal itself."""
+
+    def __hash__(self):
+        return 0
+
+    def __eq__(self, other):
+        return type(other) is NaNKey
+
+
+NAN_KEY = NaNKey()
+
+
+def map_key(value: Any) -> Any:
+    """Returns the dict key for a JS value.
+
+    Two values get the same key exactly when `Interpreter.is_equal` considers
+    them equal, with the exception of NaN, which is found again like in JS.
+    Numbers compare by value, so 1 and 1.0 are the same key. Booleans are
+    tagged because Python hashes True like 1. Ropes are flattened, and objects
+    compare by identity.
+    """
+    kind = type(value)
+    if kind is bool:
+        return (bool, value)
+    if kind is Rope:
+        return value.flatten()
+    if kind is float and value != value:
+        return NAN_KEY
+    return value
+
+
+class JSCollection:
+    """Shared property lookup of the builtin collections."""
+    name = "Collection"
+    methods: Dict[str, NativeFunction]
+    entries: Dict[Any, Tuple[Any, Any]]
+
+    def __init__(self):
+        self.methods = {}
+        # Insertion ordered, mapping each key to the original key and its value.
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        return f"[object {self.name}]"
+
+    def __iter__(self):
+        # Over a snapshot, since scripts may modify the collection while iterating.
+        return iter([entry[1] for entry in self.entries.values()])
+
+    def get(self, name: Token):
+        if name.lexeme == "size":
+            return len(self.entries)
+        method = self.methods.get(name.lexeme)
+        if method is not None:
+            return method
+        table = METHODS[type(self)]
+        if name.lexeme in table:
+            # Bound once per collection and reused by every later access.
+            arity, function = table[name.lexeme]
+            method = NativeFunction(name.lexeme, arity, function.__get__(self))
+            self.methods[name.lexeme] = method
+            return method
+        raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
+
+    def has(self, key: Any) -> bool:
+        return map_key(key) in self.entries
+
+    def delete(self, key: Any) -> bool:
+        return self.entries.pop(map_key(key), None) is not None
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class JSMap(JSCollection):
+    """A JS Map over a Python dict, with O(1) get, set, has and delete."""
+    name = "Map"
+
+    def get_value(self, key: Any) -> Any:
+        entry = self.entries.get(map_key(key))
+        if entry is None:
+            return None
+        return entry[1]
+
+    def set_value(self, key: Any, value: Any) -> "JSMap":
+        self.entries[map_key(key)] = (key, value)
+        return self
+
+    def __iter__(self):
+        return iter([JSArray([key, value]) for key, value in self.entries.values()])
+
+    def keys(self) -> JSArray:
+        return JSArray([entry[0] for entry in self.entries.values()])
+
+    def values(self) -> JSArray:
+        return JSArray([entry[1] for entry in self.entries.values()])
+
+
+class JSSet(JSCollection):
+    """A JS Set over a Python dict, with O(1) add, has and delete."""
+    name = "Set"
+
+    def add(self, value: Any) -> "JSSet":
+        key = map_key(value)
+        if key not in self.entries:
+            self.entries[key] = (value, value)
+        return self
+
+    def values(self) -> JSArray:
+        return JSArray([entry[0] for entry in self.entries.values()])
+
+
+METHODS = {
+    JSMap: {
+        "get": (1, JSMap.get_value),
+        "set": (2, JSMap.set_value),
+        "has": (1, JSMap.has),
+        "delete": (1, JSMap.delete),
+        "clear": (0, JSMap.clear),
+        "keys": (0, JSMap.keys),
+        "values": (0, JSMap.values),
+    },
+    JSSet: {
+        "add": (1, JSSet.add),
+        "has": (1, JSSet.has),
+        "delete": (1, JSSet.delete),
+        "clear": (0, JSSet.clear),
+        "values": (0, JSSet.values),
+    },
+}
@@ -0,0 +1,254 @@
+import math
+import operator
+import random
+from array import array
+from functools import partial, reduce
+from typing import Any, Callable, Dict
+from JSClass import JSClass, JSInstance
+from JSArray import JSArray
+from JSTypedArray import JSTypedArray
+from JSCallable import JSCallable
+from JSNumber import Number, normalize, to_number
+from NativeFunction import NativeError, NativeFunction
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_finite(value: Number) -> bool:
+    return type(value) is int or math.isfinite(value)
+
+
+def call_integral(function: Callable[[float], int], value: Any) -> Number:
+    value = to_number(value)
+    if not is_finite(value):
+        return value
+    result = normalize(function(value))
+    if result == 0 and math.copysign(1.0, value) < 0:
+        return -0.0
+    return result
+
+
+def call_real(function: Callable[..., float], *values: Any) -> Number:
+    values = [to_number(value) for value in values]
+    try:
+        return function(*values)
+    except ValueError:
+        return math.nan
+    except OverflowError:
+        return math.inf
+
+
+# The wrappers are partials rather than closures so that a snapshot can pickle them.
+def integral(function: Callable[[float], int]) -> Callable[[Any], Number]:
+    """Wraps math.floor and friends so that -0, NaN and the infinities pass through."""
+    return partial(call_integral, function)
+
+
+def real(function: Callable[..., float]) -> Callable[..., Number]:
+    """Wraps a math function so that domain errors give NaN and overflows give Infinity, like in JS."""
+    return partial(call_real, function)
+
+
+def js_abs(value: Any) -> Number:
+    return abs(to_number(value))
+
+
+def js_round(value: Any) -> Number:
+    # JS rounds halves up, towards positive infinity.
+    value = to_number(value)
+    if not is_finite(value):
+        return value
+    if -0.5 <= value < 0:
+        return -0.0
+    return normalize(math.floor(value + 0.5))
+
+
+def js_sign(value: Any) -> Number:
+    value = to_number(value)
+    if value != value or value == 0:
+        return value
+    return 1 if value > 0 else -1
+
+
+def js_sqrt(value: Any) -> Number:
+    value = to_number(value)
+    if value < 0:
+        return math.nan
+    return math.sqrt(value)
+
+
+def js_cbrt(value: Any) -> Number:
+    value = to_number(value)
+    if not is_finite(value) or value == 0:
+        return value
+    result = math.cbrt(value)
+    # math.cbrt can miss exact cubes by an ulp.
+    nearest = round(result)
+    if nearest ** 3 == value:
+        return normalize(nearest) if type(value) is int else float(nearest)
+    return result
+
+
+def js_log(value: Any) -> Number:
+    value = to_number(value)
+    if value == 0:
+        return -math.inf
+    if value < 0:
+        return math.nan
+    return math.log(value)
+
+
+def js_pow(base: Any, exponent: Any) -> Number:
+    base = to_number(base)
+    exponent = to_number(exponent)
+    negative = base < 0 and is_finite(exponent) and exponent % 2 == 1
+    if type(base) is int and type(exponent) is int and 0 <= exponent <= 64:
+        try:
+            return normalize(base ** exponent)
+        except OverflowError:
+            return -math.inf if negative else math.inf
+    if exponent != exponent or (abs(base) == 1 and not is_finite(exponent)):
+        return math.nan
+    try:
+        return math.pow(base, exponent)
+    except ValueError:
+        if base == 0:
+            # Zero to a negative power.
+            return math.copysign(math.inf, base) if exponent % 2 == 1 else math.inf
+        return math.nan
+    except OverflowError:
+        return -math.inf if negative else math.inf
+
+
+def js_min(*values: Any) -> Number:
+    result = math.inf
+    for value in values:
+        value = to_number(value)
+        if value != value:
+            return math.nan
+        if value < result:
+            result = value
+    return result
+
+
+def js_max(*values: Any) -> Number:
+    result = -math.inf
+    for value in values:
+        value = to_number(value)
+        if value != value:
+            return math.nan
+        if value > result:
+            result = value
+    return result
+
+
+def check_array(value: Any, function: str) -> Any:
+    if not isinstance(value, (JSArray, JSTypedArray)):
+        raise NativeError(f"Math.{function} expects an array.")
+    return value
+
+
+def numbers(array: Any) -> Any:
+    if isinstance(array, JSTypedArray):
+        return array.view
+    if array.is_packed:
+        return array.elements
+    return [to_number(element) for element in array.elements]
+
+
+def js_sum(values: Any) -> Number:
+    # A left to right reduction rounds exactly like the equivalent JS loop.
+    return reduce(operator.add, numbers(check_array(values, "sum")), 0)
+
+
+def js_dot(left: Any, right: Any) -> Number:
+    left = check_array(left, "dot")
+    right = check_array(right, "dot")
+    if len(left) != len(right):
+        raise NativeError("Math.dot expects arrays of the same length.")
+    return reduce(operator.add, map(operator.mul, numbers(left), numbers(right)), 0)
+
+
+# Elementwise functions for which NumPy returns the correctly rounded result,
+# so Math.map gives the same answer with and without it.
+NUMPY_FUNCTIONS = {
+    "abs": "absolute",
+    "ceil": "ceil",
+    "floor": "floor",
+    "sqrt": "sqrt",
+    "trunc": "trunc",
+}
+
+
+def js_map(interpreter: Any, values: Any, function: Any) -> JSArray:
+    values = check_array(values, "map")
+    if not isinstance(function, JSCallable) or not function.accepts(1):
+        raise NativeError("Math.map expects a function of one argument.")
+    if isinstance(values, JSTypedArray):
+        elements = values.view
+        packed = elements.format == "d"
+    else:
+        elements = values.elements
+        packed = values.is_packed
+    if isinstance(function, NativeFunction) and not function.with_interpreter:
+        if numpy is not None and packed and function.pure and function.name in NUMPY_FUNCTIONS:
+            ufunc = getattr(numpy, NUMPY_FUNCTIONS[function.name])
+            with numpy.errstate(invalid="ignore"):
+                result = ufunc(numpy.frombuffer(elements, dtype=numpy.float64))
+            return JSArray.packed(array("d", result.tobytes()))
+        return JSArray(list(map(function.function, elements)))
+    return JSArray([function.call(interpreter, [element]) for element in elements])
+
+
+FUNCTIONS: Dict[str, tuple] = {
+    "abs": (1, js_abs),
+    "acos": (1, real(math.acos)),
+    "asin": (1, real(math.asin)),
+    "atan": (1, real(math.atan)),
+    "atan2": (2, real(math.atan2)),
+    "cbrt": (1, js_cbrt),
+    "ceil": (1, integral(math.ceil)),
+    "cos": (1, real(math.cos)),
+    "exp": (1, real(math.exp)),
+    "floor": (1, integral(math.floor)),
+    "hypot": ((0, None), real(math.hypot)),
+    "log": (1, js_log),
+    "log10": (1, real(math.log10)),
+    "log2": (1, real(math.log2)),
+    "max": ((0, None), js_max),
+    "min": ((0, None), js_min),
+    "pow": (2, js_pow),
+    "round": (1, js_round),
+    "sign": (1, js_sign),
+    "sin": (1, real(math.sin)),
+    "sqrt": (1, js_sqrt),
+    "tan": (1, real(math.tan)),
+    "trunc": (1, integral(math.trunc)),
+    "sum": (1, js_sum),
+    "dot": (2, js_dot),
+}
+
+CONSTANTS = {
+    "E": math.e,
+    "LN10": math.log(10),
+    "LN2": math.log(2),
+    "LOG10E": math.log10(math.e),
+    "LOG2E": math.log2(math.e),
+    "PI": math.pi,
+    "SQRT1_2": math.sqrt(0.5),
+    "SQRT2": math.sqrt(2),
+}
+
+
+def create_math() -> JSInstance:
+    """Builds the `Math` namespace object."""
+    namespace = JSInstance(JSClass("Math", None, {}))
+    for name, (arity, function) in FUNCTIONS.items():
+        namespace.fields[name] = NativeFunction(name, arity, function, pure=True)
+    namespace.fields["random"] = NativeFunction("random", 0, random.random)
+    namespace.fields["map"] = NativeFunction("map", 2, js_map, with_interpreter=True)
+    namespace.fields.update(CONSTANTS)
+    return namespace
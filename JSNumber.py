@@ -0,0 +1,108 @@
+import math
+from typing import Union
+
+# Integers up to this magnitude are exact in a double, so they can be kept as
+# Python ints without changing the result of any arithmetic.
+MAX_SAFE_INTEGER = 2 ** 53
+
+Number = Union[int, float]
+
+
+def is_number(value) -> bool:
+    # bool is a subclass of int, so compare the exact types.
+    return type(value) is int or type(value) is float
+
+
+def to_number(value) -> Number:
+    """Converts a value to a number the way JS arithmetic builtins do, giving NaN for non-numbers."""
+    if is_number(value):
+        return value
+    if type(value) is bool:
+        return int(value)
+    if value is None:
+        return 0
+    return math.nan
+
+
+def normalize(value: Number) -> Number:
+    """Returns an int result as a float once it leaves the exact-double range."""
+    if type(value) is int and not -MAX_SAFE_INTEGER <= value <= MAX_SAFE_INTEGER:
+        return float(value)
+    return value
+
+
+def from_literal(text: str) -> Number:
+    if "." in text:
+        return float(text)
+    return normalize(int(text))
+
+
+# add and subtract inline normalize, since type-checked loops call them directly.
+def add(left: Number, right: Number) -> Number:
+    result = left + right
+    if type(result) is int and not -MAX_SAFE_INTEGER <= result <= MAX_SAFE_INTEGER:
+        return float(result)
+    return result
+
+
+def subtract(left: Number, right: Number) -> Number:
+    result = left - right
+    if type(result) is int and not -MAX_SAFE_INTEGER <= result <= MAX_SAFE_INTEGER:
+        return float(result)
+    return result
+
+
+def multiply(left: Number, right: Number) -> Number:
+    result = left * right
+    if type(result) is int:
+        if result == 0 and (left < 0 or right < 0):
+            return -0.0
+        return normalize(result)
+    return result
+
+
+def divide(left: Number, right: Number) -> Number:
+    if right == 0:
+        if left == 0 or left != left:
+            return math.nan
+        return math.copysign(math.inf, left) * math.copysign(1.0, right)
+    if type(left) is int and type(right) is int:
+        if left == 0 and right < 0:
+            return -0.0
+        if left % right == 0:
+            return left // right
+    return left / right
+
+
+def modulo(left: Number, right: Number) -> Number:
+    # JS takes the sign of the dividend, unlike Python's % on negative numbers.
+    if type(left) is int and type(right) is int and right != 0:
+        result = abs(left) % abs(right)
+        if left < 0:
+            return -result if result else -0.0
+        return result
+    if right == 0 or left in (math.inf, -math.inf) or left != left:
+        return math.nan
+    if right in (math.inf, -math.inf):
+        return left
+    return math.fmod(left, right)
+
+
+def negate(value: Number) -> Number:
+    if value == 0 and type(value) is int:
+        return -0.0
+    return -value
+
+
+def to_string(value: Number) -> str:
+    if type(value) is int:
+        return str(value)
+    if value != value:
+        return "NaN"
+    if value in (math.inf, -math.inf):
+        return "Infinity" if value > 0 else "-Infinity"
+    if value.is_integer() and abs(value) < 1e16:
+        if value == 0 and math.copysign(1.0, value) < 0:
+            return "-0"
+        return str(int(value))
+    return str(value)
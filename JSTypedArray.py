@@ -0,0 +1,177 @@
+import math
+import mmap
+from array import array
+from typing import Any, Callable, Dict
+from Token import Token
+from JSArray import JSArray, check_index
+from JSNumber import to_number
+from NativeFunction import NativeError, NativeFunction
+from RuntimeErrorException import RuntimeErrorException
+
+
+def to_float64(value: Any) -> float:
+    return float(to_number(value))
+
+
+def to_integer(value: Any, bits: int, signed: bool) -> int:
+    # Numbers wrap around modulo 2**bits, and NaN and the infinities become 0.
+    value = to_number(value)
+    if type(value) is float:
+        if not math.isfinite(value):
+            return 0
+        value = int(value)
+    value %= 1 << bits
+    if signed and value >= 1 << (bits - 1):
+        value -= 1 << bits
+    return value
+
+
+class TypedArrayKind:
+    """Element type of a typed array: its array/memoryview format and how values are converted on store."""
+    name: str
+    format: str
+    convert: Callable[[Any], Any]
+
+    def __init__(self, name: str, format: str, convert: Callable[[Any], Any]):
+        self.name = name
+        self.format = format
+        self.convert = convert
+        self.item_size = array(format).itemsize
+
+
+def to_int32(value: Any) -> int:
+    return to_integer(value, 32, True)
+
+
+def to_uint8(value: Any) -> int:
+    return to_integer(value, 8, False)
+
+
+FLOAT64 = TypedArrayKind("Float64Array", "d", to_float64)
+INT32 = TypedArrayKind("Int32Array", "i", to_int32)
+UINT8 = TypedArrayKind("Uint8Array", "B", to_uint8)
+
+KINDS = {kind.name: kind for kind in (FLOAT64, INT32, UINT8)}
+
+
+class JSTypedArray:
+    """A fixed-length array of raw numbers in a memoryview.
+
+    The view may cover an array('d'/'i'/'B') owned by the typed array, part of
+    another typed array (see `subarray`) or any host buffer such as an mmap'd
+    file. Element reads and writes index the memoryview directly, and values
+    are only converted when the view rejects them.
+    """
+    kind: TypedArrayKind
+    view: memoryview
+    methods: Dict[str, NativeFunction]
+
+    def __init__(self, kind: TypedArrayKind, view: memoryview):
+        self.kind = kind
+        self.view = view
+        self.methods = {}
+
+    @classmethod
+    def create(cls, kind: TypedArrayKind, source: Any) -> "JSTypedArray":
+        """Implements `new <kind>(source)`, where source is a length or the values to copy."""
+        if type(source) in (int, float):
+            if source < 0 or source != int(source):
+                raise NativeError(f"Invalid {kind.name} length.")
+            return cls(kind, memoryview(array(kind.format, bytes(int(source) * kind.item_size))))
+        if isinstance(source, (JSArray, JSTypedArray)) or hasattr(source, "__iter__"):
+            return cls(kind, memoryview(array(kind.format, map(kind.convert, source))))
+        raise NativeError(f"{kind.name} expects a length or an array.")
+
+    @classmethod
+    def from_buffer(cls, kind: TypedArrayKind, buffer: Any) -> "JSTypedArray":
+        """Views any buffer-protocol object, such as an mmap, as a typed array without copying it."""
+        view = memoryview(buffer).cast("B")
+        if len(view) % kind.item_size:
+            raise ValueError(f"Buffer size is not a multiple of {kind.item_size} bytes.")
+        return cls(kind, view.cast(kind.format))
+
+    def __reduce__(self):
+        # memoryviews cannot be pickled, so a snapshot stores a copy of the elements.
+        return JSTypedArray.from_buffer, (self.kind, array(self.kind.format, self.view))
+
+    def __len__(self):
+        return len(self.view)
+
+    def __iter__(self):
+        return iter(self.view)
+
+    def __str__(self):
+        return f"[object {self.kind.name}]"
+
+    def get(self, name: Token) -> Any:
+        if name.lexeme == "length":
+            return len(self.view)
+        if name.lexeme == "byteLength":
+            return self.view.nbytes
+        method = self.methods.get(name.lexeme)
+        if method is not None:
+            return method
+        if name.lexeme in TYPED_ARRAY_METHODS:
+            arity, function = TYPED_ARRAY_METHODS[name.lexeme]
+            method = NativeFunction(name.lexeme, arity, function.__get__(self))
+            self.methods[name.lexeme] = method
+            return method
+        raise RuntimeErrorException(name, f"Undefined property '{name.lexeme}'.")
+
+    def get_index(self, token: Token, index: Any) -> Any:
+        view = self.view
+        if type(index) is int and 0 <= index < len(view):
+            return view[index]
+        position = check_index(token, index)
+        if position < len(view):
+            return view[position]
+        return None
+
+    def set_index(self, token: Token, index: Any, value: Any) -> None:
+        view = self.view
+        position = index if type(index) is int and index >= 0 else check_index(token, index)
+        if position >= len(view):
+            # Like JS, writes past the end of a typed array are ignored.
+            return
+        try:
+            view[position] = value
+        except (TypeError, ValueError):
+            if view.readonly:
+                raise RuntimeErrorException(token, f"Cannot assign to a read-only {self.kind.name}.")
+            view[position] = self.kind.convert(value)
+
+    def subarray(self, begin: Any = 0, end: Any = None) -> "JSTypedArray":
+        length = len(self.view)
+        begin = self.clamp(begin, length)
+        end = length if end is None else self.clamp(end, length)
+        return JSTypedArray(self.kind, self.view[begin:max(begin, end)])
+
+    def fill(self, value: Any) -> "JSTypedArray":
+        converted = self.kind.convert(value)
+        view = self.view
+        for position in range(len(view)):
+            view[position] = converted
+        return self
+
+    @staticmethod
+    def clamp(index: Any, length: int) -> int:
+        # Negative positions count from the end, as in JS.
+        index = to_number(index)
+        if type(index) is float:
+            index = 0 if math.isnan(index) else int(max(-length, min(length, index)))
+        if index < 0:
+            return max(0, length + index)
+        return min(index, length)
+
+
+TYPED_ARRAY_METHODS = {
+    "subarray": ((0, 2), JSTypedArray.subarray),
+    "fill": (1, JSTypedArray.fill),
+}
+
+
+def map_file(path: str, kind: str = "Uint8Array", writable: bool = False) -> JSTypedArray:
+    """Maps a file into memory and views it as a typed array. Writes go to the file when `writable` is set."""
+    with open(path, "r+b" if writable else "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    return JSTypedArray.from_buffer(KINDS[kind], mapped)
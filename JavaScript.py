@@ -1,43 +1,21 @@
 import sys
-from Scanner import Scanner
-from Token import Token, TokenType
-from typing import cast, overload
-from AstPrinter import AstPrinter
-from Interpreter import Interpreter
-from Parser import Parser
-from RuntimeErrorException import RuntimeErrorException
-from Expr import Expr
-from Resolver import Resolver
+from typing import Optional
+from Reporter import Reporter
+from Engine import Engine, Context, Snapshot
 
-class JavaScript():
+# Only the modules a run needs are imported here. Debugging tools such as
+# AstPrinter are imported by the methods that use them.
 
-    had_error = False
-    had_runtime_error = False
-    interpreter = Interpreter()
+class JavaScript(Reporter):
 
-    def __init__(self):
-        print("this is the JS engine")
-
-    @staticmethod
-    def report(line: int, where: str, message: str) -> None:
-        print(f"[line {line}] Error{where}: {message}")
+    # The default reporter and its error flags are inherited from Reporter.
+    # Runs started from this class use their own Context and its flags.
 
-    @staticmethod
-    def error_with_token(token: Token, message: str) -> None:
-        if token.type == TokenType.EOF:
-            JavaScript.report(token.line, " at end", message)
-        else:
-            JavaScript.report(token.line, f" at '{token.lexeme}'", message)
-
-    @staticmethod
-    def runtime_error(error: RuntimeErrorException) -> None:
-        print(f"{error.message}\n[line {error.token.line}]")
-        JavaScript.had_runtime_error = True
+    # Globals restored from a snapshot file, used instead of building the builtins on every run.
+    snapshot: Optional[Snapshot] = None
 
-    @staticmethod
-    def error(line: int, message: str) -> None:
-        JavaScript.report(line, "", message)
-        JavaScript.had_error = True
+    def __init__(self):
+        print("this is the JS engine")
 
     @staticmethod
     def read_file(path: str) -> str:
@@ -45,44 +23,48 @@ class JavaScript():
             return f.read()
 
     @staticmethod
-    def run(source: str) -> None:
-        scanner = Scanner(source)
-        tokens = scanner.scan_tokens()
-        parser = Parser(tokens)
-        statements = parser.parse()
-
-        if JavaScript.had_error:
-            return
-
-        resolver = Resolver(JavaScript.interpreter)
-        resolver.resolve(statements)
-
-        if JavaScript.had_error:
-            return
-
-        JavaScript.interpreter.interpret(statements)
+    def run(source: str, context: Optional[Context] = None, path: Optional[str] = None) -> Context:
+        if context is None:
+            context = Engine(snapshot=JavaScript.snapshot).create_context()
+        context.run(source, path)
+        return context
 
     @staticmethod
     def run_file(path: str) -> None:
         file = JavaScript.read_file(path)
-        JavaScript.run(file)
-        if JavaScript.had_error:
+        context = JavaScript.run(file, path=path)
+        if context.had_error:
             sys.exit(65)
-        if JavaScript.had_runtime_error:
+        if context.had_runtime_error:
             sys.exit(70)
 
+    @staticmethod
+    def print_ast(source: str) -> None:
+        """Prints the syntax tree of each expression statement in `source`, for debugging the parser."""
+        from AstPrinter import AstPrinter
+        from Parser import Parser
+        from Scanner import Scanner
+        import Stmt
+        printer = AstPrinter()
+        for statement in Parser(Scanner(source).scan_tokens()).parse():
+            if isinstance(statement, Stmt.Expression):
+                print(printer.print(statement.expression))
+
     @staticmethod
     def run_prompt() -> None:
+        context = Engine(snapshot=JavaScript.snapshot).create_context()
         while True:
             line = input("> ")
             if line == "exit()":
                 break
-            JavaScript.run(line)
-            JavaScript.had_error = False
+            JavaScript.run(line, context)
 
 
 if __name__ == "__main__":
     args = sys.argv
+    if len(args) > 2 and args[1] == "--snapshot":
+        JavaScript.snapshot = Snapshot.load(args[2])
+        args = args[:1] + args[3:]
     if len(args) > 2:
         sys.exit(64)
     elif len(args) == 2:
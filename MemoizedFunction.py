@@ -0,0 +1,120 @@
+import math
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+import Expr
+import Stmt
+from Environment import Environment
+from JSFunction import JSFunction
+from NativeFunction import NativeError
+from JSNumber import is_number
+from Rope import Rope, flatten
+
+DEFAULT_CACHE_SIZE = 1024
+
+MEMO_DIRECTIVE = "use memo"
+
+PRIMITIVES = (int, float, str, bool, type(None))
+
+
+def memo_key(arguments: List[Any]) -> Optional[Tuple[Hashable, ...]]:
+    """Returns the cache key for a call, or None when an argument is not a primitive.
+
+    Each value is keyed together with its kind, since True == 1 in Python.
+    Ints and floats are both numbers, so 1 and 1.0 share a key. Negative zero
+    gets a kind of its own because it equals 0.0 but a function can tell them
+    apart.
+    """
+    key = []
+    for value in arguments:
+        kind = type(value)
+        if kind is int or kind is float:
+            kind = "-0" if value == 0 and math.copysign(1.0, value) < 0 else "number"
+        elif kind is Rope:
+            value = flatten(value)
+            kind = str
+        elif kind not in PRIMITIVES:
+            return None
+        key.append((kind, value))
+    return tuple(key)
+
+
+def directive_size(declaration: Stmt.Function) -> Optional[int]:
+    """Returns the cache size asked for by a leading `"use memo"` or `"use memo <size>"` string, if any."""
+    body = declaration.body
+    if not body or declaration.is_generator:
+        return None
+    first = body[0]
+    if type(first) is not Stmt.Expression or type(first.expression) is not Expr.Literal:
+        return None
+    value = first.expression.value
+    if type(value) is not str or not value.startswith(MEMO_DIRECTIVE):
+        return None
+    size = value[len(MEMO_DIRECTIVE):].strip()
+    if not size:
+        return DEFAULT_CACHE_SIZE
+    if size.isdigit() and int(size) > 0:
+        return int(size)
+    return None
+
+
+class MemoizedFunction(JSFunction):
+    """A function that remembers the results of its most recent calls.
+
+    Calls whose arguments are all numbers, strings, booleans or null are
+    looked up in an LRU cache of `size` entries before the body runs. Calls
+    with any other argument always run the body, because objects and arrays
+    can change between calls. Only pure functions should be memoized: a cache
+    hit skips the body's side effects.
+
+    JSFunction.call does the lookup and the store itself, so that a memoized
+    recursive function nests no deeper than a plain one. Memoized functions
+    are never tail called or inlined, so every call goes through the cache.
+    """
+    memoized = True
+    size: int
+    entries: "OrderedDict[Tuple[Hashable, ...], Any]"
+    hits: int
+    misses: int
+    bypassed: int
+
+    def __init__(self, declaration: Stmt.Function, closure: Environment, is_initializer: bool,
+                 size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(declaration, closure, is_initializer)
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def key(self, arguments: List[Any]) -> Optional[Tuple[Hashable, ...]]:
+        """Returns the cache key for a call and counts it as a miss, or as bypassed when it has no key."""
+        key = memo_key(arguments)
+        if key is None:
+            self.bypassed += 1
+        elif key not in self.entries:
+            self.misses += 1
+        return key
+
+    def hit(self, key: Tuple[Hashable, ...]) -> Any:
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def store(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.size:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = self.misses = self.bypassed = 0
+
+
+def memoize(function, size=DEFAULT_CACHE_SIZE) -> MemoizedFunction:
+    """The `memoize(fn, size)` builtin: returns a memoized copy of a script function."""
+    if not isinstance(function, JSFunction) or function.declaration.is_generator:
+        raise NativeError("memoize expects a function that is not a generator.")
+    if not is_number(size) or not math.isfinite(size) or size < 1 or size != int(size):
+        raise NativeError("The cache size must be a positive integer.")
+    return MemoizedFunction(function.declaration, function.closure, function.is_initializer, int(size))
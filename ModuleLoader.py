@@ -0,0 +1,135 @@
+import os
+from typing import Dict, List, Optional
+import Expr
+import Stmt
+from Token import Token, TokenType
+from Environment import Environment
+from JSClass import JSClass, JSInstance
+from Scanner import Scanner
+from Parser import Parser
+from Resolver import Resolver
+from RuntimeErrorException import RuntimeErrorException
+from TypeInference import TypeInference, TypeReport
+
+
+class ModuleError(Exception):
+    """Raised when a module file has syntax or resolution errors."""
+
+
+class CompileErrors:
+    """Reporter that collects the errors of a module instead of printing them."""
+
+    def __init__(self):
+        self.messages: List[str] = []
+
+    def report(self, line: int, where: str, message: str) -> None:
+        self.messages.append(f"[line {line}] Error{where}: {message}")
+
+    def error(self, line: int, message: str) -> None:
+        self.report(line, "", message)
+
+    def error_with_token(self, token: Token, message: str) -> None:
+        if token.type == TokenType.EOF:
+            self.report(token.line, " at end", message)
+        else:
+            self.report(token.line, f" at '{token.lexeme}'", message)
+
+
+class CompiledModule:
+    """A module file after scanning, parsing and resolving.
+
+    A compiled module is immutable once built, so every context of an engine
+    shares it. `names` are the hoisted top-level declarations and `exports`
+    maps each exported name to the local name it refers to.
+    """
+    path: str
+    mtime: int
+    statements: List[Stmt.Stmt]
+    locals: Dict[Expr.Expr, int]
+    names: List[str]
+    exports: Dict[str, str]
+    types: Optional[TypeReport]
+
+    def __init__(self, path: str, mtime: int, statements: List[Stmt.Stmt]):
+        self.path = path
+        self.mtime = mtime
+        self.statements = statements
+        self.locals = {}
+        self.names = []
+        self.exports = {}
+        self.types = None
+
+    def resolve(self, expr: Expr.Expr, depth: int) -> None:
+        self.locals[expr] = depth
+
+
+def compile_module(path: str, mtime: int, optimize: bool = False) -> CompiledModule:
+    with open(path, "r") as file:
+        source = file.read()
+    errors = CompileErrors()
+    module = CompiledModule(path, mtime, Parser(Scanner(source, errors).scan_tokens(), errors).parse())
+    if not errors.messages:
+        resolver = Resolver(module)
+        try:
+            module.names = resolver.resolve_module(module.statements)
+            module.exports = resolver.exports
+        except RuntimeErrorException as e:
+            errors.error_with_token(e.token, e.message)
+    if errors.messages:
+        raise ModuleError("\n".join(errors.messages))
+    if optimize:
+        from Optimizer import Optimizer
+        from Inliner import Inliner
+        Optimizer(module.locals).optimize(module.statements, module=True)
+        Inliner(module.locals).inline(module.statements, module=True)
+        module.locals.clear()
+        Resolver(module).resolve_module(module.statements)
+    module.types = TypeInference(module.locals).infer(module.statements, module=True)
+    return module
+
+
+class ModuleCache:
+    """Compiled modules keyed by path. A module is compiled again when its file's mtime changes.
+
+    An engine keeps one cache for all of its contexts. Two threads importing
+    the same new module may both compile it, and the last one wins, which is
+    harmless because compiling has no side effects. With `optimize`, modules
+    are compiled with the Optimizer and the Inliner.
+    """
+
+    def __init__(self, optimize: bool = False):
+        self.optimize = optimize
+        self.modules: Dict[str, CompiledModule] = {}
+
+    def get(self, path: str) -> CompiledModule:
+        mtime = os.stat(path).st_mtime_ns
+        module = self.modules.get(path)
+        if module is None or module.mtime != mtime:
+            module = compile_module(path, mtime, self.optimize)
+            self.modules[path] = module
+        return module
+
+
+class Module:
+    """A module evaluated in one context: its top-level environment and exports."""
+    compiled: CompiledModule
+    environment: Environment
+    evaluated: bool
+
+    def __init__(self, compiled: CompiledModule, environment: Environment):
+        self.compiled = compiled
+        self.environment = environment
+        self.evaluated = False
+
+    def export(self, name: Token) -> object:
+        local = self.compiled.exports.get(name.lexeme)
+        if local is None:
+            raise RuntimeErrorException(name, f"Module '{self.compiled.path}' has no export '{name.lexeme}'.")
+        return self.environment.values[local]
+
+    def namespace(self) -> JSInstance:
+        """Builds the object bound by `import * as name`, with a field for each export."""
+        namespace = JSInstance(JSClass("Module", None, {}))
+        for name, local in self.compiled.exports.items():
+            namespace.fields[name] = self.environment.values[local]
+        return namespace
@@ -0,0 +1,5 @@
+from NativeFunction import NativeFunction
+
+
+class NativeClass(NativeFunction):
+    """A builtin class implemented in Python. `new` calls `function` with the arguments."""
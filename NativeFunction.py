@@ -0,0 +1,69 @@
+from typing import Any, Callable, List, Optional, Tuple, Union
+from JSCallable import JSCallable
+from Rope import Rope, flatten
+
+Arity = Union[int, Tuple[int, Optional[int]]]
+
+
+class NativeError(Exception):
+    """Raised by a native function to report a runtime error at its call site."""
+
+
+class NativeFunction(JSCallable):
+    """A builtin implemented in Python. Calling it does not create an Environment.
+
+    `arity` is either an exact argument count or a `(minimum, maximum)` range,
+    where a maximum of None accepts any number of arguments. The arguments are
+    passed to `function` positionally, preceded by the interpreter when
+    `with_interpreter` is set. A `pure` function has no side effects and
+    returns the same result for the same arguments.
+    """
+    name: str
+    function: Callable[..., Any]
+    min_arity: int
+    max_arity: Optional[int]
+    pure: bool
+    with_interpreter: bool
+
+    def __init__(self, name: str, arity: Arity, function: Callable[..., Any], pure: bool = False,
+                 with_interpreter: bool = False):
+        self.name = name
+        self.function = function
+        if isinstance(arity, tuple):
+            self.min_arity, self.max_arity = arity
+        else:
+            self.min_arity = self.max_arity = arity
+        self.pure = pure
+        self.with_interpreter = with_interpreter
+
+    def call(self, interpreter: Any, arguments: List) -> Any:
+        for argument in arguments:
+            if type(argument) is Rope:
+                arguments = [flatten(argument) for argument in arguments]
+                break
+        if self.with_interpreter:
+            return self.function(interpreter, *arguments)
+        return self.function(*arguments)
+
+    def arity(self):
+        return self.min_arity
+
+    def accepts(self, count: int) -> bool:
+        return self.min_arity <= count and (self.max_arity is None or count <= self.max_arity)
+
+    def expected_arguments(self) -> str:
+        if self.max_arity is None:
+            return f"at least {self.min_arity}"
+        if self.max_arity != self.min_arity:
+            return f"{self.min_arity} to {self.max_arity}"
+        return str(self.min_arity)
+
+    def __str__(self):
+        return f"function {self.name}() {{ [native code] }}"
+
+
+def native(name: str, arity: Arity, pure: bool = False, with_interpreter: bool = False):
+    """Decorator that turns a Python function into a NativeFunction."""
+    def wrap(function: Callable[..., Any]) -> NativeFunction:
+        return NativeFunction(name, arity, function, pure, with_interpreter)
+    return wrap
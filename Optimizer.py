@@ -0,0 +1,466 @@
+from typing import Any, Dict, Iterator, List, Optional, Set
+import Expr
+import Stmt
+from Token import Token, TokenType
+from Resolver import declared_names, imported_names
+
+# Evaluating a cached expression costs about as much as one property read, so
+# only expressions at least this expensive are worth caching.
+WORTH_CACHING = 2
+
+# Statements that always run one after another, so that a value computed by one
+# is still current in the next unless something in between writes to it.
+STRAIGHT_LINE = (Stmt.Expression, Stmt.Print, Stmt.Var, Stmt.Return)
+
+# Kinds of expression whose evaluation reads state but never changes it.
+PURE = (Expr.Literal, Expr.Variable, Expr.This, Expr.Cached, Expr.Get, Expr.Index, Expr.Binary, Expr.Logical,
+        Expr.Unary, Expr.Grouping)
+
+ELEMENTS = "elements"
+
+# Properties that writing to an element can change: an array grows when an element is written past its end.
+ELEMENT_PROPERTIES = {"length"}
+
+
+def children(node: Any) -> Iterator[Any]:
+    """Yields the expressions and statements directly under `node`, in the order they are evaluated."""
+    for value in vars(node).values():
+        if isinstance(value, (Expr.Expr, Stmt.Stmt)):
+            yield value
+        elif isinstance(value, list):
+            for element in value:
+                if isinstance(element, (Expr.Expr, Stmt.Stmt)):
+                    yield element
+
+
+def replace(node: Any, replacements: Dict[Expr.Expr, Expr.Expr]) -> Any:
+    """Replaces every expression under `node` that is a key of `replacements`, and returns the new node."""
+    if isinstance(node, (Stmt.Function, Stmt.Class)):
+        return node
+    for name, value in vars(node).items():
+        if isinstance(value, (Expr.Expr, Stmt.Stmt)):
+            setattr(node, name, replace(value, replacements))
+        elif isinstance(value, list):
+            value[:] = [replace(element, replacements) if isinstance(element, (Expr.Expr, Stmt.Stmt)) else element
+                        for element in value]
+    return replacements.get(node, node)
+
+
+class Binding:
+    """A local variable. `captured_write` is set when a function other than the one declaring it assigns it."""
+
+    def __init__(self, function: int):
+        self.function = function
+        self.captured_write = False
+
+
+class Bindings:
+    """Finds the local each variable node of a resolved script refers to, or None for a global."""
+
+    def __init__(self, locals: Dict[Expr.Expr, int]):
+        self.locals = locals
+        self.scopes: List[Dict[str, Binding]] = []
+        self.module_scope: Optional[Dict[str, Binding]] = None
+        self.function = 0
+        self.functions = 0
+        # The variable read or written by each Variable, Assign, CompoundAssign and `for ... of` node.
+        self.targets: Dict[Any, Optional[Binding]] = {}
+        # The variable declared by each Var, Function, Class and `for (var ... of ...)` statement.
+        self.declarations: Dict[Stmt.Stmt, Optional[Binding]] = {}
+
+    def analyze(self, statements: List[Stmt.Stmt], module: bool = False) -> None:
+        if module:
+            self.scopes.append({})
+            self.module_scope = self.scopes[-1]
+            for statement in statements:
+                for name in declared_names(statement):
+                    self.declare(name)
+        for statement in statements:
+            self.visit(statement)
+
+    def declare(self, name: Token) -> Optional[Binding]:
+        if not self.scopes:
+            return None
+        scope = self.scopes[-1]
+        if scope is self.module_scope and name.lexeme in scope:
+            return scope[name.lexeme]
+        binding = Binding(self.function)
+        scope[name.lexeme] = binding
+        return binding
+
+    def look_up(self, node: Any, name: Token) -> Optional[Binding]:
+        if node in self.locals:
+            for scope in reversed(self.scopes):
+                if name.lexeme in scope:
+                    return scope[name.lexeme]
+        return None
+
+    def write(self, node: Any, name: Token) -> None:
+        binding = self.look_up(node, name)
+        self.targets[node] = binding
+        if binding is not None and binding.function != self.function:
+            binding.captured_write = True
+
+    def visit_function(self, function: Stmt.Function) -> None:
+        enclosing = self.function
+        self.functions += 1
+        self.function = self.functions
+        self.scopes.append({})
+        for param in function.params:
+            self.declare(param)
+        for statement in function.body:
+            self.visit(statement)
+        self.scopes.pop()
+        self.function = enclosing
+
+    def visit(self, node: Any) -> None:
+        if isinstance(node, Stmt.Function):
+            self.declarations[node] = self.declare(node.name)
+            self.visit_function(node)
+        elif isinstance(node, Stmt.Class):
+            self.declarations[node] = self.declare(node.name)
+            if node.superclass is not None:
+                self.visit(node.superclass)
+            for method in node.methods:
+                self.visit_function(method)
+        elif isinstance(node, Stmt.Block):
+            self.scopes.append({})
+            for statement in node.statements:
+                self.visit(statement)
+            self.scopes.pop()
+        elif isinstance(node, Stmt.ForOf):
+            self.visit(node.iterable)
+            if node.declare:
+                self.scopes.append({})
+                self.declarations[node] = self.declare(node.name)
+            else:
+                self.write(node, node.name)
+            self.visit(node.body)
+            if node.declare:
+                self.scopes.pop()
+        elif isinstance(node, Stmt.Var):
+            if node.initializer is not None:
+                self.visit(node.initializer)
+            self.declarations[node] = self.declare(node.name)
+        elif isinstance(node, Stmt.Import):
+            for name in imported_names(node):
+                self.declare(name)
+        elif isinstance(node, Expr.Variable):
+            self.targets[node] = self.look_up(node, node.name)
+        elif isinstance(node, (Expr.Assign, Expr.CompoundAssign)):
+            self.visit(node.value)
+            self.write(node, node.name)
+        else:
+            for child in children(node):
+                self.visit(child)
+
+
+class Effects:
+    """What running a piece of code may change."""
+
+    def __init__(self):
+        # A call or a resumed generator can run any code, which may change anything but the
+        # locals that only their own function assigns.
+        self.calls = False
+        self.locals: Set[Binding] = set()
+        self.globals: Set[str] = set()
+        self.properties: Set[str] = set()
+        self.elements = False
+
+    def write(self, binding: Optional[Binding], name: Token) -> None:
+        if binding is None:
+            self.globals.add(name.lexeme)
+        else:
+            self.locals.add(binding)
+
+
+class Group:
+    """Occurrences of one expression that all evaluate to the same value, and what that value depends on."""
+
+    def __init__(self, depends: Set[Any], calls: bool):
+        self.members: List[Expr.Expr] = []
+        self.depends = depends
+        self.calls = calls
+
+
+class Optimizer:
+    """Avoids evaluating the same pure expression twice in a resolved script.
+
+    Inside a while loop, pure expressions whose inputs the loop never changes
+    are evaluated once per run of the loop instead of once per iteration. In a
+    run of straight-line statements, a pure expression that occurs again
+    before anything writes to its inputs reuses the first occurrence's value.
+
+    Both work by wrapping the occurrences in Cached nodes that share a hidden
+    variable, and the loop or statements in a CacheScope that clears it. The
+    first occurrence evaluated stores its value and the others read it, so
+    every expression is still evaluated, and fails, at the place it appears
+    in the source. An expression is pure when it is built from literals,
+    variables, `this`, property and index reads and operators. Any call
+    invalidates every cached property, element and global read, as does a
+    write to the same variable, to a property of the same name on any object,
+    or to any array element. Host code changing a value in the middle of a
+    loop, for example between the slices of `run_async`, is not noticed.
+    Generator bodies are left alone.
+
+    The optimized script has to be resolved again, since the hidden variables
+    are new locals.
+    """
+
+    def __init__(self, locals: Dict[Expr.Expr, int]):
+        self.bindings = Bindings(locals)
+        self.temporaries = 0
+
+    def optimize(self, statements: List[Stmt.Stmt], module: bool = False) -> None:
+        self.bindings.analyze(statements, module)
+        self.optimize_block(statements, False)
+
+    def temporary(self) -> Token:
+        # Identifiers cannot contain spaces, so the name cannot clash with a script's variables.
+        self.temporaries += 1
+        return Token(TokenType.IDENTIFIER, f" cache{self.temporaries}", None, 0)
+
+    def optimize_block(self, statements: List[Stmt.Stmt], generator: bool) -> None:
+        for index, statement in enumerate(statements):
+            statements[index] = self.optimize_statement(statement, generator)
+        if not generator:
+            statements[:] = self.eliminate(statements)
+
+    def optimize_body(self, body: Stmt.Stmt, generator: bool) -> Stmt.Stmt:
+        statements = [body]
+        self.optimize_block(statements, generator)
+        return statements[0]
+
+    def optimize_statement(self, stmt: Stmt.Stmt, generator: bool) -> Stmt.Stmt:
+        result = stmt
+        if isinstance(stmt, Stmt.While) and not generator:
+            # Outer loops go first, so that an expression is cached by the outermost loop it is invariant in.
+            result = self.hoist(stmt)
+        if isinstance(stmt, Stmt.Block):
+            self.optimize_block(stmt.statements, generator)
+        elif isinstance(stmt, Stmt.If):
+            stmt.then_branch = self.optimize_body(stmt.then_branch, generator)
+            if stmt.else_branch is not None:
+                stmt.else_branch = self.optimize_body(stmt.else_branch, generator)
+        elif isinstance(stmt, (Stmt.While, Stmt.ForOf)):
+            stmt.body = self.optimize_body(stmt.body, generator)
+        elif isinstance(stmt, Stmt.Function):
+            self.optimize_block(stmt.body, stmt.is_generator)
+        elif isinstance(stmt, Stmt.Class):
+            for method in stmt.methods:
+                self.optimize_block(method.body, method.is_generator)
+        elif isinstance(stmt, Stmt.Export) and stmt.declaration is not None:
+            stmt.declaration = self.optimize_statement(stmt.declaration, generator)
+        return result
+
+    def hoist(self, loop: Stmt.While) -> Stmt.Stmt:
+        """Caches the loop-invariant expressions of `loop` for one run of the loop."""
+        effects = Effects()
+        parts = [part for part in (loop.condition, loop.body, loop.increment) if part is not None]
+        for part in parts:
+            self.effects(part, effects)
+        temporaries: Dict[Any, Token] = {}
+        replacements: Dict[Expr.Expr, Expr.Expr] = {}
+        for part in parts:
+            self.find_invariants(part, effects, temporaries, replacements)
+        if not replacements:
+            return loop
+        replace(loop, replacements)
+        return Stmt.CacheScope(list(temporaries.values()), [loop])
+
+    def effects(self, node: Any, effects: Effects) -> None:
+        bindings = self.bindings
+        if isinstance(node, (Stmt.Function, Stmt.Class)):
+            # Declaring a function runs none of its body.
+            effects.write(bindings.declarations[node], node.name)
+            return
+        if isinstance(node, (Expr.Call, Stmt.Yield, Stmt.ForOf)):
+            effects.calls = True
+        if isinstance(node, Stmt.Var) or (isinstance(node, Stmt.ForOf) and node.declare):
+            effects.write(bindings.declarations[node], node.name)
+        elif isinstance(node, (Expr.Assign, Expr.CompoundAssign, Stmt.ForOf)):
+            effects.write(bindings.targets[node], node.name)
+        elif isinstance(node, (Expr.Set, Expr.CompoundSet)):
+            effects.properties.add(node.name.lexeme)
+        elif isinstance(node, (Expr.SetIndex, Expr.CompoundSetIndex)):
+            effects.elements = True
+        for child in children(node):
+            self.effects(child, effects)
+
+    def find_invariants(self, node: Any, effects: Effects, temporaries: Dict[Any, Token],
+                        replacements: Dict[Expr.Expr, Expr.Expr]) -> None:
+        if isinstance(node, (Stmt.Function, Stmt.Class)):
+            return
+        if (isinstance(node, Expr.Expr) and not isinstance(node, Expr.Cached) and self.cost(node) >= WORTH_CACHING
+                and self.invariant(node, effects)):
+            key = self.key(node)
+            if key not in temporaries:
+                temporaries[key] = self.temporary()
+            replacements[node] = Expr.Cached(temporaries[key], node)
+            return
+        for child in children(node):
+            self.find_invariants(child, effects, temporaries, replacements)
+
+    def invariant(self, expr: Expr.Expr, effects: Effects) -> bool:
+        if isinstance(expr, (Expr.Literal, Expr.This)):
+            return True
+        if isinstance(expr, Expr.Variable):
+            binding = self.bindings.targets.get(expr)
+            if binding is None:
+                return not effects.calls and expr.name.lexeme not in effects.globals
+            return binding not in effects.locals and not (effects.calls and binding.captured_write)
+        if isinstance(expr, Expr.Get):
+            name = expr.name.lexeme
+            return (not effects.calls and name not in effects.properties
+                    and not (effects.elements and name in ELEMENT_PROPERTIES) and self.invariant(expr.object, effects))
+        if isinstance(expr, Expr.Index):
+            return (not effects.calls and not effects.elements and self.invariant(expr.object, effects)
+                    and self.invariant(expr.index, effects))
+        if isinstance(expr, (Expr.Binary, Expr.Logical)):
+            return self.invariant(expr.left, effects) and self.invariant(expr.right, effects)
+        if isinstance(expr, Expr.Unary):
+            return self.invariant(expr.right, effects)
+        if isinstance(expr, (Expr.Grouping, Expr.Cached)):
+            return self.invariant(expr.expression, effects)
+        return False
+
+    def eliminate(self, statements: List[Stmt.Stmt]) -> List[Stmt.Stmt]:
+        """Splits `statements` into runs of straight-line statements and removes common subexpressions in each."""
+        result: List[Stmt.Stmt] = []
+        run: List[Stmt.Stmt] = []
+        for statement in statements:
+            if isinstance(statement, STRAIGHT_LINE):
+                run.append(statement)
+                if not isinstance(statement, Stmt.Return):
+                    continue
+            result.extend(self.common_subexpressions(run))
+            run = []
+            if not isinstance(statement, STRAIGHT_LINE):
+                result.append(statement)
+        result.extend(self.common_subexpressions(run))
+        return result
+
+    def common_subexpressions(self, run: List[Stmt.Stmt]) -> List[Stmt.Stmt]:
+        live: Dict[Any, Group] = {}
+        groups: List[Group] = []
+        owners: Dict[Expr.Expr, Group] = {}
+        for statement in run:
+            self.scan(statement, live, groups, owners)
+        replacements: Dict[Expr.Expr, Expr.Expr] = {}
+        names: List[Token] = []
+        for group in groups:
+            if len(group.members) < 2:
+                continue
+            name = self.temporary()
+            names.append(name)
+            for member in group.members:
+                replacements[member] = Expr.Cached(name, member)
+        if not replacements:
+            return run
+        for statement in run:
+            replace(statement, replacements)
+        return [Stmt.CacheScope(names, run)]
+
+    def scan(self, node: Any, live: Dict[Any, Group], groups: List[Group], owners: Dict[Expr.Expr, Group]) -> None:
+        """Visits the expressions under `node` in evaluation order, grouping repeated ones until their inputs change."""
+        if isinstance(node, (Expr.Literal, Expr.Variable, Expr.This, Expr.Super, Expr.Cached)):
+            return
+        for child in children(node):
+            self.scan(child, live, groups, owners)
+        if isinstance(node, Expr.Call):
+            self.kill(live, lambda group: group.calls)
+        elif isinstance(node, (Expr.Assign, Expr.CompoundAssign)):
+            target = self.bindings.targets[node] or ("global", node.name.lexeme)
+            self.kill(live, lambda group: target in group.depends)
+        elif isinstance(node, Stmt.Var):
+            # Declaring a global again replaces its value.
+            target = self.bindings.declarations[node] or ("global", node.name.lexeme)
+            self.kill(live, lambda group: target in group.depends)
+        elif isinstance(node, (Expr.Set, Expr.CompoundSet)):
+            target = ("property", node.name.lexeme)
+            self.kill(live, lambda group: target in group.depends)
+        elif isinstance(node, (Expr.SetIndex, Expr.CompoundSetIndex)):
+            self.kill(live, lambda group: ELEMENTS in group.depends)
+        elif isinstance(node, Expr.Expr) and self.cost(node) >= WORTH_CACHING and self.pure(node):
+            key = self.key(node)
+            group = live.get(key)
+            if group is None:
+                depends: Set[Any] = set()
+                group = Group(depends, self.dependencies(node, depends))
+                live[key] = group
+                groups.append(group)
+            else:
+                # This occurrence reads the cached value, so the expressions inside it need no caching.
+                for child in children(node):
+                    self.disown(child, owners)
+            group.members.append(node)
+            owners[node] = group
+
+    def disown(self, expr: Expr.Expr, owners: Dict[Expr.Expr, Group]) -> None:
+        group = owners.pop(expr, None)
+        if group is not None:
+            group.members.remove(expr)
+        for child in children(expr):
+            self.disown(child, owners)
+
+    def kill(self, live: Dict[Any, Group], affected) -> None:
+        for key in [key for key, group in live.items() if affected(group)]:
+            del live[key]
+
+    def pure(self, expr: Expr.Expr) -> bool:
+        return isinstance(expr, PURE) and all(self.pure(child) for child in children(expr))
+
+    def cost(self, expr: Expr.Expr) -> int:
+        if isinstance(expr, (Expr.Get, Expr.Index)):
+            own = 2
+        elif isinstance(expr, (Expr.Binary, Expr.Logical, Expr.Unary, Expr.Cached)):
+            own = 1
+        elif isinstance(expr, (Expr.Literal, Expr.Variable, Expr.This, Expr.Grouping)):
+            own = 0
+        else:
+            return 0
+        if isinstance(expr, Expr.Cached):
+            return own
+        return own + sum(self.cost(child) for child in children(expr))
+
+    def dependencies(self, expr: Expr.Expr, depends: Set[Any]) -> bool:
+        """Adds what the value of a pure expression depends on to `depends`. Returns whether a call can change it."""
+        if isinstance(expr, Expr.Variable):
+            binding = self.bindings.targets.get(expr)
+            if binding is None:
+                depends.add(("global", expr.name.lexeme))
+                return True
+            depends.add(binding)
+            return binding.captured_write
+        calls = False
+        if isinstance(expr, Expr.Get):
+            depends.add(("property", expr.name.lexeme))
+            if expr.name.lexeme in ELEMENT_PROPERTIES:
+                depends.add(ELEMENTS)
+            calls = True
+        elif isinstance(expr, Expr.Index):
+            depends.add(ELEMENTS)
+            calls = True
+        for child in children(expr):
+            calls = self.dependencies(child, depends) or calls
+        return calls
+
+    def key(self, expr: Expr.Expr) -> Any:
+        """Returns a value that is equal for two pure expressions exactly when they compute the same thing."""
+        if isinstance(expr, Expr.Literal):
+            return "literal", type(expr.value).__name__, repr(expr.value)
+        if isinstance(expr, Expr.Variable):
+            binding = self.bindings.targets.get(expr)
+            return ("global", expr.name.lexeme) if binding is None else binding
+        if isinstance(expr, Expr.This):
+            return "this",
+        if isinstance(expr, Expr.Get):
+            return "get", self.key(expr.object), expr.name.lexeme
+        if isinstance(expr, Expr.Index):
+            return "index", self.key(expr.object), self.key(expr.index)
+        if isinstance(expr, (Expr.Binary, Expr.Logical)):
+            return "binary", expr.operator.type, self.key(expr.left), self.key(expr.right)
+        if isinstance(expr, Expr.Unary):
+            return "unary", expr.operator.type, self.key(expr.right)
+        # Grouping and Cached have the value of the expression they wrap.
+        return self.key(expr.expression)
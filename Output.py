@@ -0,0 +1,66 @@
+import sys
+from typing import List, Optional, TextIO
+
+
+class Output:
+    """Destination for text printed by scripts. Writes go straight to the stream.
+
+    When no stream is given, the current `sys.stdout` is looked up on every
+    write so that redirections made by the host are respected.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def target(self) -> TextIO:
+        return self.stream if self.stream is not None else sys.stdout
+
+    def write(self, text: str) -> None:
+        self.target().write(text)
+
+    def flush(self) -> None:
+        self.target().flush()
+
+
+class BufferedOutput(Output):
+    """Collects writes in memory and hands them to the stream in large chunks."""
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = 1 << 16):
+        super().__init__(stream)
+        self.buffer_size = buffer_size
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            stream = self.target()
+            stream.write("".join(self.parts))
+            stream.flush()
+            self.parts = []
+            self.size = 0
+
+
+class CapturedOutput(Output):
+    """Keeps everything written in memory for an embedding host to read back."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+
+    def flush(self) -> None:
+        pass
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
+
+    def clear(self) -> None:
+        self.parts = []
@@ -1,18 +1,32 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from Token import Token, TokenType
 import Expr
 import Stmt
+from Reporter import Reporter
+
+# The binary operator applied by each compound assignment and ++/--.
+COMPOUND_OPERATORS = {
+    TokenType.PLUS_EQUAL: TokenType.PLUS,
+    TokenType.MINUS_EQUAL: TokenType.MINUS,
+    TokenType.STAR_EQUAL: TokenType.STAR,
+    TokenType.SLASH_EQUAL: TokenType.SLASH,
+    TokenType.MODULO_EQUAL: TokenType.MODULO,
+    TokenType.PLUS_PLUS: TokenType.PLUS,
+    TokenType.MINUS_MINUS: TokenType.MINUS,
+}
 
 class Parser:
 
     class ParseError(Exception):
         pass
 
-    tokens: List[Token] = []
-    index: int = 0
+    tokens: List[Token]
+    index: int
 
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: List[Token], reporter=None):
         self.tokens = tokens
+        self.index = 0
+        self.reporter = reporter if reporter is not None else Reporter
 
     def previous(self) -> Token:
         return self.tokens[self.index - 1]
@@ -84,6 +98,18 @@ class Parser:
             self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
             return Expr.Grouping(expr)
 
+        if self.match(TokenType.LEFT_BRACKET):
+            bracket: Token = self.previous()
+            elements: List[Expr.Expr] = []
+            if not self.check(TokenType.RIGHT_BRACKET):
+                elements.append(self.expression())
+                while self.match(TokenType.COMMA):
+                    if self.check(TokenType.RIGHT_BRACKET):
+                        break
+                    elements.append(self.expression())
+            self.consume(TokenType.RIGHT_BRACKET, "Expect ']' after array elements.")
+            return Expr.Array(bracket, elements)
+
         raise self.error(self.peek(), "Expect expression.")
 
     def unary(self) -> Expr.Expr:
@@ -92,7 +118,17 @@ class Parser:
             right: Expr.Expr = self.unary()
             return Expr.Unary(operator, right)
 
-        return self.call()
+        if self.match(TokenType.PLUS_PLUS, TokenType.MINUS_MINUS):
+            operator: Token = self.previous()
+            target: Expr.Expr = self.unary()
+            return self.compound(target, operator, Expr.Literal(1), False)
+
+        expr: Expr.Expr = self.call()
+
+        if self.match(TokenType.PLUS_PLUS, TokenType.MINUS_MINUS):
+            return self.compound(expr, self.previous(), Expr.Literal(1), True)
+
+        return expr
 
     def finish_call(self, callee: Expr.Expr, has_new_keyword: bool) -> Expr.Expr:
         arguments: List[Expr.Expr] = []
@@ -118,6 +154,11 @@ class Parser:
             elif self.match(TokenType.DOT):
                 name: Token = self.consume(TokenType.IDENTIFIER, "Expect property name after '.'.")
                 expr = Expr.Get(expr, name)
+            elif self.match(TokenType.LEFT_BRACKET):
+                bracket: Token = self.previous()
+                index: Expr.Expr = self.expression()
+                self.consume(TokenType.RIGHT_BRACKET, "Expect ']' after index.")
+                expr = Expr.Index(expr, bracket, index)
             else:
                 break
 
@@ -126,10 +167,10 @@ class Parser:
     def factor(self) -> Expr.Expr:
         expr: Expr.Expr = self.unary()
 
-        while self.match(TokenType.SLASH, TokenType.STAR):
+        while self.match(TokenType.SLASH, TokenType.STAR, TokenType.MODULO):
             operator: Token = self.previous()
             right: Expr.Expr = self.unary()
-            expr = Expr.Binary(expr, operator, right)
+            expr = Expr.Binary(expr, operator, right, None)
 
         return expr
 
@@ -139,7 +180,7 @@ class Parser:
         while self.match(TokenType.MINUS, TokenType.PLUS):
             operator: Token = self.previous()
             right: Expr.Expr = self.factor()
-            expr = Expr.Binary(expr, operator, right)
+            expr = Expr.Binary(expr, operator, right, None)
 
         return expr
 
@@ -149,7 +190,7 @@ class Parser:
         while self.match(TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL):
             operator: Token = self.previous()
             right: Expr.Expr = self.term()
-            expr = Expr.Binary(expr, operator, right)
+            expr = Expr.Binary(expr, operator, right, None)
 
         return expr
 
@@ -159,7 +200,7 @@ class Parser:
         while self.match(TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
             operator: Token = self.previous()
             right: Expr.Expr = self.comparison()
-            expr = Expr.Binary(expr, operator, right)
+            expr = Expr.Binary(expr, operator, right, None)
 
         return expr
 
@@ -175,14 +216,14 @@ class Parser:
             value = self.expression()
 
         self.consume(TokenType.SEMICOLON, "Expect ';' after return value.")
-        return Stmt.Return(keyword, value)
+        return Stmt.Return(keyword, value, False)
 
     def expression_statement(self) -> Stmt.Stmt:
         expr: Expr.Expr = self.expression()
         self.consume(TokenType.SEMICOLON, "Expect ';' after expression.")
         return Stmt.Expression(expr)
 
-    def function(self, kind: str) -> Stmt.Stmt:
+    def function(self, kind: str, is_generator: bool = False) -> Stmt.Stmt:
         name: Token = self.consume(TokenType.IDENTIFIER, f"Expect {kind} name.")
         self.consume(TokenType.LEFT_PAREN, f"Expect '(' after {kind} name.")
         parameters: List[Token] = []
@@ -197,7 +238,7 @@ class Parser:
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after parameters.")
         self.consume(TokenType.LEFT_BRACE, f"Expect '{{' before {kind} body.")
         body: List[Stmt.Stmt] = self.block()
-        return Stmt.Function(name, parameters, body)
+        return Stmt.Function(name, parameters, body, is_generator)
 
     def assignment(self) -> Expr.Expr:
         expr: Expr.Expr = self.or_expr()
@@ -214,10 +255,37 @@ class Parser:
                 get: Expr.Get = expr
                 return Expr.Set(get.object, get.name, value)
 
+            elif isinstance(expr, Expr.Index):
+                index: Expr.Index = expr
+                return Expr.SetIndex(index.object, index.bracket, index.index, value)
+
             self.error(equals, "Invalid assignment target.")
 
+        elif self.match(TokenType.PLUS_EQUAL, TokenType.MINUS_EQUAL, TokenType.STAR_EQUAL, TokenType.SLASH_EQUAL,
+                        TokenType.MODULO_EQUAL):
+            operator: Token = self.previous()
+            value: Expr.Expr = self.assignment()
+            return self.compound(expr, operator, value, False)
+
         return expr
 
+    def compound(self, target: Expr.Expr, operator: Token, value: Expr.Expr, postfix: bool) -> Expr.Expr:
+        # The node carries the plain binary operator, keeping the original
+        # lexeme for error messages.
+        binary = Token(COMPOUND_OPERATORS[operator.type], operator.lexeme, None, operator.line)
+
+        if isinstance(target, Expr.Variable):
+            return Expr.CompoundAssign(target.name, binary, value, postfix, None)
+
+        elif isinstance(target, Expr.Get):
+            return Expr.CompoundSet(target.object, target.name, binary, value, postfix)
+
+        elif isinstance(target, Expr.Index):
+            return Expr.CompoundSetIndex(target.object, target.bracket, target.index, binary, value, postfix)
+
+        self.error(operator, "Invalid assignment target.")
+        return target
+
     def or_expr(self) -> Expr.Expr:
         expr: Expr.Expr = self.and_expr()
 
@@ -253,6 +321,12 @@ class Parser:
         return statements
 
     def statement(self) -> Stmt.Stmt:
+        if self.match(TokenType.BREAK):
+            return self.break_statement()
+
+        if self.match(TokenType.CONTINUE):
+            return self.continue_statement()
+
         if self.match(TokenType.FOR):
             return self.for_statement()
 
@@ -268,14 +342,31 @@ class Parser:
         if self.match(TokenType.WHILE):
             return self.while_statement()
 
+        if self.match(TokenType.YIELD):
+            return self.yield_statement()
+
         if self.match(TokenType.LEFT_BRACE):
             return Stmt.Block(self.block())
 
         return self.expression_statement()
 
+    def break_statement(self) -> Stmt.Stmt:
+        keyword: Token = self.previous()
+        self.consume(TokenType.SEMICOLON, "Expect ';' after 'break'.")
+        return Stmt.Break(keyword)
+
+    def continue_statement(self) -> Stmt.Stmt:
+        keyword: Token = self.previous()
+        self.consume(TokenType.SEMICOLON, "Expect ';' after 'continue'.")
+        return Stmt.Continue(keyword)
+
     def for_statement(self) -> Stmt.Stmt:
+        keyword: Token = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
 
+        if self.is_for_of():
+            return self.for_of_statement(keyword)
+
         if self.match(TokenType.SEMICOLON):
             initializer: Optional[Stmt.Stmt] = None
         elif self.match(TokenType.VAR):
@@ -295,18 +386,32 @@ class Parser:
 
         body: Stmt.Stmt = self.statement()
 
-        if increment is not None:
-            body = Stmt.Block([body, Stmt.Expression(increment)])
-
+        # The increment is kept on the loop instead of being appended to the
+        # body, so that `continue` skips the rest of the body but not it.
         if condition is None:
             condition = Expr.Literal(True)
-        body = Stmt.While(condition, body)
+        body = Stmt.While(keyword, condition, body, increment)
 
         if initializer is not None:
             body = Stmt.Block([initializer, body])
 
         return body
 
+    def is_for_of(self) -> bool:
+        # `of` is not a keyword, so it is only recognized after the loop variable.
+        start = self.index + 1 if self.check(TokenType.VAR) else self.index
+        return (start + 1 < len(self.tokens) and self.tokens[start].type == TokenType.IDENTIFIER
+                and self.tokens[start + 1].type == TokenType.IDENTIFIER and self.tokens[start + 1].lexeme == "of")
+
+    def for_of_statement(self, keyword: Token) -> Stmt.Stmt:
+        declare: bool = self.match(TokenType.VAR)
+        name: Token = self.consume(TokenType.IDENTIFIER, "Expect variable name.")
+        self.advance()
+        iterable: Expr.Expr = self.expression()
+        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
+        body: Stmt.Stmt = self.statement()
+        return Stmt.ForOf(keyword, name, declare, iterable, body)
+
     def if_statement(self) -> Stmt.Stmt:
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'if'.")
         condition: Expr.Expr = self.expression()
@@ -329,28 +434,103 @@ class Parser:
         self.consume(TokenType.SEMICOLON, "Expect ';' after variable declaration.")
         return Stmt.Var(name, initializer)
 
+    def yield_statement(self) -> Stmt.Stmt:
+        keyword: Token = self.previous()
+        value: Optional[Expr.Expr] = None
+        if not self.check(TokenType.SEMICOLON):
+            value = self.expression()
+
+        self.consume(TokenType.SEMICOLON, "Expect ';' after yield value.")
+        return Stmt.Yield(keyword, value)
+
     def while_statement(self) -> Stmt.Stmt:
+        keyword: Token = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
         condition: Expr.Expr = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
         body: Stmt.Stmt = self.statement()
 
-        return Stmt.While(condition, body)
+        return Stmt.While(keyword, condition, body, None)
 
     def declaration(self) -> Optional[Stmt.Stmt]:
         try:
             if self.match(TokenType.CLASS):
                 return self.class_declaration()
             if self.match(TokenType.FUNCTION):
+                if self.match(TokenType.STAR):
+                    return self.function("function", True)
                 return self.function("function")
             if self.match(TokenType.VAR):
                 return self.var_declaration()
+            if self.match(TokenType.IMPORT):
+                return self.import_declaration()
+            if self.match(TokenType.EXPORT):
+                return self.export_declaration()
 
             return self.statement()
         except Parser.ParseError:
             self.synchronize()
             return None
 
+    def contextual(self, word: str, message: str) -> Token:
+        # `as` and `from` are not keywords, so they are only recognized in import and export clauses.
+        if self.check(TokenType.IDENTIFIER) and self.peek().lexeme == word:
+            return self.advance()
+        raise self.error(self.peek(), message)
+
+    def binding_list(self, kind: str) -> Tuple[List[Token], List[Token]]:
+        names: List[Token] = []
+        aliases: List[Token] = []
+        self.consume(TokenType.LEFT_BRACE, f"Expect '{{' after '{kind}'.")
+        if not self.check(TokenType.RIGHT_BRACE):
+            while True:
+                name: Token = self.consume(TokenType.IDENTIFIER, f"Expect name to {kind}.")
+                alias: Token = name
+                if self.check(TokenType.IDENTIFIER) and self.peek().lexeme == "as":
+                    self.advance()
+                    alias = self.consume(TokenType.IDENTIFIER, "Expect name after 'as'.")
+                names.append(name)
+                aliases.append(alias)
+                if not self.match(TokenType.COMMA):
+                    break
+        self.consume(TokenType.RIGHT_BRACE, f"Expect '}}' after {kind} names.")
+        return names, aliases
+
+    def import_declaration(self) -> Stmt.Stmt:
+        keyword: Token = self.previous()
+        names: List[Token] = []
+        aliases: List[Token] = []
+        namespace: Optional[Token] = None
+        if self.match(TokenType.STAR):
+            self.contextual("as", "Expect 'as' after '*'.")
+            namespace = self.consume(TokenType.IDENTIFIER, "Expect namespace name.")
+        else:
+            names, aliases = self.binding_list("import")
+        self.contextual("from", "Expect 'from' after import names.")
+        path: Token = self.consume(TokenType.STRING, "Expect module path.")
+        self.consume(TokenType.SEMICOLON, "Expect ';' after import.")
+        return Stmt.Import(keyword, names, aliases, namespace, path)
+
+    def export_declaration(self) -> Stmt.Stmt:
+        keyword: Token = self.previous()
+        if self.check(TokenType.LEFT_BRACE):
+            names, aliases = self.binding_list("export")
+            self.consume(TokenType.SEMICOLON, "Expect ';' after export.")
+            return Stmt.Export(keyword, None, names, aliases)
+
+        if self.match(TokenType.CLASS):
+            declaration = self.class_declaration()
+        elif self.match(TokenType.FUNCTION):
+            if self.match(TokenType.STAR):
+                declaration = self.function("function", True)
+            else:
+                declaration = self.function("function")
+        elif self.match(TokenType.VAR):
+            declaration = self.var_declaration()
+        else:
+            raise self.error(self.peek(), "Expect declaration or '{' after 'export'.")
+        return Stmt.Export(keyword, declaration, [declaration.name], [declaration.name])
+
     def class_declaration(self) -> Stmt.Stmt:
         name: Token = self.consume(TokenType.IDENTIFIER, "Expect class name.")
 
@@ -370,8 +550,7 @@ class Parser:
         return Stmt.Class(name, superclass, methods)
 
     def error(self, token: Token, message: str) -> ParseError:
-        from JavaScript import JavaScript
-        JavaScript.error_with_token(token, message)
+        self.reporter.error_with_token(token, message)
         return Parser.ParseError()
 
     def consume(self, type: TokenType, message: str) -> Token:
@@ -0,0 +1,34 @@
+from Token import Token, TokenType
+from RuntimeErrorException import RuntimeErrorException
+
+
+class Reporter:
+    """Default error reporter of a Scanner, Parser or Interpreter created without a context.
+
+    Errors are printed to stdout and recorded in class-level flags. Runs
+    started from a Context report to the context instead.
+    """
+    had_error = False
+    had_runtime_error = False
+
+    @staticmethod
+    def report(line: int, where: str, message: str) -> None:
+        print(f"[line {line}] Error{where}: {message}")
+
+    @staticmethod
+    def error_with_token(token: Token, message: str) -> None:
+        if token.type == TokenType.EOF:
+            Reporter.report(token.line, " at end", message)
+        else:
+            Reporter.report(token.line, f" at '{token.lexeme}'", message)
+        Reporter.had_error = True
+
+    @staticmethod
+    def runtime_error(error: RuntimeErrorException) -> None:
+        print(f"{error.message}\n[line {error.token.line}]")
+        Reporter.had_runtime_error = True
+
+    @staticmethod
+    def error(line: int, message: str) -> None:
+        Reporter.report(line, "", message)
+        Reporter.had_error = True
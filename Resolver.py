@@ -1,6 +1,6 @@
 import Stmt
 import Expr
-from typing import List
+from typing import Dict, List, Optional
 from Token import Token
 from RuntimeErrorException import RuntimeErrorException
 from enum import Enum, auto
@@ -9,6 +9,7 @@ from enum import Enum, auto
 class FunctionType(Enum):
     NONE = auto()
     FUNCTION = auto()
+    GENERATOR = auto()
     METHOD = auto()
     CONSTRUCTOR = auto()
 
@@ -18,19 +19,56 @@ class ClassType(Enum):
     SUBCLASS = auto()
 
 
-class Resolver(Stmt.Visitor, Expr.Visitor):
+def imported_names(stmt: Stmt.Import) -> List[Token]:
+    return [stmt.namespace] if stmt.namespace is not None else stmt.aliases
+
+
+def declared_names(stmt: Stmt.Stmt) -> List[Token]:
+    """Returns the names a top-level statement declares."""
+    if isinstance(stmt, Stmt.Export):
+        stmt = stmt.declaration
+    if isinstance(stmt, (Stmt.Var, Stmt.Function, Stmt.Class)):
+        return [stmt.name]
+    if isinstance(stmt, Stmt.Import):
+        return imported_names(stmt)
+    if isinstance(stmt, Stmt.CacheScope):
+        return [name for statement in stmt.body for name in declared_names(statement)]
+    return []
 
-    current_class = ClassType.NONE
+
+class Resolver(Stmt.Visitor, Expr.Visitor):
 
     def __init__(self, interpreter):
         self.interpreter = interpreter
         self.scopes = []
         self.current_function = FunctionType.NONE
+        self.current_class = ClassType.NONE
+        self.loop_depth = 0
+        # The top-level scope of the module being resolved, and the local name of each of its exports.
+        self.module_scope: Optional[Dict[str, bool]] = None
+        self.exports: Dict[str, str] = {}
 
     def resolve(self, statements: List[Stmt.Stmt]):
         for statement in statements:
             self.resolve_stmt(statement)
 
+    def resolve_module(self, statements: List[Stmt.Stmt]) -> List[str]:
+        """Resolves a module, whose top-level declarations are local to it rather than global.
+
+        The declarations are hoisted so that the module's functions can refer to
+        each other in any order. Returns the names of the hoisted declarations.
+        """
+        self.begin_scope()
+        self.module_scope = self.scopes[-1]
+        for statement in statements:
+            for name in declared_names(statement):
+                if name.lexeme in self.module_scope:
+                    raise RuntimeErrorException(name, "Variable with this name already declared in this scope.")
+                self.module_scope[name.lexeme] = True
+        self.resolve(statements)
+        self.end_scope()
+        return list(self.module_scope)
+
     def resolve_stmt(self, statement: Stmt.Stmt):
         statement.accept(self)
 
@@ -48,6 +86,9 @@ class Resolver(Stmt.Visitor, Expr.Visitor):
             return
 
         scope = self.scopes[-1]
+        if scope is self.module_scope:
+            # Already declared when the module was hoisted.
+            return
         if name.lexeme in scope:
             raise RuntimeErrorException(name, "Variable with this name already declared in this scope.")
 
@@ -67,7 +108,9 @@ class Resolver(Stmt.Visitor, Expr.Visitor):
 
     def resolve_function(self, function: Stmt.Function, function_type: FunctionType):
         enclosing_function = self.current_function
+        enclosing_loop_depth = self.loop_depth
         self.current_function = function_type
+        self.loop_depth = 0
 
         self.begin_scope()
         for param in function.params:
@@ -78,12 +121,20 @@ class Resolver(Stmt.Visitor, Expr.Visitor):
         self.end_scope()
 
         self.current_function = enclosing_function
+        self.loop_depth = enclosing_loop_depth
 
     def visit_block_stmt(self, stmt):
         self.begin_scope()
         self.resolve(stmt.statements)
         self.end_scope()
 
+    def visit_cachescope_stmt(self, stmt):
+        # The cached values live in the enclosing scope, which the scope does not replace.
+        if self.scopes:
+            for name in stmt.names:
+                self.scopes[-1][name.lexeme] = True
+        self.resolve(stmt.body)
+
     def visit_class_stmt(self, stmt):
         enclosing_class = self.current_class
         self.current_class = ClassType.CLASS
@@ -137,7 +188,26 @@ class Resolver(Stmt.Visitor, Expr.Visitor):
     def visit_function_stmt(self, stmt):
         self.declare(stmt.name)
         self.define(stmt.name)
-        self.resolve_function(stmt, FunctionType.FUNCTION)
+        self.resolve_function(stmt, FunctionType.GENERATOR if stmt.is_generator else FunctionType.FUNCTION)
+
+    def visit_import_stmt(self, stmt):
+        if self.scopes and self.scopes[-1] is not self.module_scope:
+            raise RuntimeErrorException(stmt.keyword, "Import declarations may only appear at top level.")
+        for name in imported_names(stmt):
+            self.declare(name)
+            self.define(name)
+
+    def visit_export_stmt(self, stmt):
+        if self.module_scope is None or self.scopes[-1] is not self.module_scope:
+            raise RuntimeErrorException(stmt.keyword, "Export declarations may only appear at the top level of a module.")
+        if stmt.declaration is not None:
+            self.resolve_stmt(stmt.declaration)
+        for name, alias in zip(stmt.names, stmt.aliases):
+            if name.lexeme not in self.module_scope:
+                raise RuntimeErrorException(name, f"Cannot export undeclared '{name.lexeme}'.")
+            if alias.lexeme in self.exports:
+                raise RuntimeErrorException(alias, f"Duplicate export '{alias.lexeme}'.")
+            self.exports[alias.lexeme] = name.lexeme
 
     def visit_expression_stmt(self, stmt):
         self.resolve_expr(stmt.expression)
@@ -160,23 +230,96 @@ class Resolver(Stmt.Visitor, Expr.Visitor):
                 # TODO: Return always instance of class.
                 raise RuntimeErrorException(stmt.keyword, "Cannot return a value from a constructor.")
             self.resolve_expr(stmt.value)
+            # Nothing runs after the call in `return f(...)`, so the caller's
+            # frame can be reused for it. A generator has no frame to reuse.
+            stmt.tail_call = (isinstance(stmt.value, Expr.Call) and not stmt.value.has_new_keyword
+                              and self.current_function != FunctionType.GENERATOR)
 
     def visit_while_stmt(self, stmt):
         self.resolve_expr(stmt.condition)
+        self.loop_depth += 1
         self.resolve_stmt(stmt.body)
+        self.loop_depth -= 1
+        if stmt.increment is not None:
+            self.resolve_expr(stmt.increment)
+
+    def visit_forof_stmt(self, stmt):
+        self.resolve_expr(stmt.iterable)
+        if stmt.declare:
+            self.begin_scope()
+            self.declare(stmt.name)
+            self.define(stmt.name)
+        else:
+            self.resolve_local(stmt, stmt.name)
+        self.loop_depth += 1
+        self.resolve_stmt(stmt.body)
+        self.loop_depth -= 1
+        if stmt.declare:
+            self.end_scope()
+
+    def visit_yield_stmt(self, stmt):
+        if self.current_function != FunctionType.GENERATOR:
+            raise RuntimeErrorException(stmt.keyword, "Cannot use 'yield' outside of a generator function.")
+        if stmt.value is not None:
+            self.resolve_expr(stmt.value)
+
+    def visit_break_stmt(self, stmt):
+        if self.loop_depth == 0:
+            raise RuntimeErrorException(stmt.keyword, "Cannot use 'break' outside of a loop.")
+
+    def visit_continue_stmt(self, stmt):
+        if self.loop_depth == 0:
+            raise RuntimeErrorException(stmt.keyword, "Cannot use 'continue' outside of a loop.")
 
     def visit_binary_expr(self, expr):
         self.resolve_expr(expr.left)
         self.resolve_expr(expr.right)
 
+    def visit_cached_expr(self, expr):
+        self.resolve_expr(expr.expression)
+        self.resolve_local(expr, expr.name)
+
     def visit_call_expr(self, expr):
         self.resolve_expr(expr.callee)
         for argument in expr.arguments:
             self.resolve_expr(argument)
 
+    def visit_compoundassign_expr(self, expr):
+        self.resolve_expr(expr.value)
+        self.resolve_local(expr, expr.name)
+
+    def visit_compoundset_expr(self, expr):
+        self.resolve_expr(expr.object)
+        self.resolve_expr(expr.value)
+
+    def visit_compoundsetindex_expr(self, expr):
+        self.resolve_expr(expr.object)
+        self.resolve_expr(expr.index)
+        self.resolve_expr(expr.value)
+
     def visit_get_expr(self, expr):
         self.resolve_expr(expr.object)
 
+    def visit_inlined_expr(self, expr):
+        # The body only reads the parameters of the inlined function and globals, which are never resolved.
+        self.resolve_expr(expr.call)
+
+    def visit_parameter_expr(self, expr):
+        pass
+
+    def visit_array_expr(self, expr):
+        for element in expr.elements:
+            self.resolve_expr(element)
+
+    def visit_index_expr(self, expr):
+        self.resolve_expr(expr.object)
+        self.resolve_expr(expr.index)
+
+    def visit_setindex_expr(self, expr):
+        self.resolve_expr(expr.value)
+        self.resolve_expr(expr.object)
+        self.resolve_expr(expr.index)
+
     def visit_grouping_expr(self, expr):
         self.resolve_expr(expr.expression)
 
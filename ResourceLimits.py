@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+from typing import Callable, Optional
+from Token import Token
+from RuntimeErrorException import RuntimeErrorException
+
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def resident_memory() -> int:
+    """Returns the resident set size of the process in bytes, or 0 if it is unknown."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current usage, in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ResourceLimits:
+    """Per-run limits for untrusted scripts. A limit set to None is not enforced.
+
+    Steps are counted at loop back-edges and function calls. The step budget is
+    exact, while the clock and memory are only sampled every `check_interval`
+    steps so that the bookkeeping on the hot path stays a counter increment.
+    """
+    max_steps: Optional[int]
+    max_call_depth: Optional[int]
+    max_memory: Optional[int]
+    timeout: Optional[float]
+    check_interval: int
+
+    def __init__(self, max_steps: Optional[int] = None, max_call_depth: Optional[int] = None,
+                 max_memory: Optional[int] = None, timeout: Optional[float] = None, check_interval: int = 1000):
+        self.max_steps = max_steps
+        self.max_call_depth = max_call_depth
+        self.max_memory = max_memory
+        self.timeout = timeout
+        self.check_interval = check_interval
+
+
+class ResourceGuard:
+    """Tracks the resources used by a single run against a set of ResourceLimits.
+
+    Memory is approximated as the growth of the process RSS since the run
+    started plus the bytes the engine charges for values it keeps lazily, such
+    as ropes. RSS is sampled only at the periodic check points, and is shared by
+    every thread of the process, so the limit is a ceiling rather than an exact
+    account.
+
+    The guard can also call `pause` every `pause_every` steps, which lets an
+    embedder suspend a run at a safe point.
+    """
+
+    def __init__(self, limits: ResourceLimits, pause: Optional[Callable[[], None]] = None, pause_every: int = 0):
+        self.limits = limits
+        self.pause = pause
+        self.pause_every = pause_every
+        self.next_pause = float("inf")
+        self.steps = 0
+        self.call_depth = 0
+        self.next_check = float("inf")
+        self.deadline: Optional[float] = None
+        self.memory_baseline = 0
+        self.charged = 0
+
+    def start(self) -> None:
+        limits = self.limits
+        self.steps = 0
+        self.call_depth = 0
+        self.deadline = None
+        self.charged = 0
+        if self.pause is not None:
+            self.next_pause = self.pause_every
+        if limits.timeout is not None:
+            self.deadline = time.monotonic() + limits.timeout
+        if limits.max_memory is not None:
+            self.memory_baseline = resident_memory()
+        self.schedule_check()
+
+    def schedule_check(self) -> None:
+        limits = self.limits
+        if limits.timeout is None and limits.max_memory is None:
+            next_check = float("inf")
+        else:
+            next_check = self.steps + limits.check_interval
+        if limits.max_steps is not None:
+            next_check = min(next_check, limits.max_steps + 1)
+        self.next_check = min(next_check, self.next_pause)
+
+    def check(self, token: Token) -> None:
+        limits = self.limits
+        if limits.max_steps is not None and self.steps > limits.max_steps:
+            raise RuntimeErrorException(token, f"Step limit of {limits.max_steps} exceeded.")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise RuntimeErrorException(token, f"Execution timed out after {limits.timeout} seconds.")
+        if limits.max_memory is not None:
+            used = max(0, resident_memory() - self.memory_baseline) + self.charged
+            if used > limits.max_memory:
+                raise RuntimeErrorException(token, f"Memory limit of {limits.max_memory} bytes exceeded.")
+        if self.steps >= self.next_pause:
+            self.next_pause = self.steps + self.pause_every
+            self.pause()
+        self.schedule_check()
+
+    def enter_call(self, token: Token) -> None:
+        self.call_depth += 1
+        max_call_depth = self.limits.max_call_depth
+        if max_call_depth is not None and self.call_depth > max_call_depth:
+            raise RuntimeErrorException(token, "Maximum call stack size exceeded.")
@@ -0,0 +1,69 @@
+from typing import List, Optional, Union
+
+# Concatenations shorter than this are done eagerly; a rope only pays off once
+# copying the operands costs more than keeping them apart.
+MIN_ROPE_LENGTH = 64
+
+
+class Rope:
+    """A string produced by `+` that is only joined when it is observed.
+
+    Ropes built by repeatedly appending to the same value (`s = s + x`) share
+    one parts list: each concatenation appends to it and records how many parts
+    belong to the new rope, so building a long string is linear overall.
+    """
+    __slots__ = ("parts", "count", "length", "flat")
+    parts: List[Union[str, "Rope"]]
+    count: int
+    length: int
+    flat: Optional[str]
+
+    def __init__(self, parts: List[Union[str, "Rope"]], count: int, length: int):
+        self.parts = parts
+        self.count = count
+        self.length = length
+        self.flat = None
+
+    def __str__(self):
+        return self.flatten()
+
+    def __repr__(self):
+        return f"Rope(length={self.length})"
+
+    def flatten(self) -> str:
+        if self.flat is None:
+            pieces: List[str] = []
+            stack = self.parts[self.count - 1::-1]
+            while stack:
+                part = stack.pop()
+                if type(part) is str:
+                    pieces.append(part)
+                elif part.flat is not None:
+                    pieces.append(part.flat)
+                else:
+                    stack.extend(part.parts[part.count - 1::-1])
+            self.flat = "".join(pieces)
+        return self.flat
+
+
+def length(value: Union[str, Rope]) -> int:
+    # Ropes do not implement __len__: a rope built by repeated doubling can
+    # outgrow sys.maxsize, which len() cannot return.
+    return value.length if type(value) is Rope else len(value)
+
+
+def concat(left: Union[str, Rope], right: Union[str, Rope]) -> Union[str, Rope]:
+    total = length(left) + length(right)
+    if total < MIN_ROPE_LENGTH:
+        return str(left) + str(right)
+    if type(left) is Rope and left.count == len(left.parts):
+        left.parts.append(right)
+        return Rope(left.parts, left.count + 1, total)
+    return Rope([left, right], 2, total)
+
+
+def flatten(value):
+    """Returns `value` with any rope replaced by a plain str."""
+    if type(value) is Rope:
+        return value.flatten()
+    return value
@@ -1,9 +1,12 @@
 from typing import List
 from Token import Token, TokenType, KEYWORDS
+from JSNumber import from_literal
+from Reporter import Reporter
 
 class Scanner():
-    def __init__(self, source: str):
+    def __init__(self, source: str, reporter=None):
         self.source = source
+        self.reporter = reporter if reporter is not None else Reporter
         self.tokens: List[Token] = []
         self.start = 0
         #Current cursor position
@@ -41,8 +44,7 @@ class Scanner():
         self.report(line, "", message)
 
     def error_token(self, message: str) -> None:
-        from JavaScript import JavaScript
-        JavaScript.error(self.line, message)
+        self.reporter.error(self.line, message)
 
     def string(self) -> None:
         while self.peek() != '"' and not self.is_at_end():
@@ -68,7 +70,7 @@ class Scanner():
             self.advance()
             while self.peek().isdigit():
                 self.advance()
-        self.add_token(TokenType.NUMBER, float(self.source[self.start:self.current]))
+        self.add_token(TokenType.NUMBER, from_literal(self.source[self.start:self.current]))
 
     def identifier(self) -> None:
         while self.peek().isalnum():
@@ -87,20 +89,30 @@ class Scanner():
             self.add_token(TokenType.LEFT_BRACE)
         elif c == "}":
             self.add_token(TokenType.RIGHT_BRACE)
+        elif c == "[":
+            self.add_token(TokenType.LEFT_BRACKET)
+        elif c == "]":
+            self.add_token(TokenType.RIGHT_BRACKET)
         elif c == ",":
             self.add_token(TokenType.COMMA)
         elif c == ".":
             self.add_token(TokenType.DOT)
         elif c == "-":
-            self.add_token(TokenType.MINUS)
+            if self.match("-"):
+                self.add_token(TokenType.MINUS_MINUS)
+            else:
+                self.add_token(TokenType.MINUS_EQUAL if self.match("=") else TokenType.MINUS)
         elif c == "+":
-            self.add_token(TokenType.PLUS)
+            if self.match("+"):
+                self.add_token(TokenType.PLUS_PLUS)
+            else:
+                self.add_token(TokenType.PLUS_EQUAL if self.match("=") else TokenType.PLUS)
         elif c == ";":
             self.add_token(TokenType.SEMICOLON)
         elif c == "*":
-            self.add_token(TokenType.STAR)
+            self.add_token(TokenType.STAR_EQUAL if self.match("=") else TokenType.STAR)
         elif c == "%":
-            self.add_token(TokenType.MODULO)
+            self.add_token(TokenType.MODULO_EQUAL if self.match("=") else TokenType.MODULO)
         elif c == "!":
             self.add_token(TokenType.BANG_EQUAL if self.match("=") else TokenType.BANG)
         elif c == "=":
@@ -114,7 +126,7 @@ class Scanner():
                 while self.peek() != "\n" and not self.is_at_end():
                     self.advance()
             else:
-                self.add_token(TokenType.SLASH)
+                self.add_token(TokenType.SLASH_EQUAL if self.match("=") else TokenType.SLASH)
         elif c in [" ", "\r", "\t"]:
             pass
         elif c == "\n":
@@ -8,18 +8,36 @@ class Visitor:
     def visit_block_stmt(self, stmt):
         pass
 
+    def visit_break_stmt(self, stmt):
+        pass
+
+    def visit_cachescope_stmt(self, stmt):
+        pass
+
     def visit_class_stmt(self, stmt):
         pass
 
+    def visit_continue_stmt(self, stmt):
+        pass
+
+    def visit_export_stmt(self, stmt):
+        pass
+
     def visit_expression_stmt(self, stmt):
         pass
 
+    def visit_forof_stmt(self, stmt):
+        pass
+
     def visit_function_stmt(self, stmt):
         pass
 
     def visit_if_stmt(self, stmt):
         pass
 
+    def visit_import_stmt(self, stmt):
+        pass
+
     def visit_print_stmt(self, stmt):
         pass
 
@@ -32,6 +50,9 @@ class Visitor:
     def visit_while_stmt(self, stmt):
         pass
 
+    def visit_yield_stmt(self, stmt):
+        pass
+
 class Block(Stmt):
     def __init__(self, statements, ):
         self.statements = statements
@@ -39,6 +60,21 @@ class Block(Stmt):
     def accept(self, visitor):
         return visitor.visit_block_stmt(self)
 
+class Break(Stmt):
+    def __init__(self, keyword, ):
+        self.keyword = keyword
+
+    def accept(self, visitor):
+        return visitor.visit_break_stmt(self)
+
+class CacheScope(Stmt):
+    def __init__(self, names, body, ):
+        self.names = names
+        self.body = body
+
+    def accept(self, visitor):
+        return visitor.visit_cachescope_stmt(self)
+
 class Class(Stmt):
     def __init__(self, name, superclass, methods, ):
         self.name = name
@@ -48,6 +84,23 @@ class Class(Stmt):
     def accept(self, visitor):
         return visitor.visit_class_stmt(self)
 
+class Continue(Stmt):
+    def __init__(self, keyword, ):
+        self.keyword = keyword
+
+    def accept(self, visitor):
+        return visitor.visit_continue_stmt(self)
+
+class Export(Stmt):
+    def __init__(self, keyword, declaration, names, aliases, ):
+        self.keyword = keyword
+        self.declaration = declaration
+        self.names = names
+        self.aliases = aliases
+
+    def accept(self, visitor):
+        return visitor.visit_export_stmt(self)
+
 class Expression(Stmt):
     def __init__(self, expression, ):
         self.expression = expression
@@ -55,11 +108,23 @@ class Expression(Stmt):
     def accept(self, visitor):
         return visitor.visit_expression_stmt(self)
 
+class ForOf(Stmt):
+    def __init__(self, keyword, name, declare, iterable, body, ):
+        self.keyword = keyword
+        self.name = name
+        self.declare = declare
+        self.iterable = iterable
+        self.body = body
+
+    def accept(self, visitor):
+        return visitor.visit_forof_stmt(self)
+
 class Function(Stmt):
-    def __init__(self, name, params, body, ):
+    def __init__(self, name, params, body, is_generator, ):
         self.name = name
         self.params = params
         self.body = body
+        self.is_generator = is_generator
 
     def accept(self, visitor):
         return visitor.visit_function_stmt(self)
@@ -73,6 +138,17 @@ class If(Stmt):
     def accept(self, visitor):
         return visitor.visit_if_stmt(self)
 
+class Import(Stmt):
+    def __init__(self, keyword, names, aliases, namespace, path, ):
+        self.keyword = keyword
+        self.names = names
+        self.aliases = aliases
+        self.namespace = namespace
+        self.path = path
+
+    def accept(self, visitor):
+        return visitor.visit_import_stmt(self)
+
 class Print(Stmt):
     def __init__(self, expression, ):
         self.expression = expression
@@ -81,9 +157,10 @@ class Print(Stmt):
         return visitor.visit_print_stmt(self)
 
 class Return(Stmt):
-    def __init__(self, keyword, value, ):
+    def __init__(self, keyword, value, tail_call, ):
         self.keyword = keyword
         self.value = value
+        self.tail_call = tail_call
 
     def accept(self, visitor):
         return visitor.visit_return_stmt(self)
@@ -97,10 +174,20 @@ class Var(Stmt):
         return visitor.visit_var_stmt(self)
 
 class While(Stmt):
-    def __init__(self, condition, body, ):
+    def __init__(self, keyword, condition, body, increment, ):
+        self.keyword = keyword
         self.condition = condition
         self.body = body
+        self.increment = increment
 
     def accept(self, visitor):
         return visitor.visit_while_stmt(self)
 
+class Yield(Stmt):
+    def __init__(self, keyword, value, ):
+        self.keyword = keyword
+        self.value = value
+
+    def accept(self, visitor):
+        return visitor.visit_yield_stmt(self)
+
@@ -6,6 +6,8 @@ class TokenType(Enum):
     RIGHT_PAREN = auto()
     LEFT_BRACE = auto()
     RIGHT_BRACE = auto()
+    LEFT_BRACKET = auto()
+    RIGHT_BRACKET = auto()
     COMMA = auto()
     DOT = auto()
     MINUS = auto()
@@ -16,6 +18,13 @@ class TokenType(Enum):
     MODULO = auto()
 
     # One or two character tokens.
+    MINUS_EQUAL = auto()
+    MINUS_MINUS = auto()
+    PLUS_EQUAL = auto()
+    PLUS_PLUS = auto()
+    SLASH_EQUAL = auto()
+    STAR_EQUAL = auto()
+    MODULO_EQUAL = auto()
     BANG = auto()
     BANG_EQUAL = auto()
     EQUAL = auto()
@@ -32,13 +41,17 @@ class TokenType(Enum):
 
     # Keywords.
     AND = auto()
+    BREAK = auto()
     CLASS = auto()
+    CONTINUE = auto()
     NEW = auto()
     ELSE = auto()
+    EXPORT = auto()
     FALSE = auto()
     FUNCTION = auto()
     FOR = auto()
     IF = auto()
+    IMPORT = auto()
     NULL = auto()
     OR = auto()
     PRINT = auto()
@@ -48,18 +61,23 @@ class TokenType(Enum):
     TRUE = auto()
     VAR = auto()
     WHILE = auto()
+    YIELD = auto()
     EXTENDS = auto()
 
     EOF = auto()
 
 KEYWORDS = {
+    "break": TokenType.BREAK,
     "class": TokenType.CLASS,
+    "continue": TokenType.CONTINUE,
     "else": TokenType.ELSE,
+    "export": TokenType.EXPORT,
     "extends": TokenType.EXTENDS,
     "false": TokenType.FALSE,
     "for": TokenType.FOR,
     "function": TokenType.FUNCTION,
     "if": TokenType.IF,
+    "import": TokenType.IMPORT,
     "new": TokenType.NEW,
     "null": TokenType.NULL,
     "print": TokenType.PRINT,
@@ -69,6 +87,7 @@ KEYWORDS = {
     "true": TokenType.TRUE,
     "var": TokenType.VAR,
     "while": TokenType.WHILE,
+    "yield": TokenType.YIELD,
 }
 
 class Token():
@@ -0,0 +1,379 @@
+import operator
+from enum import Enum, auto
+from typing import Any, Dict, List, Optional
+import Expr
+import Stmt
+import JSNumber
+from Token import Token, TokenType
+from Resolver import declared_names
+
+
+class ValueType(Enum):
+    NUMBER = auto()
+    STRING = auto()
+    BOOLEAN = auto()
+
+
+# The type of a local that has not been given any value yet while the types
+# are being solved. A type of None means the value is not known.
+UNASSIGNED = "unassigned"
+
+# Operations that run without checking their operands once both are proven numbers.
+NUMBER_OPERATIONS = {
+    TokenType.PLUS: JSNumber.add,
+    TokenType.MINUS: JSNumber.subtract,
+    TokenType.STAR: JSNumber.multiply,
+    TokenType.SLASH: JSNumber.divide,
+    TokenType.MODULO: JSNumber.modulo,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.EQUAL_EQUAL: operator.eq,
+    TokenType.BANG_EQUAL: operator.ne,
+}
+
+# These operators raise unless both operands are numbers, so they always produce a number.
+ARITHMETIC = (TokenType.MINUS, TokenType.STAR, TokenType.SLASH, TokenType.MODULO)
+COMPARISONS = (TokenType.LESS, TokenType.LESS_EQUAL, TokenType.GREATER, TokenType.GREATER_EQUAL,
+               TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL)
+
+
+def join(left: Any, right: Any) -> Any:
+    if left is UNASSIGNED:
+        return right
+    if right is UNASSIGNED:
+        return left
+    return left if left is right else None
+
+
+def binary_type(operator: TokenType, left: Any, right: Any) -> Any:
+    if operator in ARITHMETIC:
+        return ValueType.NUMBER
+    if operator in COMPARISONS:
+        return ValueType.BOOLEAN
+    if left is UNASSIGNED or right is UNASSIGNED:
+        return UNASSIGNED
+    if operator == TokenType.PLUS and left is right and left in (ValueType.NUMBER, ValueType.STRING):
+        return left
+    return None
+
+
+class Local:
+    """A local variable and every value assigned to it. A source of None is a value of unknown type."""
+
+    def __init__(self):
+        self.sources: List[Optional[Expr.Expr]] = []
+        self.type: Any = UNASSIGNED
+
+
+class TypeReport:
+    """How much of a script type inference managed to type."""
+
+    def __init__(self, locals: int, typed_locals: int, expressions: int, typed_expressions: int, operations: int,
+                 unchecked_operations: int):
+        self.locals = locals
+        self.typed_locals = typed_locals
+        self.expressions = expressions
+        self.typed_expressions = typed_expressions
+        self.operations = operations
+        self.unchecked_operations = unchecked_operations
+
+    def __str__(self):
+        return (f"{self.typed_locals}/{self.locals} locals, {self.typed_expressions}/{self.expressions} expressions "
+                f"typed, {self.unchecked_operations}/{self.operations} operations unchecked")
+
+
+class TypeInference(Stmt.Visitor, Expr.Visitor):
+    """Proves which locals and expressions of a resolved script are definitely numbers, strings or booleans.
+
+    The analysis is flow-insensitive: a local has a type when every value
+    assigned to it anywhere in the script, closures included, has that type.
+    Globals are never typed because the host and other scripts can change them,
+    and neither are the top-level declarations of a module, which are hoisted
+    and can be read before they are assigned. Binary and compound assignment
+    nodes whose operands are both proven numbers get the number operation as
+    their `operation`, which the interpreter calls without checking operands.
+    """
+
+    def __init__(self, locals: Dict[Expr.Expr, int]):
+        self.locals = locals
+        self.scopes: List[Dict[str, Local]] = []
+        self.module_scope: Optional[Dict[str, Local]] = None
+        self.variables: List[Local] = []
+        # The local read or written by each Variable, Assign and CompoundAssign node.
+        self.bindings: Dict[Expr.Expr, Local] = {}
+        self.expressions: List[Expr.Expr] = []
+        self.operations: List[Expr.Expr] = []
+
+    def infer(self, statements: List[Stmt.Stmt], module: bool = False) -> TypeReport:
+        if module:
+            self.begin_scope()
+            self.module_scope = self.scopes[-1]
+            for statement in statements:
+                for name in declared_names(statement):
+                    self.declare(name).sources.append(None)
+        self.visit_all(statements)
+        self.solve()
+        return self.annotate()
+
+    def solve(self) -> None:
+        # Types only move from UNASSIGNED to a type to None, so this stops.
+        changed = True
+        while changed:
+            changed = False
+            for local in self.variables:
+                new = local.type
+                for source in local.sources:
+                    new = join(new, self.source_type(source))
+                    if new is None:
+                        break
+                if new is not local.type:
+                    local.type = new
+                    changed = True
+
+    def annotate(self) -> TypeReport:
+        unchecked = 0
+        for expr in self.operations:
+            if isinstance(expr, Expr.Binary):
+                left = self.type_of(expr.left)
+                right = self.type_of(expr.right)
+            else:
+                local = self.bindings.get(expr)
+                left = local.type if local is not None else None
+                right = self.type_of(expr.value)
+            expr.operation = None
+            if left is ValueType.NUMBER and right is ValueType.NUMBER:
+                expr.operation = NUMBER_OPERATIONS.get(expr.operator.type)
+                if expr.operation is not None:
+                    unchecked += 1
+        typed_locals = sum(1 for local in self.variables if isinstance(local.type, ValueType))
+        typed_expressions = sum(1 for expr in self.expressions if isinstance(self.type_of(expr), ValueType))
+        return TypeReport(len(self.variables), typed_locals, len(self.expressions), typed_expressions,
+                          len(self.operations), unchecked)
+
+    def source_type(self, source: Optional[Expr.Expr]) -> Any:
+        if source is None:
+            return None
+        if isinstance(source, Expr.CompoundAssign):
+            return self.stored_type(source)
+        return self.type_of(source)
+
+    def stored_type(self, expr: Expr.CompoundAssign) -> Any:
+        local = self.bindings.get(expr)
+        return binary_type(expr.operator.type, local.type if local is not None else None, self.type_of(expr.value))
+
+    def type_of(self, expr: Expr.Expr) -> Any:
+        if isinstance(expr, Expr.Literal):
+            value = expr.value
+            if JSNumber.is_number(value):
+                return ValueType.NUMBER
+            if type(value) is str:
+                return ValueType.STRING
+            if type(value) is bool:
+                return ValueType.BOOLEAN
+            return None
+        if isinstance(expr, Expr.Variable):
+            local = self.bindings.get(expr)
+            return local.type if local is not None else None
+        if isinstance(expr, Expr.Binary):
+            return binary_type(expr.operator.type, self.type_of(expr.left), self.type_of(expr.right))
+        if isinstance(expr, Expr.CompoundAssign):
+            if expr.postfix:
+                local = self.bindings.get(expr)
+                return local.type if local is not None else None
+            return self.stored_type(expr)
+        if isinstance(expr, (Expr.Grouping, Expr.Cached)):
+            return self.type_of(expr.expression)
+        if isinstance(expr, Expr.Assign):
+            return self.type_of(expr.value)
+        if isinstance(expr, Expr.Unary):
+            if expr.operator.type == TokenType.MINUS:
+                return ValueType.NUMBER
+            return ValueType.BOOLEAN
+        if isinstance(expr, Expr.Logical):
+            return join(self.type_of(expr.left), self.type_of(expr.right))
+        return None
+
+    def begin_scope(self) -> None:
+        self.scopes.append({})
+
+    def end_scope(self) -> None:
+        self.scopes.pop()
+
+    def declare(self, name: Token) -> Local:
+        local = Local()
+        if not self.scopes:
+            # A global, which is never typed and so needs no bookkeeping.
+            return local
+        scope = self.scopes[-1]
+        if scope is self.module_scope and name.lexeme in scope:
+            return scope[name.lexeme]
+        scope[name.lexeme] = local
+        self.variables.append(local)
+        return local
+
+    def bind(self, expr: Any, name: Token) -> Optional[Local]:
+        if expr not in self.locals:
+            return None
+        for scope in reversed(self.scopes):
+            if name.lexeme in scope:
+                local = scope[name.lexeme]
+                self.bindings[expr] = local
+                return local
+        return None
+
+    def visit_all(self, statements: List[Stmt.Stmt]) -> None:
+        for statement in statements:
+            statement.accept(self)
+
+    def visit(self, expr: Optional[Expr.Expr]) -> None:
+        if expr is not None:
+            self.expressions.append(expr)
+            expr.accept(self)
+
+    def visit_function(self, function: Stmt.Function) -> None:
+        self.begin_scope()
+        for param in function.params:
+            self.declare(param).sources.append(None)
+        self.visit_all(function.body)
+        self.end_scope()
+
+    def visit_block_stmt(self, stmt: Stmt.Block):
+        self.begin_scope()
+        self.visit_all(stmt.statements)
+        self.end_scope()
+
+    def visit_cachescope_stmt(self, stmt: Stmt.CacheScope):
+        self.visit_all(stmt.body)
+
+    def visit_class_stmt(self, stmt: Stmt.Class):
+        self.declare(stmt.name).sources.append(None)
+        self.visit(stmt.superclass)
+        for method in stmt.methods:
+            self.visit_function(method)
+
+    def visit_export_stmt(self, stmt: Stmt.Export):
+        if stmt.declaration is not None:
+            stmt.declaration.accept(self)
+
+    def visit_expression_stmt(self, stmt: Stmt.Expression):
+        self.visit(stmt.expression)
+
+    def visit_forof_stmt(self, stmt: Stmt.ForOf):
+        self.visit(stmt.iterable)
+        if stmt.declare:
+            self.begin_scope()
+            self.declare(stmt.name).sources.append(None)
+        else:
+            local = self.bind(stmt, stmt.name)
+            if local is not None:
+                local.sources.append(None)
+        stmt.body.accept(self)
+        if stmt.declare:
+            self.end_scope()
+
+    def visit_function_stmt(self, stmt: Stmt.Function):
+        self.declare(stmt.name).sources.append(None)
+        self.visit_function(stmt)
+
+    def visit_if_stmt(self, stmt: Stmt.If):
+        self.visit(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_import_stmt(self, stmt: Stmt.Import):
+        names = [stmt.namespace] if stmt.namespace is not None else stmt.aliases
+        for name in names:
+            self.declare(name).sources.append(None)
+
+    def visit_print_stmt(self, stmt: Stmt.Print):
+        self.visit(stmt.expression)
+
+    def visit_return_stmt(self, stmt: Stmt.Return):
+        self.visit(stmt.value)
+
+    def visit_var_stmt(self, stmt: Stmt.Var):
+        self.visit(stmt.initializer)
+        self.declare(stmt.name).sources.append(stmt.initializer)
+
+    def visit_while_stmt(self, stmt: Stmt.While):
+        self.visit(stmt.condition)
+        stmt.body.accept(self)
+        self.visit(stmt.increment)
+
+    def visit_yield_stmt(self, stmt: Stmt.Yield):
+        self.visit(stmt.value)
+
+    def visit_array_expr(self, expr: Expr.Array):
+        for element in expr.elements:
+            self.visit(element)
+
+    def visit_assign_expr(self, expr: Expr.Assign):
+        self.visit(expr.value)
+        local = self.bind(expr, expr.name)
+        if local is not None:
+            local.sources.append(expr.value)
+
+    def visit_cached_expr(self, expr: Expr.Cached):
+        self.visit(expr.expression)
+
+    def visit_call_expr(self, expr: Expr.Call):
+        self.visit(expr.callee)
+        for argument in expr.arguments:
+            self.visit(argument)
+
+    def visit_inlined_expr(self, expr: Expr.Inlined):
+        # The body is a copy of the function's, which is analysed where it is declared.
+        self.visit_call_expr(expr.call)
+
+    def visit_compoundassign_expr(self, expr: Expr.CompoundAssign):
+        self.visit(expr.value)
+        local = self.bind(expr, expr.name)
+        if local is not None:
+            local.sources.append(expr)
+        self.operations.append(expr)
+
+    def visit_compoundset_expr(self, expr: Expr.CompoundSet):
+        self.visit(expr.object)
+        self.visit(expr.value)
+
+    def visit_compoundsetindex_expr(self, expr: Expr.CompoundSetIndex):
+        self.visit(expr.object)
+        self.visit(expr.index)
+        self.visit(expr.value)
+
+    def visit_get_expr(self, expr: Expr.Get):
+        self.visit(expr.object)
+
+    def visit_binary_expr(self, expr: Expr.Binary):
+        self.visit(expr.left)
+        self.visit(expr.right)
+        self.operations.append(expr)
+
+    def visit_grouping_expr(self, expr: Expr.Grouping):
+        self.visit(expr.expression)
+
+    def visit_index_expr(self, expr: Expr.Index):
+        self.visit(expr.object)
+        self.visit(expr.index)
+
+    def visit_logical_expr(self, expr: Expr.Logical):
+        self.visit(expr.left)
+        self.visit(expr.right)
+
+    def visit_set_expr(self, expr: Expr.Set):
+        self.visit(expr.object)
+        self.visit(expr.value)
+
+    def visit_setindex_expr(self, expr: Expr.SetIndex):
+        self.visit(expr.object)
+        self.visit(expr.index)
+        self.visit(expr.value)
+
+    def visit_unary_expr(self, expr: Expr.Unary):
+        self.visit(expr.right)
+
+    def visit_variable_expr(self, expr: Expr.Variable):
+        self.bind(expr, expr.name)
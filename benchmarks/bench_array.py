@@ -0,0 +1,68 @@
+"""Compares element-wise loops over native arrays with the linked-instance workaround.
+
+Usage: python benchmarks/bench_array.py [size]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from JSArray import JSArray
+from Output import CapturedOutput
+
+LINKED_BUILD = """
+class Node { constructor(value, next) { this.value = value; this.next = next; } }
+var head = null;
+for (var i = 0; i < n; i = i + 1) { head = new Node(i, head); }
+"""
+LINKED_SCAN = """
+var total = 0;
+var node = head;
+while (node != null) { total = total + node.value; node = node.next; }
+print total;
+"""
+
+ARRAY_BUILD = """
+var items = [];
+for (var i = 0; i < n; i = i + 1) { items.push(i); }
+"""
+ARRAY_SCAN = """
+var total = 0;
+var length = items.length;
+for (var i = 0; i < length; i = i + 1) { total = total + items[i]; }
+print total;
+"""
+MIXED_BUILD = ARRAY_BUILD.replace("var items = [];", 'var items = ["mixed"]; items.pop();')
+
+
+def timed(engine, build, scan, size):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("n", size)
+    start = time.perf_counter()
+    context.run(build)
+    built = time.perf_counter()
+    context.run(scan)
+    return built - start, time.perf_counter() - built, output.getvalue().strip()
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    engine = Engine()
+    cases = (("linked instances", LINKED_BUILD, LINKED_SCAN),
+             ("packed array", ARRAY_BUILD, ARRAY_SCAN),
+             ("generic array", MIXED_BUILD, ARRAY_SCAN))
+    for name, build, scan in cases:
+        build_time, scan_time, result = timed(engine, build, scan, size)
+        print(f"{name:17s} build {build_time:.3f}s, scan {scan_time:.3f}s (total {result})")
+
+    packed = JSArray([float(i) for i in range(int(size))])
+    generic = JSArray([float(i) for i in range(int(size))] + [None])
+    print(f"storage: packed {sys.getsizeof(packed.elements)} bytes, "
+          f"generic {sys.getsizeof(generic.elements) + 24 * int(size)} bytes")
+
+
+if __name__ == "__main__":
+    main()
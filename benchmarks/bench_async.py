@@ -0,0 +1,50 @@
+"""Measures the overhead of Context.run_async compared with the synchronous path.
+
+Usage: python benchmarks/bench_async.py [iterations]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+
+SOURCE = """
+function add(a, b) { return a + b; }
+var total = 0;
+for (var i = 0; i < n; i = i + 1) {
+    total = add(total, i);
+}
+"""
+
+
+REPEAT = 5
+
+
+def best_of(engine, iterations, run):
+    best = float("inf")
+    for _ in range(REPEAT):
+        context = engine.create_context()
+        context.define("n", iterations)
+        start = time.perf_counter()
+        run(context)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    iterations = float(sys.argv[1]) if len(sys.argv) > 1 else 20000.0
+    engine = Engine()
+
+    sync = best_of(engine, iterations, lambda context: context.run(SOURCE))
+    print(f"sync:                     {sync:.3f}s")
+
+    for pause_every in (100, 1000, 10000):
+        elapsed = best_of(engine, iterations, lambda context: asyncio.run(context.run_async(SOURCE, pause_every)))
+        print(f"async, pause every {pause_every:5d}: {elapsed:.3f}s ({(elapsed / sync - 1) * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compares leaving a loop with `break` against checking a flag variable in its condition.
+
+Usage: python benchmarks/bench_break.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+FLAG = """
+var total = 0;
+for (var round = 0; round < 10; round = round + 1) {
+    var done = false;
+    for (var i = 0; !done && i < n; i = i + 1) {
+        if (i == n - 1) { done = true; } else { total = total + 1; }
+    }
+}
+print total;
+"""
+
+BREAK = """
+var total = 0;
+for (var round = 0; round < 10; round = round + 1) {
+    for (var i = 0; i < n; i = i + 1) {
+        if (i == n - 1) { break; }
+        total = total + 1;
+    }
+}
+print total;
+"""
+
+
+def timed(engine, source, iterations):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("n", iterations)
+    start = time.perf_counter()
+    context.run(source)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    engine = Engine()
+    for name, source in (("flag variable", FLAG), ("break", BREAK)):
+        elapsed, result = timed(engine, source, iterations)
+        print(f"{name:13s} {elapsed:.3f}s (total {result})")
+
+
+if __name__ == "__main__":
+    main()
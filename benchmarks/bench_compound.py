@@ -0,0 +1,47 @@
+"""Compares counters written as `x = x + 1` with the same counters written as `x += 1` and `x++`.
+
+Usage: python benchmarks/bench_compound.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+PLAIN = """
+class Counter { constructor() { this.count = 0; } }
+var counter = new Counter();
+for (var i = 0; i < n; i = i + 1) { counter.count = counter.count + 1; }
+print counter.count;
+"""
+
+COMPOUND = """
+class Counter { constructor() { this.count = 0; } }
+var counter = new Counter();
+for (var i = 0; i < n; i++) { counter.count += 1; }
+print counter.count;
+"""
+
+
+def timed(engine, source, iterations):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("n", iterations)
+    start = time.perf_counter()
+    context.run(source)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    engine = Engine()
+    for name, source in (("x = x + 1", PLAIN), ("x += 1", COMPOUND)):
+        best = min(timed(engine, source, iterations)[0] for _ in range(5))
+        print(f"{name:9s} {best:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Measures how many isolated contexts can be created and used per second.
+
+Usage: python benchmarks/bench_contexts.py [count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Interpreter import Interpreter
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    start = time.perf_counter()
+    for _ in range(count):
+        Interpreter()
+    fresh = time.perf_counter() - start
+
+    engine = Engine()
+    start = time.perf_counter()
+    for _ in range(count):
+        engine.create_context()
+    snapshot = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(count):
+        engine.create_context().run("var x = 1;")
+    with_run = time.perf_counter() - start
+
+    print(f"fresh interpreter:      {count / fresh:10.0f} contexts/s")
+    print(f"from builtins snapshot: {count / snapshot:10.0f} contexts/s")
+    print(f"snapshot + tiny script: {count / with_run:10.0f} contexts/s")
+
+
+if __name__ == "__main__":
+    main()
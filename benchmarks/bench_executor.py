@@ -0,0 +1,49 @@
+"""Compares running many small scripts serially against the process-pool executor.
+
+Usage: python benchmarks/bench_executor.py [jobs] [workers]
+"""
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Executor import ScriptExecutor
+
+SOURCE = """
+var total = 0;
+for (var i = 0; i < n; i = i + 1) {
+    total = total + i;
+}
+console.log(total);
+"""
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    jobs = [(SOURCE, {"n": float(i % 200)}) for i in range(count)]
+
+    engine = Engine()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for source, globals in jobs:
+            context = engine.create_context()
+            for name, value in globals.items():
+                context.define(name, value)
+            context.run(source)
+    serial = time.perf_counter() - start
+    print(f"serial:   {count / serial:8.0f} jobs/s")
+
+    with ScriptExecutor(workers=workers) as executor:
+        for _ in executor.run(jobs):
+            pass
+    print(f"executor: {executor.metrics.throughput:8.0f} jobs/s with {executor.workers} workers")
+    print(executor.metrics)
+
+
+if __name__ == "__main__":
+    main()
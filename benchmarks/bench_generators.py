@@ -0,0 +1,51 @@
+"""Streams records from the host through a script generator and compares it with materializing them first.
+
+Usage: python benchmarks/bench_generators.py [records]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+from ResourceLimits import resident_memory
+
+STREAMED = """
+function* evens(source) { for (var record of source) { if (record % 2 == 0) yield record; } }
+var total = 0;
+for (var record of evens(records)) { total += record; }
+print total;
+"""
+
+MATERIALIZED = """
+var items = [];
+for (var record of records) { items.push(record); }
+var total = 0;
+for (var i = 0; i < items.length; i++) { if (items[i] % 2 == 0) total += items[i]; }
+print total;
+"""
+
+
+def timed(engine, source, records):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("records", (i for i in range(records)))
+    baseline = resident_memory()
+    start = time.perf_counter()
+    context.run(source)
+    elapsed = time.perf_counter() - start
+    return elapsed, (resident_memory() - baseline) / 1e6, output.getvalue().strip()
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    engine = Engine()
+    for name, source in (("streamed", STREAMED), ("materialized", MATERIALIZED)):
+        elapsed, grown, result = timed(engine, source, records)
+        print(f"{name:12s} {elapsed:.3f}s, RSS grew {grown:.1f} MB ({result})")
+
+
+if __name__ == "__main__":
+    main()
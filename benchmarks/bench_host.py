@@ -0,0 +1,49 @@
+"""Scans a large host buffer in place and compares it with copying the data into a script array.
+
+Usage: python benchmarks/bench_host.py [megabytes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from JSArray import JSArray
+from Output import CapturedOutput
+from ResourceLimits import resident_memory
+
+# Samples every 4096th byte, so the time measures access rather than the loop.
+SCAN = """
+var total = 0;
+for (var i = 0; i < data.length; i += 4096) { total += data[i]; }
+print total;
+"""
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    data = bytearray(os.urandom(1000)) * (megabytes * 1000)
+    engine = Engine()
+
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    baseline = resident_memory()
+    start = time.perf_counter()
+    context.bind("data", data, writable=False)
+    context.run(SCAN)
+    print(f"bound buffer  {time.perf_counter() - start:.3f}s, RSS grew {(resident_memory() - baseline) / 1e6:.1f} MB "
+          f"({output.getvalue().strip()})")
+
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    baseline = resident_memory()
+    start = time.perf_counter()
+    context.define("data", JSArray(list(data)))
+    context.run(SCAN)
+    print(f"copied array  {time.perf_counter() - start:.3f}s, RSS grew {(resident_memory() - baseline) / 1e6:.1f} MB "
+          f"({output.getvalue().strip()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measures the import cost of a `python JavaScript.py` run with `-X importtime`.
+
+Runs a script that does nothing in a fresh process a number of times and
+reports the median wall time, the median time spent importing modules and
+the modules whose imports, including their own dependencies, took longest.
+
+Usage: python benchmarks/bench_importtime.py [runs] [modules to list]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def import_times(stderr):
+    """Returns the cumulative import time in microseconds of every module, and of the top-level imports."""
+    modules = {}
+    top_level = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            top_level += int(cumulative)
+    return modules, top_level
+
+
+def timed(command, runs):
+    walls, totals, modules = [], [], {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        run_modules, total = import_times(result.stderr)
+        totals.append(total)
+        for name, cumulative in run_modules.items():
+            modules.setdefault(name, []).append(cumulative)
+    return statistics.median(walls), statistics.median(totals), modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    listed = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "empty.js")
+        with open(script, "w") as file:
+            file.write("print 1;\n")
+        command = [sys.executable, "-X", "importtime", os.path.join(ROOT, "JavaScript.py"), script]
+        wall, total, modules = timed(command, runs)
+
+    print(f"process {wall * 1000:.1f}ms, imports {total / 1000:.1f}ms (median of {runs} runs)")
+    medians = sorted(((statistics.median(times), name) for name, times in modules.items()), reverse=True)
+    for cumulative, name in medians[:listed]:
+        print(f"  {cumulative / 1000:6.2f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
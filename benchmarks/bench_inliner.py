@@ -0,0 +1,45 @@
+"""Times a loop that calls small helper functions, with and without the optimizer inlining them.
+
+Usage: python benchmarks/bench_inliner.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+HELPERS = """
+class Point {{ constructor(x, y) {{ this.x = x; this.y = y; }} }}
+function add(a, b) {{ return a + b; }}
+function square(x) {{ return x * x; }}
+function getX(p) {{ return p.x; }}
+{{
+    var p = new Point(2, 3);
+    var total = 0;
+    for (var i = 0; i < {iterations}; i++) {{ total = add(total, square(getX(p)) + i); }}
+    print total;
+}}
+"""
+
+
+def timed(source, optimize):
+    context = Engine(optimize=optimize).create_context(CapturedOutput())
+    script = context.compile(source)
+    start = time.perf_counter()
+    context.execute(script)
+    return time.perf_counter() - start, context.output.getvalue().strip()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = HELPERS.format(iterations=iterations)
+    for optimize in (False, True):
+        elapsed, result = timed(source, optimize)
+        print(f"helper calls, inlining {'on ' if optimize else 'off'} {elapsed:.3f}s ({result})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compares ingesting a payload with JSON.parse against generating JS source for it.
+
+Usage: python benchmarks/bench_json.py [megabytes]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+SUM = """
+var total = 0;
+for (var record of data) { total += record[0]; }
+print total;
+"""
+
+
+def payload(megabytes):
+    records = []
+    size = 0
+    while size < megabytes * 1000000:
+        record = [len(records), "record-" + str(len(records)), [1.5, 2.5, 3.5]]
+        records.append(record)
+        size += len(json.dumps(record)) + 1
+    return records
+
+
+def timed(engine, define, source):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    define(context)
+    start = time.perf_counter()
+    context.run(source)
+    loaded = time.perf_counter()
+    context.run(SUM)
+    return loaded - start, output.getvalue().strip()
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    engine = Engine()
+    records = payload(megabytes)
+    text = json.dumps(records)
+
+    elapsed, result = timed(engine, lambda context: context.define("text", text), "var data = JSON.parse(text);")
+    print(f"JSON.parse   {len(text) / 1e6:.1f} MB in {elapsed:.3f}s ({result})")
+
+    # The same data as a JS array literal, which goes through the scanner,
+    # the parser, the resolver and the interpreter.
+    elapsed, result = timed(engine, lambda context: None, "var data = " + text + ";")
+    print(f"JS source    {len(text) / 1e6:.1f} MB in {elapsed:.3f}s ({result})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compares keyed lookups in a native Map with the linked key/value instance workaround.
+
+Usage: python benchmarks/bench_map.py [entries]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+LINKED = """
+class Entry { constructor(key, value, next) { this.key = key; this.value = value; this.next = next; } }
+var head = null;
+for (var i = 0; i < n; i = i + 1) { head = new Entry(i, i * 2, head); }
+var total = 0;
+for (var i = 0; i < n; i = i + 1) {
+    var entry = head;
+    while (entry.key != i) { entry = entry.next; }
+    total = total + entry.value;
+}
+print total;
+"""
+
+MAP = """
+var map = new Map();
+for (var i = 0; i < n; i = i + 1) { map.set(i, i * 2); }
+var total = 0;
+for (var i = 0; i < n; i = i + 1) { total = total + map.get(i); }
+print total;
+"""
+
+
+def timed(engine, source, entries):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("n", entries)
+    start = time.perf_counter()
+    context.run(source)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    engine = Engine()
+    for name, source in (("linked instances", LINKED), ("native map", MAP)):
+        elapsed, result = timed(engine, source, entries)
+        print(f"{name:16s} {elapsed:.3f}s (total {result})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compares numeric helpers written in interpreted JS with the native Math builtins.
+
+Usage: python benchmarks/bench_math.py [size]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import JSMath
+from Engine import Engine
+from Output import CapturedOutput
+
+SETUP = """
+var items = [];
+for (var i = 0; i < n; i++) { items.push(i + 0.5); }
+"""
+
+INTERPRETED = """
+function sqrt(x) { var r = x; for (var k = 0; k < 20; k++) { r = (r + x / r) / 2; } return r; }
+function floor(x) { var r = 0; while (r + 1 <= x) { r++; } return r; }
+var total = 0;
+for (var i = 0; i < items.length; i++) { total += floor(sqrt(items[i])); }
+var roots = [];
+for (var i = 0; i < items.length; i++) { roots.push(sqrt(items[i])); }
+var sum = 0;
+for (var i = 0; i < roots.length; i++) { sum += roots[i]; }
+print total; print Math.floor(sum);
+"""
+
+NATIVE = """
+var total = 0;
+for (var i = 0; i < items.length; i++) { total += Math.floor(Math.sqrt(items[i])); }
+var sum = Math.sum(Math.map(items, Math.sqrt));
+print total; print Math.floor(sum);
+"""
+
+
+def timed(engine, source, size):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("n", size)
+    context.run(SETUP)
+    start = time.perf_counter()
+    context.run(source)
+    return time.perf_counter() - start, " ".join(output.getvalue().split())
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    engine = Engine()
+    print(f"numpy: {'available' if JSMath.numpy is not None else 'not installed'}")
+    for name, source in (("interpreted", INTERPRETED), ("native", NATIVE)):
+        elapsed, result = timed(engine, source, size)
+        print(f"{name:11s} {elapsed:.3f}s ({result})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Times a recursive function with repeated arguments, with and without "use memo".
+
+Usage: python benchmarks/bench_memoize.py [n]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+FIB = """
+function fib(n) {{ {directive}if (n < 2) return n; return fib(n - 1) + fib(n - 2); }}
+print fib({n});
+"""
+
+
+def timed(source):
+    context = Engine().create_context(CapturedOutput())
+    script = context.compile(source)
+    start = time.perf_counter()
+    context.execute(script)
+    return time.perf_counter() - start, context.output.getvalue().strip()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    for memo in (False, True):
+        source = FIB.format(n=n, directive='"use memo"; ' if memo else "")
+        elapsed, result = timed(source)
+        print(f"fib({n}) memo {'on ' if memo else 'off'} {elapsed:.3f}s ({result})")
+
+
+if __name__ == "__main__":
+    main()
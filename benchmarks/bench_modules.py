@@ -0,0 +1,59 @@
+"""Runs many small scripts that share a large library, imported as a module or pasted into each script.
+
+An imported module is compiled once per engine, so only the first script pays
+for scanning, parsing and resolving it.
+
+Usage: python benchmarks/bench_modules.py [scripts] [library functions]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+HELPER = """
+export function helper{index}(items) {{
+    var total = 0;
+    for (var i = 0; i < items.length; i++) {{
+        if (items[i] % 2 == 0) {{ total += items[i] * {index}; }} else {{ total -= 1; }}
+    }}
+    return total;
+}}
+"""
+
+SCRIPT = "print helper1([1, 2, 3]);\n"
+
+
+def timed(engine, scripts, source, path):
+    start = time.perf_counter()
+    for _ in range(scripts):
+        output = CapturedOutput()
+        engine.create_context(output).run(source, path)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+
+def main():
+    scripts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    functions = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    library = "".join(HELPER.format(index=index) for index in range(functions))
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "library.js"), "w") as file:
+            file.write(library)
+        main_path = os.path.join(directory, "main.js")
+
+        pasted = library.replace("export function", "function") + SCRIPT
+        elapsed, result = timed(Engine(), scripts, pasted, main_path)
+        print(f"pasted library    {elapsed:.3f}s for {scripts} scripts ({result})")
+
+        imported = 'import { helper1 } from "./library.js";\n' + SCRIPT
+        elapsed, result = timed(Engine(), scripts, imported, main_path)
+        print(f"imported module   {elapsed:.3f}s for {scripts} scripts ({result})")
+
+
+if __name__ == "__main__":
+    main()
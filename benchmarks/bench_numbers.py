@@ -0,0 +1,43 @@
+"""Compares loops counting with integer literals against the same loops written with floats.
+
+Usage: python benchmarks/bench_numbers.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+INTEGER_LOOP = """
+var items = [];
+for (var i = 0; i < n; i = i + 1) { items.push(i); }
+var total = 0;
+for (var i = 0; i < n; i = i + 1) { total = total + items[i] * 2; }
+print total;
+"""
+FLOAT_LOOP = INTEGER_LOOP.replace("= 0;", "= 0.0;").replace("+ 1)", "+ 1.0)").replace("* 2", "* 2.0")
+
+
+def timed(engine, source, iterations):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("n", iterations)
+    start = time.perf_counter()
+    context.run(source)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    engine = Engine()
+    for name, source in (("integer", INTEGER_LOOP), ("float", FLOAT_LOOP)):
+        best = min(timed(engine, source, iterations)[0] for _ in range(5))
+        result = timed(engine, source, iterations)[1]
+        print(f"{name:8s} {best:.3f}s (total {result})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Times loops with invariant property chains and repeated subexpressions, with and without the optimizer.
+
+Usage: python benchmarks/bench_optimizer.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+INVARIANT = """
+class Settings {{ constructor() {{ this.scale = 3; this.offset = 7; }} }}
+class Layout {{ constructor() {{ this.settings = new Settings(); }}
+  total(n) {{
+    var t = 0;
+    var i = 0;
+    while (i < n) {{ t = t + i * this.settings.scale + this.settings.offset; i = i + 1; }}
+    return t;
+  }}
+}}
+print new Layout().total({iterations});
+"""
+
+REPEATED = """
+class Point {{ constructor(x, y) {{ this.x = x; this.y = y; }} }}
+{{
+    var a = new Point(3, 4);
+    var b = new Point(0, 0);
+    var total = 0;
+    for (var i = 0; i < {iterations}; i++) {{
+        b.x = i;
+        total = total + (a.x - b.x) * (a.x - b.x) + (a.y - b.y) * (a.y - b.y);
+    }}
+    print total;
+}}
+"""
+
+
+def timed(source, optimize):
+    context = Engine(optimize=optimize).create_context(CapturedOutput())
+    script = context.compile(source)
+    start = time.perf_counter()
+    context.execute(script)
+    return time.perf_counter() - start, context.output.getvalue().strip()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, template in (("invariant", INVARIANT), ("repeated", REPEATED)):
+        source = template.format(iterations=iterations)
+        for optimize in (False, True):
+            elapsed, result = timed(source, optimize)
+            print(f"{name:<10} optimizer {'on ' if optimize else 'off'} {elapsed:.3f}s ({result})")
+
+
+if __name__ == "__main__":
+    main()
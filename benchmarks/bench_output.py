@@ -0,0 +1,43 @@
+"""Compares per-call writes with the buffered output sink on a log-heavy script.
+
+Usage: python benchmarks/bench_output.py [lines] > /dev/null
+Timings are reported on stderr.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import Output, BufferedOutput
+
+SOURCE = """
+for (var i = 0; i < n; i = i + 1) {
+    console.log(i);
+}
+"""
+
+
+def timed(engine, output, lines):
+    context = engine.create_context(output)
+    context.define("n", lines)
+    start = time.perf_counter()
+    context.run(SOURCE)
+    return time.perf_counter() - start
+
+
+def main():
+    lines = float(sys.argv[1]) if len(sys.argv) > 1 else 20000.0
+    engine = Engine()
+    # Write to the raw file descriptor wrapper with line buffering, as an
+    # interactive terminal would, so that each unbuffered write is a syscall.
+    stream = open(sys.stdout.fileno(), "w", buffering=1, closefd=False)
+    unbuffered = timed(engine, Output(stream), lines)
+    buffered = timed(engine, BufferedOutput(stream), lines)
+    print(f"per-call writes: {unbuffered:.3f}s", file=sys.stderr)
+    print(f"buffered sink:   {buffered:.3f}s ({unbuffered / buffered:.2f}x)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
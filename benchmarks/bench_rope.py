@@ -0,0 +1,52 @@
+"""Shows that building a string with `s = s + chunk` scales linearly with ropes.
+
+Usage: python benchmarks/bench_rope.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Rope
+from Engine import Engine
+from Output import CapturedOutput
+
+CHUNK = 1000
+
+SOURCE = """
+var s = "";
+for (var i = 0; i < n; i = i + 1) { s = s + chunk; }
+print s == s;
+"""
+
+
+def timed(engine, megabytes):
+    context = engine.create_context(CapturedOutput())
+    context.define("n", float(megabytes * 1000000 // CHUNK))
+    context.define("chunk", "x" * CHUNK)
+    start = time.perf_counter()
+    context.run(SOURCE)
+    return time.perf_counter() - start
+
+
+def main():
+    engine = Engine()
+    for megabytes in (1, 2, 5, 10):
+        elapsed = timed(engine, megabytes)
+        print(f"ropes, {megabytes:2d} MB: {elapsed:.3f}s ({elapsed / megabytes:.3f}s per MB)")
+
+    # Eager concatenation copies the whole string on every step and is
+    # quadratic, so it is only measured on smaller sizes.
+    saved = Rope.MIN_ROPE_LENGTH
+    Rope.MIN_ROPE_LENGTH = float("inf")
+    try:
+        for megabytes in (0.5, 1, 2):
+            elapsed = timed(engine, megabytes)
+            print(f"eager, {megabytes:3.1f} MB: {elapsed:.3f}s ({elapsed / megabytes:.3f}s per MB)")
+    finally:
+        Rope.MIN_ROPE_LENGTH = saved
+
+
+if __name__ == "__main__":
+    main()
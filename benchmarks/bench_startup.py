@@ -0,0 +1,76 @@
+"""Measures the startup of short-lived `python JavaScript.py` processes with and without a snapshot.
+
+Each run executes a one-line script on top of a prelude of helper functions.
+Without a snapshot the prelude is prepended to the script and every process
+builds the builtins and scans, parses, resolves and runs it. With a snapshot
+the process restores the globals from the file instead.
+
+Usage: python benchmarks/bench_startup.py [runs] [prelude functions]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Engine import Engine, Snapshot
+
+HELPER = """
+function helper{index}(items) {{
+    var total = 0;
+    for (var i = 0; i < items.length; i++) {{
+        if (items[i] % 2 == 0) {{ total += items[i] * {index}; }} else {{ total -= 1; }}
+    }}
+    return total;
+}}
+"""
+
+SCRIPT = "print helper1([1, 2, 3]);\n"
+
+
+def timed(command, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    functions = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    prelude = "".join(HELPER.format(index=index) for index in range(functions))
+    program = os.path.join(ROOT, "JavaScript.py")
+
+    with tempfile.TemporaryDirectory() as directory:
+        bare = os.path.join(directory, "bare.js")
+        with open(bare, "w") as file:
+            file.write(SCRIPT.replace("helper1([1, 2, 3])", "1"))
+        full = os.path.join(directory, "full.js")
+        with open(full, "w") as file:
+            file.write(prelude + SCRIPT)
+        script = os.path.join(directory, "script.js")
+        with open(script, "w") as file:
+            file.write(SCRIPT)
+        snapshot = os.path.join(directory, "prelude.snapshot")
+        Snapshot.create(prelude).save(snapshot)
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            Engine(snapshot=Snapshot.create(prelude))
+        print(f"in-process prelude run      {(time.perf_counter() - start) / runs * 1000:.1f}ms")
+        start = time.perf_counter()
+        for _ in range(runs):
+            Engine(snapshot=Snapshot.load(snapshot))
+        print(f"in-process snapshot loaded  {(time.perf_counter() - start) / runs * 1000:.1f}ms")
+
+        print(f"process without prelude     {timed([sys.executable, program, bare], runs) * 1000:.1f}ms")
+        print(f"process running prelude     {timed([sys.executable, program, full], runs) * 1000:.1f}ms")
+        print(f"process with snapshot       "
+              f"{timed([sys.executable, program, '--snapshot', snapshot, script], runs) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
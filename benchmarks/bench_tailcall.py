@@ -0,0 +1,49 @@
+"""Runs tail-recursive loops far deeper than the Python recursion limit allows for nested calls.
+
+Usage: python benchmarks/bench_tailcall.py [depth]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+
+TAIL = """
+function sum(n, total) { if (n == 0) { return total; } return sum(n - 1, total + n); }
+print sum(n, 0);
+"""
+
+NESTED = """
+function sum(n) { if (n == 0) { return 0; } return n + sum(n - 1); }
+print sum(n);
+"""
+
+LOOP = """
+var total = 0;
+for (var i = n; i > 0; i--) { total += i; }
+print total;
+"""
+
+
+def timed(engine, source, depth):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    context.define("n", depth)
+    start = time.perf_counter()
+    context.run(source)
+    return time.perf_counter() - start, output.getvalue().strip().replace("\n", " ")
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    engine = Engine()
+    for name, source in (("tail calls", TAIL), ("nested calls", NESTED), ("for loop", LOOP)):
+        elapsed, result = timed(engine, source, depth)
+        print(f"{name:12s} {elapsed:.3f}s ({result})")
+
+
+if __name__ == "__main__":
+    main()
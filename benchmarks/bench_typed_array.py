@@ -0,0 +1,70 @@
+"""Compares element access on typed arrays with plain script arrays, and scans an mmap'd file.
+
+Usage: python benchmarks/bench_typed_array.py [elements]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine import Engine
+from Output import CapturedOutput
+from ResourceLimits import resident_memory
+
+FILL = """
+{create}
+for (var i = 0; i < n; i += 1) {{ data[i] = i * 0.5; }}
+var total = 0;
+for (var i = 0; i < n; i += 1) {{ total += data[i]; }}
+print total;
+"""
+
+# Samples every 4096th element, so the time measures access rather than the loop.
+SCAN = """
+var total = 0;
+for (var i = 0; i < data.length; i += 4096) { total += data[i]; }
+print total;
+"""
+
+CONSTRUCTORS = {
+    "Float64Array": "var data = new Float64Array(n);",
+    "Array": "var data = []; for (var i = 0; i < n; i += 1) { data.push(0); }",
+}
+
+
+def timed(engine, source, **globals):
+    output = CapturedOutput()
+    context = engine.create_context(output)
+    for name, value in globals.items():
+        context.define(name, value)
+    start = time.perf_counter()
+    context.run(source)
+    return time.perf_counter() - start, output.getvalue().strip()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    engine = Engine()
+    for name, create in CONSTRUCTORS.items():
+        elapsed, result = timed(engine, FILL.format(create=create), n=n)
+        print(f"{name:<14} {elapsed:.3f}s ({result})")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "data.bin")
+        with open(path, "wb") as file:
+            file.write(os.urandom(100 * 1000 * 1000))
+        output = CapturedOutput()
+        context = engine.create_context(output)
+        baseline = resident_memory()
+        start = time.perf_counter()
+        context.map_file("data", path)
+        context.run(SCAN)
+        print(f"mmap'd file    {time.perf_counter() - start:.3f}s, file-backed RSS grew {(resident_memory() - baseline) / 1e6:.1f} MB "
+              f"({output.getvalue().strip()})")
+        del context
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Reports how much of each benchmark's scripts type inference proves, and times a numeric loop with and without it.
+
+Every module-level string in benchmarks/bench_*.py that compiles as a script
+is analysed. Strings that are templates filled in by their benchmark do not
+compile and are skipped.
+
+Usage: python benchmarks/bench_types.py [iterations]
+"""
+import glob
+import importlib
+import os
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+from Engine import Engine
+from Output import CapturedOutput
+
+LOOP = """
+{{
+    var total = 0;
+    var x = 0.5;
+    for (var i = 0; i < {iterations}; i++) {{ total += i * 2 - 1; x = x * 1.000001 + 0.25; }}
+    print total;
+}}
+"""
+
+
+def scripts(module):
+    for name, value in vars(module).items():
+        if name.isupper() and isinstance(value, str):
+            yield name, value
+
+
+def coverage():
+    engine = Engine()
+    for path in sorted(glob.glob(os.path.join(BENCHMARKS, "bench_*.py"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            module = importlib.import_module(name)
+        except ImportError as e:
+            print(f"{name:<22} skipped ({e})")
+            continue
+        for constant, source in scripts(module):
+            script = engine.create_context(CapturedOutput()).compile(source)
+            if script is not None:
+                print(f"{name:<22} {constant:<14} {script.types}")
+
+
+def timed(source, infer_types):
+    context = Engine().create_context(CapturedOutput())
+    context.infer_types = infer_types
+    script = context.compile(source)
+    start = time.perf_counter()
+    context.execute(script)
+    return time.perf_counter() - start, context.output.getvalue().strip()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    coverage()
+    source = LOOP.format(iterations=iterations)
+    for infer_types in (False, True):
+        elapsed, result = timed(source, infer_types)
+        print(f"numeric loop, inference {'on ' if infer_types else 'off'} {elapsed:.3f}s ({result})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import asyncio
+import io
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from Engine import Engine, Snapshot
+from JavaScript import JavaScript
+
+
+def run(context, source):
+    output = io.StringIO()
+    with redirect_stdout(output):
+        context.run(source)
+    return output.getvalue()
+
+
+class TestEngine(unittest.TestCase):
+
+    def test_contexts_do_not_share_globals(self):
+        engine = Engine()
+        first = engine.create_context()
+        second = engine.create_context()
+        run(first, "var x = 1;")
+        self.assertEqual(run(first, "print x;"), "1\n")
+        self.assertEqual(run(second, "print x;"), "Undefined variable 'x'.\n[line 1]\n")
+
+    def test_contexts_have_their_own_error_state(self):
+        engine = Engine()
+        first = engine.create_context()
+        second = engine.create_context()
+        run(first, "print y;")
+        run(second, "print 1;")
+        self.assertTrue(first.had_runtime_error)
+        self.assertFalse(second.had_runtime_error)
+        run(first, "var;")
+        self.assertTrue(first.had_error)
+        self.assertFalse(second.had_error)
+
+    def test_builtins_are_copied_per_context(self):
+        engine = Engine()
+        first = engine.create_context()
+        second = engine.create_context()
+        run(first, "console.extra = 1;")
+        self.assertEqual(run(first, "print console.extra;"), "1\n")
+        self.assertIn("Undefined property", run(second, "print console.extra;"))
+        self.assertEqual(run(second, "console.log(\"hi\");"), "hi\n")
+
+    def test_instances_do_not_share_fields(self):
+        context = Engine().create_context()
+        source = "class A {} var a = new A(); var b = new A(); a.x = 1; b.x = 2; print a.x;"
+        self.assertEqual(run(context, source), "1\n")
+
+    def test_host_defined_globals(self):
+        context = Engine().create_context()
+        context.define("n", 2.0)
+        run(context, "var m = n * 3;")
+        self.assertEqual(context.get("m"), 6.0)
+
+    def test_define_native(self):
+        context = Engine().create_context()
+        context.define_native("hypot", 2, lambda x, y: (x * x + y * y) ** 0.5, pure=True)
+        self.assertEqual(run(context, "print hypot(3, 4);"), "5\n")
+        self.assertEqual(run(context, "hypot(1);"), "Expected 2 arguments but got 1.\n[line 1]\n")
+
+
+class TestAsyncContext(unittest.TestCase):
+
+    def test_run_async_yields_to_event_loop(self):
+        context = Engine().create_context()
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            output = io.StringIO()
+            with redirect_stdout(output):
+                await context.run_async("var i = 0; while (i < 2000) { i = i + 1; } print i;", pause_every=100)
+            task.cancel()
+            return output.getvalue()
+
+        self.assertEqual(asyncio.run(main()), "2000\n")
+        self.assertGreaterEqual(len(ticks), 10)
+
+    def test_run_async_can_be_cancelled(self):
+        context = Engine().create_context()
+
+        async def main():
+            task = asyncio.create_task(context.run_async("while (true) {}", pause_every=100))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return task.cancelled()
+
+        self.assertTrue(asyncio.run(asyncio.wait_for(main(), 5)))
+        self.assertEqual(run(context, "print 1;"), "1\n")
+
+    def test_host_code_only_runs_while_script_is_parked(self):
+        context = Engine().create_context()
+        context.define("x", 0.0)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                context.define("x", 1.0)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            context.define("x", 0.0)
+            ticks.clear()
+            await context.run_async("var seen = 0; for (var i = 0; i < 3000; i = i + 1) { seen = seen + x; }", pause_every=10 ** 12)
+            task.cancel()
+
+        asyncio.run(main())
+        self.assertEqual(context.get("seen"), 0.0)
+        self.assertLessEqual(len(ticks), 1)
+
+
+class TestHostBinding(unittest.TestCase):
+
+    def test_dicts_and_lists_are_shared(self):
+        context = Engine().create_context()
+        config = {"name": "job", "limits": {"retries": 3}, "items": [1, 2, {"x": 5}]}
+        context.bind("config", config)
+        self.assertEqual(run(context, "print config.name; print config.items; print config.items[2].x;"),
+                         "job\n[1, 2, [object Object]]\n5\n")
+        run(context, "config.limits.retries += 1; config.items[0] = \"first\"; config.added = true;")
+        self.assertEqual(config, {"name": "job", "limits": {"retries": 4}, "items": ["first", 2, {"x": 5}],
+                                  "added": True})
+
+    def test_buffers_are_scanned_in_place(self):
+        context = Engine().create_context()
+        data = bytearray(b"\x01\x02\x03")
+        context.bind("data", data)
+        self.assertEqual(run(context, "var t = 0; for (var i = 0; i < data.length; i++) t += data[i]; print t;"), "6\n")
+        run(context, "data[1] = 200;")
+        self.assertEqual(data[1], 200)
+        self.assertIn("Cannot store", run(context, "data[0] = 300;"))
+
+    def test_read_only(self):
+        context = Engine().create_context()
+        context.bind("config", {"a": [1]}, writable=False)
+        context.bind("raw", b"abc")
+        self.assertEqual(run(context, "config.a[0] = 2;"), "Cannot assign to a read-only host value.\n[line 1]\n")
+        self.assertEqual(run(context, "raw[0] = 1;"), "Cannot assign to a read-only host value.\n[line 1]\n")
+        self.assertEqual(run(context, "print raw[0];"), "97\n")
+
+
+PRELUDE = """
+var greeting = "hello";
+var counter = new Map();
+var squares = new Float64Array([1, 4, 9]);
+class Point { constructor(x, y) { this.x = x; this.y = y; } sum() { return this.x + this.y; } }
+function square(n) { var result = n * n; return result; }
+function* count(n) { for (var i = 0; i < n; i++) yield i; }
+"""
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def restore(self, snapshot):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "globals.snapshot")
+            snapshot.save(path)
+            return Snapshot.load(path)
+
+    def test_prelude_survives_save_and_load(self):
+        engine = Engine(snapshot=self.restore(Snapshot.create(PRELUDE)))
+        context = engine.create_context()
+        self.assertEqual(run(context, """
+print greeting; print square(7); print new Point(1, 2).sum(); print squares;
+for (var i of count(2)) print i;
+console.log(Math.floor(2.5), JSON.stringify([1]));
+"""), "hello\n49\n3\n[1, 4, 9]\n0\n1\n2 [1]\n")
+
+    def test_contexts_do_not_share_prelude_globals(self):
+        engine = Engine(snapshot=self.restore(Snapshot.create(PRELUDE)))
+        first = engine.create_context()
+        second = engine.create_context()
+        run(first, "greeting = 1; function square(n) { return 0; }")
+        self.assertEqual(run(second, "print greeting; print square(3);"), "hello\n9\n")
+
+    def test_contexts_do_not_share_prelude_objects(self):
+        prelude = """
+var cache = new Map();
+var list = [1];
+class Box { constructor() { this.inner = [0]; } }
+var box = new Box();
+function remember(key) { cache.set(key, list.length); }
+"""
+        for snapshot in (Snapshot.create(prelude), self.restore(Snapshot.create(prelude))):
+            engine = Engine(snapshot=snapshot)
+            first = engine.create_context()
+            second = engine.create_context()
+            run(first, 'cache.set("k", 1); list.push(2); box.inner.push(5); remember("r");')
+            self.assertEqual(run(second, 'remember("s"); print cache.size; print list; print box.inner;'),
+                             "1\n[1]\n[0]\n")
+            self.assertEqual(run(first, "print cache.size; print list; print box.inner;"), "2\n[1, 2]\n[0, 5]\n")
+
+    def test_failing_prelude(self):
+        with self.assertRaises(ValueError):
+            Snapshot.create("print missing;")
+
+    def test_version_mismatch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "globals.snapshot")
+            with open(path, "wb") as file:
+                pickle.dump(0, file)
+            with self.assertRaises(ValueError):
+                Snapshot.load(path)
+
+
+class TestStartupImports(unittest.TestCase):
+
+    def test_cli_does_not_import_unused_modules(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        check = ("import sys, JavaScript; "
+                 "print(sorted(set(sys.modules) & {'AstPrinter', 'CooperativeRun', 'asyncio', 'json', 'pickle'}))")
+        result = subprocess.run([sys.executable, "-c", check], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout, "[]\n")
+
+    def test_lazy_modules_still_load(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            JavaScript.print_ast("1 + 2 * 3;")
+        self.assertEqual(output.getvalue(), "(+ 1 (* 2 3))\n")
+
+
+class TestModules(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.write("lib/math.js", """
+import { twice } from "./util.js";
+print "evaluating math";
+export function square(n) { return n * n; }
+export var answer = twice(21);
+var hidden = 1;
+function isEven(n) { if (n == 0) return true; return isOdd(n - 1); }
+function isOdd(n) { if (n == 0) return false; return isEven(n - 1); }
+export { isEven as even };
+""")
+        self.write("lib/util.js", "export function twice(n) { return n * 2; }")
+
+    def write(self, name, source):
+        path = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(source)
+        return path
+
+    def run_file(self, context, name, source):
+        path = self.write(name, source)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            context.run(source, path)
+        return output.getvalue()
+
+    def test_import_relative_to_file(self):
+        context = Engine().create_context()
+        self.assertEqual(self.run_file(context, "main.js", """
+import { square, answer as a, even } from "./lib/math.js";
+import * as math from "./lib/math.js";
+print square(5); print a; print even(7); print math.answer;
+"""), "evaluating math\n25\n42\nFalse\n42\n")
+        self.assertEqual(run(context, "print hidden;"), "Undefined variable 'hidden'.\n[line 1]\n")
+
+    def test_modules_are_compiled_once_per_engine_and_evaluated_per_context(self):
+        engine = Engine()
+        source = 'import { answer } from "./lib/math.js"; print answer;'
+        self.assertEqual(self.run_file(engine.create_context(), "main.js", source), "evaluating math\n42\n")
+        compiled = dict(engine.module_cache.modules)
+        self.assertEqual(len(compiled), 2)
+        self.assertEqual(self.run_file(engine.create_context(), "main.js", source), "evaluating math\n42\n")
+        self.assertEqual(engine.module_cache.modules, compiled)
+
+        path = self.write("lib/util.js", "export function twice(n) { return n * 3; }")
+        os.utime(path, ns=(0, 0))
+        self.assertEqual(self.run_file(engine.create_context(), "main.js", source), "evaluating math\n63\n")
+        self.assertIsNot(engine.module_cache.modules[os.path.realpath(path)], compiled[os.path.realpath(path)])
+
+    def test_module_errors(self):
+        context = Engine().create_context()
+        self.write("cycle.js", 'import { x } from "./main.js"; export var y = 1;')
+        self.write("broken.js", "export var;")
+        self.assertEqual(self.run_file(context, "main.js", 'import { x } from "./cycle.js";'),
+                         "Circular import of module './cycle.js'.\n[line 1]\n")
+        self.assertEqual(self.run_file(context, "main.js", 'import { nope } from "./lib/util.js";'),
+                         f"Module '{os.path.realpath(os.path.join(self.directory.name, 'lib/util.js'))}' "
+                         "has no export 'nope'.\n[line 1]\n")
+        self.assertEqual(self.run_file(context, "main.js", 'import { x } from "./missing.js";'),
+                         "Cannot find module './missing.js'.\n[line 1]\n")
+        self.assertEqual(self.run_file(context, "main.js", 'import { x } from "./broken.js";'),
+                         "Module './broken.js' has errors:\n[line 1] Error at ';': Expect variable name.\n[line 1]\n")
+        self.assertIn("Export declarations may only appear at the top level of a module.",
+                      self.run_file(context, "main.js", "export var x = 1;"))
+        self.assertIn("Import declarations may only appear at top level.",
+                      self.run_file(context, "main.js", 'function f() { import { x } from "./cycle.js"; }'))
@@ -0,0 +1,59 @@
+import os
+import threading
+import unittest
+from Executor import ScriptExecutor
+from ResourceLimits import ResourceLimits
+
+
+class KillWorker:
+    """Terminates the worker process when it is unpickled there."""
+
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+
+class TestScriptExecutor(unittest.TestCase):
+
+    def test_runs_jobs_and_captures_output(self):
+        jobs = [("print n * 2; console.log(\"done\");", {"n": float(i)}) for i in range(20)]
+        with ScriptExecutor(workers=2) as executor:
+            results = {result.job_id: result for result in executor.run(jobs)}
+        self.assertEqual(len(results), 20)
+        for i in range(20):
+            self.assertTrue(results[i].ok)
+            self.assertEqual(results[i].output, f"{i * 2}\ndone\n")
+        self.assertEqual(executor.metrics.completed, 20)
+        self.assertGreater(executor.metrics.throughput, 0)
+
+    def test_reports_script_errors(self):
+        jobs = [("print missing;", {}), ("print 1", {}), ("while (true) {}", {})]
+        with ScriptExecutor(workers=2, limits=ResourceLimits(max_steps=1000)) as executor:
+            results = {result.job_id: result for result in executor.run(jobs)}
+        self.assertEqual(results[0].error, "Runtime error.")
+        self.assertEqual(results[1].error, "Compile error.")
+        self.assertEqual(results[2].error, "Runtime error.")
+        self.assertIn("Step limit", results[2].output)
+        self.assertEqual(executor.metrics.failed, 3)
+
+    def test_dead_worker_does_not_fail_the_batch(self):
+        jobs = [("print 1;", {}) for _ in range(6)]
+        jobs.insert(3, ("print 2;", {"killer": KillWorker()}))
+        with ScriptExecutor(workers=2, max_attempts=2) as executor:
+            results = {result.job_id: result for result in executor.run(jobs)}
+        self.assertEqual(len(results), 7)
+        self.assertEqual(results[3].error, "Worker process died.")
+        for job_id, result in results.items():
+            if job_id != 3:
+                self.assertEqual(result.output, "1\n")
+        self.assertGreater(executor.metrics.worker_restarts, 0)
+
+    def test_job_exceptions_do_not_stop_the_batch(self):
+        deep = "print " + "(" * 5000 + "1" + ")" * 5000 + ";"
+        jobs = [("print 1;", {}), (deep, {}), ("print 3;", {"lock": threading.Lock()}), ("print 4;", {})]
+        with ScriptExecutor(workers=2) as executor:
+            results = {result.job_id: result for result in executor.run(jobs)}
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0].output, "1\n")
+        self.assertIn("Internal error", results[1].error)
+        self.assertIn("Internal error", results[2].error)
+        self.assertEqual(results[3].output, "4\n")
@@ -0,0 +1,160 @@
+import unittest
+import Expr
+import Stmt
+from Engine import Engine
+from Output import CapturedOutput
+from ResourceLimits import ResourceLimits
+
+# Each program is run with and without inlining and must print the same.
+CORPUS = {
+    "helpers": """
+function add(a, b) { return a + b; }
+function square(x) { return x * x; }
+var total = 0;
+for (var i = 0; i < 5; i++) { total = add(total, square(i)); }
+print total;
+""",
+    "getter": """
+class Point { constructor(x, y) { this.x = x; this.y = y; } }
+function getX(p) { return p.x; }
+print getX(new Point(3, 4)) + getX(new Point(5, 6));
+""",
+    "reassigned function": """
+function pick(a, b) { return a; }
+function other(a, b) { return b; }
+print pick(1, 2);
+pick = other;
+print pick(1, 2);
+""",
+    "reassigned to a non-function": """
+function pick(a, b) { return a; }
+pick = 3;
+print pick(1, 2);
+""",
+    "local function": """
+function outer(n) {
+  function twice(x) { return x * 2; }
+  var sum = 0;
+  for (var i = 0; i < n; i++) { sum = sum + twice(i); }
+  return sum;
+}
+print outer(5);
+""",
+    "closure over a local": """
+function make(k) {
+  function scaled(x) { return x * k; }
+  return scaled(2) + scaled(3);
+}
+print make(10);
+""",
+    "recursion": """
+function fib(n) { return n < 2 && n || fib(n - 1) + fib(n - 2); }
+print fib(10);
+""",
+    "wrong number of arguments": """
+function add(a, b) { return a + b; }
+print add(1);
+""",
+    "error inside the body": """
+function half(x) { return x / 2; }
+print half(4);
+print half("four");
+""",
+    "tail position": """
+function inc(x) { return x + 1; }
+function next(x) { return inc(x); }
+print next(41);
+""",
+    "function used as a value": """
+function add(a, b) { return a + b; }
+var f = add;
+print f(1, 2) + add(3, 4);
+""",
+    "arguments evaluated once and in order": """
+var log = [];
+function note(x) { log.push(x); return x; }
+function sub(a, b) { return a - b; }
+print sub(note(5), note(2));
+print log;
+""",
+    "unused parameter": """
+var calls = 0;
+function count() { calls = calls + 1; return calls; }
+function first(a, b) { return a; }
+print first(1, count());
+print calls;
+""",
+    "globals in the body": """
+var scale = 3;
+function scaled(x) { return x * scale; }
+print scaled(2);
+{ var scale = 100; print scaled(2); }
+scale = 4;
+print scaled(2);
+""",
+    "generator caller": """
+function double(x) { return x * 2; }
+function* doubles(n) { var i = 0; while (i < n) { yield double(i); i = i + 1; } }
+for (var x of doubles(3)) print x;
+""",
+}
+
+
+def run(source, optimize, limits=None):
+    context = Engine(limits, optimize=optimize).create_context(CapturedOutput())
+    context.run(source)
+    return context.output.getvalue()
+
+
+def count_inlined(node):
+    if isinstance(node, list):
+        return sum(count_inlined(element) for element in node)
+    if isinstance(node, Expr.Inlined):
+        return 1 + count_inlined(node.call)
+    if isinstance(node, (Expr.Expr, Stmt.Stmt)):
+        return sum(count_inlined(value) for value in vars(node).values())
+    return 0
+
+
+def inlined(source):
+    context = Engine(optimize=True).create_context(CapturedOutput())
+    return count_inlined(context.compile(source).statements)
+
+
+class TestInliner(unittest.TestCase):
+
+    def test_corpus_prints_the_same_with_and_without_inlining(self):
+        for name, source in CORPUS.items():
+            with self.subTest(name):
+                self.assertEqual(run(source, True), run(source, False))
+
+    def test_small_leaf_functions_are_inlined(self):
+        self.assertEqual(inlined(CORPUS["helpers"]), 2)
+        self.assertEqual(inlined(CORPUS["getter"]), 2)
+        self.assertEqual(inlined(CORPUS["local function"]), 1)
+        self.assertEqual(inlined(CORPUS["tail position"]), 1)
+
+    def test_functions_that_are_not_leaves_stay_out_of_line(self):
+        self.assertEqual(inlined(CORPUS["closure over a local"]), 0)
+        self.assertEqual(inlined(CORPUS["recursion"]), 0)
+        self.assertEqual(inlined(CORPUS["wrong number of arguments"]), 0)
+        self.assertEqual(inlined("function f(o) { o.x = 1; return o.x; } print f(1);"), 0)
+
+    def test_calls_through_other_names_are_not_inlined(self):
+        self.assertEqual(inlined(CORPUS["function used as a value"]), 1)
+
+    def test_host_replacing_an_inlined_global(self):
+        context = Engine(optimize=True).create_context(CapturedOutput())
+        script = context.compile("function greet(name) { return \"hi \" + name; } print greet(\"a\");")
+        context.execute(script)
+        context.define_native("greet", 1, lambda name: "bye " + name)
+        # Run only the print, so that the function statement does not declare greet again.
+        context.interpreter.interpret(script.statements[1:])
+        self.assertEqual(context.output.getvalue(), "hi a\nbye a\n")
+
+    def test_inlined_calls_count_towards_limits(self):
+        source = "function inc(x) { return x + 1; } var n = 0; while (true) { n = inc(n); }"
+        limits = ResourceLimits(max_steps=1000)
+        self.assertEqual(run(source, True, limits), run(source, False, limits))
+        limits = ResourceLimits(max_call_depth=0)
+        self.assertEqual(run(CORPUS["helpers"], True, limits), run(CORPUS["helpers"], False, limits))
@@ -0,0 +1,529 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from Scanner import Scanner
+from Parser import Parser
+from Resolver import Resolver
+from Interpreter import Interpreter
+from ResourceLimits import ResourceLimits
+from JSArray import JSArray
+from NativeFunction import NativeFunction, native
+import JSMath
+from JSMath import create_math
+from JSTypedArray import map_file
+from Reporter import Reporter
+from Engine import Engine
+from Output import CapturedOutput
+from RuntimeErrorException import RuntimeErrorException
+
+
+def run(source, limits=None):
+    interpreter = Interpreter(limits)
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    Resolver(interpreter).resolve(statements)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        interpreter.interpret(statements)
+    Reporter.had_runtime_error = False
+    return output.getvalue()
+
+
+class TestResourceLimits(unittest.TestCase):
+
+    def test_no_limits(self):
+        self.assertEqual(run("var i = 0; while (i < 100) { i = i + 1; } print i;"), "100\n")
+
+    def test_step_limit_stops_infinite_loop(self):
+        output = run("while (true) {}", ResourceLimits(max_steps=500))
+        self.assertEqual(output, "Step limit of 500 exceeded.\n[line 1]\n")
+
+    def test_step_limit_counts_calls(self):
+        source = "function f() { return 1; } for (var i = 0; i < 10; i = i + 1) { f(); } print \"done\";"
+        self.assertIn("Step limit", run(source, ResourceLimits(max_steps=15)))
+        self.assertEqual(run(source, ResourceLimits(max_steps=20)), "done\n")
+
+    def test_call_depth_limit(self):
+        source = "function f(n) { return f(n + 1) + 1; }\nf(0);"
+        output = run(source, ResourceLimits(max_call_depth=20))
+        self.assertEqual(output, "Maximum call stack size exceeded.\n[line 1]\n")
+
+    def test_python_recursion_error_is_reported(self):
+        output = run("function f(n) { return f(n + 1) + 1; }\nf(0);")
+        self.assertEqual(output, "Maximum call stack size exceeded.\n[line 1]\n")
+
+    def test_timeout(self):
+        output = run("while (true) {}", ResourceLimits(timeout=0.05, check_interval=100))
+        self.assertIn("Execution timed out", output)
+
+    def test_memory_limit(self):
+        output = run("var s = \"x\"; while (true) { s = s + s; }", ResourceLimits(max_memory=1000000, check_interval=1))
+        self.assertIn("Memory limit of 1000000 bytes exceeded.", output)
+
+    def test_limits_reset_between_runs(self):
+        interpreter = Interpreter(ResourceLimits(max_steps=50))
+        statements = Parser(Scanner("var i = 0; while (i < 40) { i = i + 1; }").scan_tokens()).parse()
+        Resolver(interpreter).resolve(statements)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            interpreter.interpret(statements)
+            interpreter.interpret(statements)
+        self.assertEqual(output.getvalue(), "")
+
+
+class TestArrays(unittest.TestCase):
+
+    def test_literal_index_and_length(self):
+        self.assertEqual(run("var a = [1, 2, 3]; a[0] = a[2]; print a; print a.length;"), "[3, 2, 3]\n3\n")
+
+    def test_push_and_pop(self):
+        self.assertEqual(run("var a = []; a.push(1); a.push(\"x\"); print a.pop(); print a; print a.pop(); print a.pop();"),
+                         "x\n[1]\n1\nnull\n")
+
+    def test_write_past_end_leaves_holes(self):
+        self.assertEqual(run("var a = [1]; a[3] = 4; print a; print a[7];"), "[1, null, null, 4]\nnull\n")
+
+    def test_invalid_index(self):
+        self.assertEqual(run("var a = [1];\nprint a[-1];"), "Array index must be a non-negative integer.\n[line 2]\n")
+        self.assertEqual(run("var a = 1;\nprint a[0];"), "Only arrays can be indexed.\n[line 2]\n")
+
+    def test_packed_representation(self):
+        array = JSArray([1.0, 2.0])
+        self.assertTrue(array.is_packed)
+        array.push(3.0)
+        self.assertTrue(array.is_packed)
+        array.push("x")
+        self.assertFalse(array.is_packed)
+        self.assertEqual(array.elements, [1.0, 2.0, 3.0, "x"])
+        self.assertFalse(JSArray([1.0, None]).is_packed)
+
+
+class TestNumbers(unittest.TestCase):
+
+    def test_integer_literals_stay_integers(self):
+        self.assertIs(Scanner("42").scan_tokens()[0].literal.__class__, int)
+        self.assertIs(Scanner("4.5").scan_tokens()[0].literal.__class__, float)
+
+    def test_arithmetic_output_is_unchanged(self):
+        self.assertEqual(run("print 1 + 2; print 7 / 2; print 6 / 3; print 1.5 * 2; print 0.1 + 0.2;"),
+                         "3\n3.5\n2\n3\n0.30000000000000004\n")
+
+    def test_double_semantics(self):
+        self.assertEqual(run("print 1 / 0; print -1 / 0; print 0 / 0; print -0; print 0 * -1; print 0 / -5;"),
+                         "Infinity\n-Infinity\nNaN\n-0\n-0\n-0\n")
+
+    def test_overflow_leaves_the_exact_range(self):
+        self.assertEqual(run("var x = 9007199254740992; print x + 1 == x;"), "True\n")
+
+    def test_integers_and_floats_compare_equal(self):
+        self.assertEqual(run("print 1 == 1.0; print 2 > 1.5; print true == 1;"), "True\nTrue\nFalse\n")
+
+    def test_integer_index(self):
+        self.assertEqual(run("var a = [10, 20]; var i = 1; print a[i]; print a[i - 1];"), "20\n10\n")
+
+    def test_grouping(self):
+        self.assertEqual(run("var x = 3; print (x + 1) / 2;"), "2\n")
+
+    def test_operand_error_is_reported(self):
+        self.assertEqual(run("print -\"x\";"), "Operand must be a number.\n[line 1]\n")
+
+
+class TestCollections(unittest.TestCase):
+
+    def test_map(self):
+        self.assertEqual(run("""
+var m = new Map();
+m.set("a", 1).set(2, "two");
+print m.get("a"); print m.get(2.0); print m.get("missing");
+print m.has("a"); print m.delete("a"); print m.delete("a"); print m.size;
+print m.keys(); print m.values();
+"""), "1\ntwo\nnull\nTrue\nTrue\nFalse\n1\n[2]\n[two]\n")
+
+    def test_key_equality_matches_is_equal(self):
+        self.assertEqual(run("""
+var m = new Map();
+m.set(1, "number"); m.set(true, "boolean"); m.set(null, "null");
+print m.get(1); print m.get(true); print m.get(null); print m.size;
+"""), "number\nboolean\nnull\n3\n")
+
+    def test_objects_are_keyed_by_identity(self):
+        self.assertEqual(run("""
+class Key {}
+var a = new Key(); var b = new Key();
+var m = new Map(); m.set(a, 1);
+print m.has(a); print m.has(b);
+"""), "True\nFalse\n")
+
+    def test_set(self):
+        self.assertEqual(run("""
+var s = new Set();
+s.add(1).add(1).add("x");
+print s.size; print s.has("x"); print s.values(); s.clear(); print s.size;
+"""), "2\nTrue\n[1, x]\n0\n")
+
+    def test_requires_new(self):
+        self.assertEqual(run("var m = Map();"),
+                         "Cannot call a class like a function. Use 'new' keyword to initialize new instance.\n[line 1]\n")
+
+
+class TestBreakContinue(unittest.TestCase):
+
+    def test_break_leaves_the_innermost_loop(self):
+        self.assertEqual(run("""
+for (var i = 0; i < 3; i = i + 1) {
+    var j = 0;
+    while (true) { if (j == 2) { break; } j = j + 1; }
+    print i * 10 + j;
+}
+"""), "2\n12\n22\n")
+
+    def test_continue_runs_the_for_increment(self):
+        self.assertEqual(run("""
+for (var i = 0; i < 5; i = i + 1) {
+    if (i == 1 || i == 3) continue;
+    print i;
+}
+"""), "0\n2\n4\n")
+
+    def test_continue_in_while(self):
+        self.assertEqual(run("""
+var i = 0;
+while (i < 4) { i = i + 1; if (i == 2) { continue; } print i; }
+"""), "1\n3\n4\n")
+
+    def test_break_inside_function_in_loop(self):
+        self.assertEqual(run("""
+function first(items) {
+    var found = null;
+    for (var i = 0; i < items.length; i = i + 1) { if (items[i] > 1) { found = items[i]; break; } }
+    return found;
+}
+print first([1, 5, 7]);
+"""), "5\n")
+
+    def test_outside_of_loop_is_an_error(self):
+        for source in ("break;", "while (true) { function f() { continue; } }"):
+            interpreter = Interpreter()
+            statements = Parser(Scanner(source).scan_tokens()).parse()
+            with self.assertRaises(RuntimeErrorException):
+                Resolver(interpreter).resolve(statements)
+
+
+class TestCompoundAssignment(unittest.TestCase):
+
+    def test_variables(self):
+        self.assertEqual(run("""
+var x = 10;
+x += 5; print x; x -= 3; print x; x *= 2; print x; x /= 4; print x; x %= 4; print x;
+var s = "a"; s += "b"; print s;
+"""), "15\n12\n24\n6\n2\nab\n")
+
+    def test_increment_and_decrement(self):
+        self.assertEqual(run("var i = 1; print i++; print i; print ++i; print i--; print --i;"),
+                         "1\n2\n3\n3\n1\n")
+
+    def test_locals_and_closures(self):
+        self.assertEqual(run("""
+function counter() { var count = 0; function next() { count += 1; return count; } return next; }
+var next = counter(); next(); print next();
+{ var i = 0; for (var j = 0; j < 3; j++) { i += j; } print i; }
+"""), "2\n3\n")
+
+    def test_object_is_evaluated_once(self):
+        self.assertEqual(run("""
+class Counter { constructor() { this.count = 0; } }
+var calls = 0;
+var counter = new Counter();
+function target() { calls++; return counter; }
+target().count += 2; target().count++;
+print counter.count; print calls;
+"""), "3\n2\n")
+
+    def test_array_elements(self):
+        self.assertEqual(run("""
+var a = [1, 2];
+var i = 0;
+function index() { i++; return 1; }
+a[index()] *= 10; print a[1]++; print a; print i;
+"""), "20\n[1, 21]\n1\n")
+
+    def test_modulo(self):
+        self.assertEqual(run("print 7 % 3; print -7 % 3; print 7.5 % 2; print 4 % 0; print -4 % 2;"),
+                         "1\n-1\n1.5\nNaN\n-0\n")
+
+    def test_invalid_target(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Parser(Scanner("1 += 2;").scan_tokens()).parse()
+        Reporter.had_error = False
+        self.assertEqual(output.getvalue(), "[line 1] Error at '+=': Invalid assignment target.\n")
+
+    def test_undefined_variable(self):
+        self.assertEqual(run("missing += 1;"), "Undefined variable 'missing'.\n[line 1]\n")
+
+
+class TestNativeFunctions(unittest.TestCase):
+
+    def run_with(self, source, *natives):
+        interpreter = Interpreter()
+        for native_function in natives:
+            interpreter.globals.define(native_function.name, native_function)
+        statements = Parser(Scanner(source).scan_tokens()).parse()
+        Resolver(interpreter).resolve(statements)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            interpreter.interpret(statements)
+        Reporter.had_runtime_error = False
+        return output.getvalue()
+
+    def test_ranged_and_variadic_arity(self):
+        clamp = NativeFunction("clamp", (1, 3), lambda value, low=0, high=10: max(low, min(high, value)))
+        count = native("count", (0, None))(lambda *values: len(values))
+        self.assertEqual(self.run_with("print clamp(42); print clamp(-5, 1); print count(); print count(1, 2, 3);",
+                                       clamp, count), "10\n1\n0\n3\n")
+        self.assertEqual(self.run_with("clamp();", clamp), "Expected 1 to 3 arguments but got 0.\n[line 1]\n")
+
+    def test_with_interpreter(self):
+        show = NativeFunction("show", 1, lambda interpreter, value: interpreter.stringify(value) + "!",
+                              with_interpreter=True)
+        self.assertEqual(self.run_with("print show(1.5);", show), "1.5!\n")
+
+    def test_console_log_is_variadic(self):
+        self.assertEqual(run("console.log(\"a\", 1, null); console.log();"), "a 1 null\n\n")
+        self.assertEqual(run("print console.log;"), "function log() { [native code] }\n")
+
+
+class TestMath(unittest.TestCase):
+
+    def test_functions(self):
+        self.assertEqual(run("""
+print Math.floor(2.7); print Math.floor(-2.5); print Math.ceil(2.1); print Math.round(2.5); print Math.round(-2.5);
+print Math.abs(-3); print Math.sqrt(16); print Math.sqrt(-1); print Math.pow(2, 10); print Math.pow(2, -1);
+print Math.min(3, 1, 2); print Math.max(); print Math.trunc(-4.7); print Math.cbrt(27); print Math.sign(-3);
+"""), "2\n-3\n3\n3\n-2\n3\n4\nNaN\n1024\n0.5\n1\n-Infinity\n-4\n3\n-1\n")
+
+    def test_constants(self):
+        self.assertEqual(run("print Math.PI; print Math.SQRT2;"), "3.141592653589793\n1.4142135623730951\n")
+
+    def test_sum_and_dot(self):
+        self.assertEqual(run("print Math.sum([1, 2, 3.5]); print Math.dot([1, 2, 3], [4, 5, 6]); print Math.sum([]);"),
+                         "6.5\n32\n0\n")
+
+    def test_map(self):
+        self.assertEqual(run("""
+print Math.map([1, 4, 9], Math.sqrt);
+function twice(x) { return x * 2; }
+print Math.map([1, "a"], Math.floor); print Math.map([1, 2], twice);
+"""), "[1, 2, 3]\n[1, NaN]\n[2, 4]\n")
+
+    def test_errors(self):
+        self.assertEqual(run("Math.dot([1], [1, 2]);"), "Math.dot expects arrays of the same length.\n[line 1]\n")
+        self.assertEqual(run("Math.sum(1);"), "Math.sum expects an array.\n[line 1]\n")
+
+    @unittest.skipIf(JSMath.numpy is None, "NumPy is not installed")
+    def test_map_with_numpy_matches_python(self):
+        values = JSArray([float(i) for i in range(100)])
+        sqrt = create_math().fields["sqrt"]
+        with_numpy = JSMath.js_map(None, values, sqrt)
+        saved = JSMath.numpy
+        JSMath.numpy = None
+        try:
+            without_numpy = JSMath.js_map(None, values, sqrt)
+        finally:
+            JSMath.numpy = saved
+        self.assertTrue(with_numpy.is_packed)
+        self.assertEqual(list(with_numpy.elements), list(without_numpy.elements))
+
+
+class TestTailCalls(unittest.TestCase):
+
+    def test_self_recursion_runs_in_constant_stack(self):
+        self.assertEqual(run("""
+function count(n, total) { if (n == 0) { return total; } return count(n - 1, total + 1); }
+print count(100000, 0);
+"""), "100000\n")
+
+    def test_mutual_recursion(self):
+        self.assertEqual(run("""
+function isEven(n) { if (n == 0) return true; return isOdd(n - 1); }
+function isOdd(n) { if (n == 0) return false; return isEven(n - 1); }
+print isEven(50001);
+"""), "False\n")
+
+    def test_methods_and_natives_in_tail_position(self):
+        self.assertEqual(run("""
+class Loop { run(n) { if (n == 0) { return Math.max(n, 7); } return this.run(n - 1); } }
+print new Loop().run(10000);
+"""), "7\n")
+
+    def test_non_tail_calls_still_nest(self):
+        self.assertEqual(run("""
+function depth(n) { if (n == 0) return 0; return depth(n - 1) + 1; }
+print depth(100000);
+"""), "Maximum call stack size exceeded.\n[line 2]\n")
+
+    def test_tail_calls_count_as_steps(self):
+        self.assertEqual(run("function spin(n) { return spin(n + 1); }\nspin(0);", ResourceLimits(max_steps=1000)),
+                         "Step limit of 1000 exceeded.\n[line 1]\n")
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_for_of_over_collections(self):
+        self.assertEqual(run("""
+for (var x of [1, 2]) print x;
+var s = new Set(); s.add("a"); for (var x of s) print x;
+var m = new Map(); m.set("k", 1); for (var entry of m) print entry;
+for (var c of "hi") print c;
+"""), "1\n2\na\n[k, 1]\nh\ni\n")
+
+    def test_generator_function(self):
+        self.assertEqual(run("""
+function* range(start, end) {
+    for (var i = start; i < end; i++) {
+        if (i == 3) continue;
+        yield i;
+    }
+}
+for (var x of range(0, 5)) { if (x == 4) break; print x; }
+"""), "0\n1\n2\n")
+
+    def test_next_and_suspended_environment(self):
+        self.assertEqual(run("""
+function* counter() { var n = 0; while (true) { n++; yield n; } }
+var a = counter(); var b = counter();
+a.next(); var r = a.next(); print r.value; print r.done; print b.next().value;
+function* once() { yield 1; }
+var g = once(); g.next(); print g.next().done;
+"""), "2\nFalse\n1\nTrue\n")
+
+    def test_nested_generators(self):
+        self.assertEqual(run("""
+function* inner(n) { for (var i = 0; i < n; i++) yield i; }
+function* outer() { for (var n of [1, 2]) { for (var x of inner(n)) { yield n * 10 + x; } } }
+var x;
+var out = []; for (x of outer()) out.push(x); print out; print x;
+"""), "[10, 20, 21]\n21\n")
+
+    def test_many_values_use_constant_stack(self):
+        self.assertEqual(run("""
+function* numbers() { var i = 0; while (true) { yield i; i++; } }
+var total = 0;
+for (var x of numbers()) { if (x == 50000) break; total += x; }
+print total;
+"""), "1249975000\n")
+
+    def test_host_iterables(self):
+        interpreter = Interpreter()
+        interpreter.globals.define("records", (i * 2 for i in range(5)))
+        statements = Parser(Scanner("var t = 0; for (var r of records) t += r; print t;").scan_tokens()).parse()
+        Resolver(interpreter).resolve(statements)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            interpreter.interpret(statements)
+        self.assertEqual(output.getvalue(), "20\n")
+
+    def test_errors(self):
+        self.assertEqual(run("for (var x of 1) {}"), "Value is not iterable.\n[line 1]\n")
+        statements = Parser(Scanner("function f() { yield 1; }").scan_tokens()).parse()
+        with self.assertRaises(RuntimeErrorException):
+            Resolver(Interpreter()).resolve(statements)
+
+
+
+class TestJSON(unittest.TestCase):
+
+    def run_with_text(self, source, text):
+        output = CapturedOutput()
+        context = Engine().create_context(output)
+        context.define("text", text)
+        context.run(source)
+        return output.getvalue()
+
+    def test_parse(self):
+        self.assertEqual(self.run_with_text("""
+var data = JSON.parse(text);
+print data.name; print data.tags; print data.tags[1][0]; print data.nested.x; print data;
+""", '{"name": "a", "tags": [1, [2.5, true]], "nested": {"x": null}}'),
+                         "a\n[1, [2.5, True]]\n2.5\nnull\nObject instance\n")
+
+    def test_stringify(self):
+        self.assertEqual(run("""
+class Point { constructor(x, y) { this.x = x; this.y = y; } norm() { return 0; } }
+print JSON.stringify(new Point(1, 2.5));
+print JSON.stringify([1.0, "é", null, true, 0 / 0, JSON.parse]);
+print JSON.stringify([1], null, 1);
+"""), '{"x":1,"y":2.5}\n[1,"é",null,true,null,null]\n[\n 1\n]\n')
+
+    def test_round_trip(self):
+        text = '[1,{"a":[2,"b"],"c":{"d":false}},-0.5]'
+        self.assertEqual(self.run_with_text("print JSON.stringify(JSON.parse(text));", text), text + "\n")
+
+    def test_errors(self):
+        self.assertIn("Invalid JSON", self.run_with_text("JSON.parse(text);", "{"))
+        self.assertIn("Invalid JSON", self.run_with_text("JSON.parse(text);", "NaN"))
+        self.assertEqual(run("var a = [1]; a.push(a); JSON.stringify(a);"),
+                         "Converting circular structure to JSON.\n[line 1]\n")
+
+    def test_stringify_host_values_and_typed_arrays(self):
+        output = CapturedOutput()
+        context = Engine().create_context(output)
+        context.bind("config", {"name": "a", "sizes": [1, 2.5, {"deep": True}]})
+        context.bind("raw", b"ab")
+        context.run("""
+var values = new Float64Array(2); values[1] = 0.5;
+print JSON.stringify(config);
+print JSON.stringify([config.sizes, raw, values, new Uint8Array(1)]);
+""")
+        self.assertEqual(output.getvalue(),
+                         '{"name":"a","sizes":[1,2.5,{"deep":true}]}\n[[1,2.5,{"deep":true}],[97,98],[0,0.5],[0]]\n')
+
+
+class TestTypedArrays(unittest.TestCase):
+
+    def test_construct(self):
+        self.assertEqual(run("""
+var a = new Float64Array(3); a[1] = 2.5;
+print a; print a.length; print a.byteLength;
+print new Int32Array([1, 2.7, 4294967297, -1, 0 / 0]);
+print new Uint8Array([300, -1, 5]);
+print new Int32Array(new Float64Array([-1.5, 3]));
+"""), "[0, 2.5, 0]\n3\n24\n[1, 2, 1, -1, 0]\n[44, 255, 5]\n[-1, 3]\n")
+
+    def test_elements(self):
+        self.assertEqual(run("""
+var a = new Int32Array(2);
+a[0] = 7.9; a[1] += 3; a[1]++; a[5] = 1;
+print a; print a[5];
+var total = 0;
+for (var x of a) total += x;
+print total; print Math.sum(a); print Math.map(a, Math.sqrt)[1];
+function inc(x) { return x + 1; }
+print Math.map(new Float64Array([4, 9]), inc);
+"""), "[7, 4]\nnull\n11\n11\n2\n[5, 10]\n")
+
+    def test_subarray_shares_buffer(self):
+        self.assertEqual(run("""
+var a = new Float64Array([1, 2, 3, 4]);
+var s = a.subarray(1, -1);
+s[0] = 9; s.fill(5);
+print s.length; print a; print a.subarray(-1); print a.subarray(3, 1);
+"""), "2\n[1, 5, 5, 4]\n[4]\n[]\n")
+
+    def test_map_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.bin")
+            with open(path, "wb") as file:
+                file.write(bytes([1, 2, 3, 4]))
+            output = CapturedOutput()
+            context = Engine().create_context(output)
+            context.map_file("data", path, writable=True)
+            context.run("print data; data[0] = 10;")
+            data = map_file(path)
+            context.define("data", data)
+            context.run("print data.length; data[0] = 1;")
+            self.assertEqual(output.getvalue(),
+                             "[1, 2, 3, 4]\n4\nCannot assign to a read-only Uint8Array.\n[line 1]\n")
+            self.assertEqual(data.view[0], 10)
+            data.view.release()
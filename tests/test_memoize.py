@@ -0,0 +1,117 @@
+import unittest
+from Engine import Engine
+from MemoizedFunction import DEFAULT_CACHE_SIZE, MemoizedFunction, memo_key
+from Output import CapturedOutput
+
+
+def run(source, optimize=False):
+    context = Engine(optimize=optimize).create_context(CapturedOutput())
+    context.run(source)
+    return context
+
+
+class TestMemoize(unittest.TestCase):
+
+    def test_directive(self):
+        context = run("""
+function fib(n) { "use memo"; if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+print fib(60);
+""")
+        self.assertEqual(context.output.getvalue(), "1548008755920\n")
+        fib = context.get("fib")
+        self.assertIsInstance(fib, MemoizedFunction)
+        self.assertEqual(fib.size, DEFAULT_CACHE_SIZE)
+        self.assertEqual((fib.hits, fib.misses, len(fib.entries)), (58, 61, 61))
+
+    def test_directive_with_a_size(self):
+        context = run('function f(n) { "use memo 2"; return n * 2; } f(1); f(2); f(3); f(3); f(1);')
+        f = context.get("f")
+        self.assertEqual(f.size, 2)
+        self.assertEqual((f.hits, f.misses), (1, 4))
+        self.assertEqual(list(f.entries), [memo_key([3]), memo_key([1])])
+
+    def test_other_strings_are_not_directives(self):
+        for source in ('function f() { "use memos"; }', 'function f() { "use memo 0"; }',
+                       'function f() { var a; "use memo"; }', 'function* f() { "use memo"; }'):
+            with self.subTest(source):
+                self.assertNotIsInstance(run(source).get("f"), MemoizedFunction)
+
+    def test_builtin_evicts_the_least_recently_used(self):
+        context = run("""
+var calls = 0;
+function square(n) { calls = calls + 1; return n * n; }
+var fast = memoize(square, 2);
+print fast(1) + fast(2) + fast(1) + fast(3) + fast(2);
+print calls;
+print square(1) == fast(1);
+""")
+        self.assertEqual(context.output.getvalue(), "19\n4\nTrue\n")
+        fast = context.get("fast")
+        self.assertEqual((fast.hits, fast.misses), (1, 5))
+        self.assertNotIsInstance(context.get("square"), MemoizedFunction)
+
+    def test_arguments_are_keyed_with_their_type(self):
+        context = run("""
+function show(x) { return x; }
+var m = memoize(show);
+print m(1); print m(1.0); print m(true); print 1 / m(0); print 1 / m(-0.0 * 1); print m("1"); print m(null);
+""")
+        self.assertEqual(context.output.getvalue(), "1\n1\nTrue\nInfinity\n-Infinity\n1\nnull\n")
+        m = context.get("m")
+        self.assertEqual((m.hits, m.misses), (1, 6))
+        self.assertEqual(memo_key([1]), memo_key([1.0]))
+        self.assertNotEqual(memo_key([1]), memo_key(["1"]))
+        self.assertNotEqual(memo_key([1]), memo_key([True]))
+
+    def test_recursion_is_as_deep_as_without_the_cache(self):
+        def deepest(directive):
+            source = "function f(n) { %s if (n < 1) return 0; return 1 + f(n - 1); } print f(%d);"
+            depth = 1
+            while "Maximum call stack" not in run(source % (directive, depth + 1)).output.getvalue():
+                depth += 1
+            return depth
+
+        self.assertEqual(deepest('"use memo";'), deepest(""))
+
+    def test_objects_bypass_the_cache(self):
+        context = run("""
+function first(a) { return a[0]; }
+var m = memoize(first);
+var items = [1];
+print m(items); items[0] = 2; print m(items);
+""")
+        self.assertEqual(context.output.getvalue(), "1\n2\n")
+        m = context.get("m")
+        self.assertEqual((m.hits, m.misses, m.bypassed), (0, 0, 2))
+
+    def test_calls_that_fail_are_not_cached(self):
+        context = run("function half(x) { return x / 2; } var m = memoize(half); print m(\"a\");")
+        self.assertIn("Operands must be numbers.", context.output.getvalue())
+        self.assertEqual(len(context.get("m").entries), 0)
+
+    def test_tail_calls_and_inlining_keep_the_cache(self):
+        source = """
+function inc(x) { "use memo"; return x + 1; }
+function next(x) { return inc(x); }
+function add(a, b) { return a + b; }
+var plus = memoize(add);
+add = plus;
+print next(1) + next(1) + add(2, 3) + add(2, 3);
+"""
+        for optimize in (False, True):
+            with self.subTest(optimize=optimize):
+                context = run(source, optimize)
+                self.assertEqual(context.output.getvalue(), "14\n")
+                self.assertEqual(context.get("inc").hits, 1)
+                self.assertEqual(context.get("plus").hits, 1)
+
+    def test_invalid_arguments(self):
+        errors = {
+            "memoize(3);": "memoize expects a function that is not a generator.",
+            "function* gen() { yield 1; } memoize(gen);": "memoize expects a function that is not a generator.",
+            "function f(x) { return x; } memoize(f, 0);": "The cache size must be a positive integer.",
+            "function f(x) { return x; } memoize(f, 1.5);": "The cache size must be a positive integer.",
+        }
+        for source, message in errors.items():
+            with self.subTest(source):
+                self.assertIn(message, run(source).output.getvalue())
@@ -0,0 +1,263 @@
+import unittest
+import os
+import tempfile
+import Expr
+import Stmt
+from Engine import Engine
+from Output import CapturedOutput
+
+# Each program is run with and without the optimizer and must print the same.
+CORPUS = {
+    "invariant property chain": """
+class Config { constructor() { this.scale = 3; this.offset = 4; } }
+class Shape { constructor() { this.config = new Config(); }
+  total(n) { var t = 0; var i = 0; while (i < n) { t = t + this.config.scale * this.config.offset + i; i = i + 1; } return t; } }
+print new Shape().total(10);
+""",
+    "property written in the loop": """
+class Box { constructor() { this.v = 1; } }
+var b = new Box();
+var seen = [];
+for (var i = 0; i < 4; i++) { seen.push(b.v * 2); b.v = b.v + 1; }
+print seen;
+""",
+    "property written through another reference": """
+class Box { constructor() { this.v = 1; } }
+var a = new Box();
+var b = a;
+var sum = 0;
+for (var i = 0; i < 4; i++) { sum = sum + a.v * 10; b.v = i; }
+print sum;
+""",
+    "property written by a call": """
+class Box { constructor() { this.v = 1; } }
+var b = new Box();
+function bump() { b.v = b.v + 1; }
+var sum = 0;
+for (var i = 0; i < 4; i++) { sum = sum + b.v * 10; bump(); }
+print sum;
+""",
+    "local assigned by a closure": """
+function run() {
+  var k = 1;
+  function bump() { k = k + 1; }
+  var sum = 0;
+  var i = 0;
+  while (i < 4) { sum = sum + k * 100; bump(); i = i + 1; }
+  return sum;
+}
+print run();
+""",
+    "local never assigned by a call": """
+function run(k) {
+  var sum = 0;
+  function noop() { return 0; }
+  for (var i = 0; i < 4; i++) { sum = sum + (k * 100 + k) + noop(); }
+  return sum;
+}
+print run(2);
+""",
+    "global assigned by a call": """
+var g = 1;
+function bump() { g = g + 1; }
+var sum = 0;
+for (var i = 0; i < 4; i++) { sum = sum + (g * 2 + 1); bump(); }
+print sum;
+""",
+    "array element written in the loop": """
+var a = [1, 2, 3];
+var out = [];
+for (var i = 0; i < 3; i++) { out.push(a[0] + a[1]); a[0] = a[0] + 10; }
+print out;
+""",
+    "array grown by push": """
+var a = [1];
+var lengths = [];
+for (var i = 0; i < 3; i++) { lengths.push(a.length + 0); a.push(i); }
+print lengths;
+""",
+    "array grown by an element write": """
+var a = [];
+var i = 0;
+while (i < 5) { a[a.length] = i; i = i + 1; }
+print a.length;
+""",
+    "length read around an element write": """
+var b = [];
+print b.length + 0;
+b[b.length] = 1;
+print b.length + 0;
+""",
+    "loop that never runs": """
+var missing = null;
+while (false) { print missing.field * 2; }
+print "done";
+""",
+    "error on the first iteration": """
+var missing = null;
+var i = 0;
+while (i < 3) { print i; print missing.field * 2; i = i + 1; }
+""",
+    "error on a later iteration": """
+class Box { constructor() { this.v = 1; } }
+var b = new Box();
+var items = [b, b, null];
+for (var i = 0; i < 3; i++) { var item = items[i]; print item.v * 2; }
+""",
+    "conditional first occurrence": """
+class Box { constructor() { this.v = 7; } }
+var b = new Box();
+for (var i = 0; i < 4; i++) { if (i % 2 == 1) print b.v * 3; print b.v * 3 + i; }
+""",
+    "nested loops": """
+var out = [];
+for (var i = 0; i < 3; i++) {
+  for (var j = 0; j < 3; j++) { out.push(i * 10 + j * 0 + (i + 1) * 2); }
+}
+print out;
+""",
+    "common subexpressions": """
+class P { constructor(x, y) { this.x = x; this.y = y; } }
+var p = new P(3, 4);
+var q = new P(1, 1);
+var a = (p.x - q.x) * (p.x - q.x) + (p.y - q.y) * (p.y - q.y);
+q.x = 2;
+var b = (p.x - q.x) * (p.x - q.x);
+print a;
+print b;
+""",
+    "global declared again": """
+var g = 2;
+print g * 3 + 1;
+var g = 5;
+print g * 3 + 1;
+""",
+    "short-circuit first occurrence": """
+class Box { constructor() { this.v = 4; } }
+var b = new Box();
+var flag = false;
+print flag && b.v * 2 > 1;
+print b.v * 2 > 1;
+""",
+    "assignment between occurrences": """
+{
+  var x = 2;
+  var first = x * x + x;
+  x = 3;
+  var second = x * x + x;
+  print first + second;
+}
+""",
+    "recursion": """
+function f(n) {
+  var total = 0;
+  var i = 0;
+  while (i < 2) { if (n > 0) total = total + f(n - 1); total = total + (n * 10 + 1); i = i + 1; }
+  return total;
+}
+print f(3);
+""",
+    "break continue and return": """
+function find(items, wanted) {
+  for (var i = 0; i < items.length; i++) {
+    if (items[i] == wanted * 2) return i;
+    if (items[i] > wanted * 100) break;
+    if (items[i] < wanted * 2) continue;
+  }
+  return -1;
+}
+print find([1, 2, 4, 8], 2);
+print find([1, 900, 4], 2);
+print find([1], 2);
+""",
+    "generator": """
+function* counter(box) { var i = 0; while (i < 3) { yield box.v * 2 + i; i = i + 1; } }
+class Box { constructor() { this.v = 1; } }
+var b = new Box();
+for (var x of counter(b)) { print x; b.v = b.v + 1; }
+""",
+    "strings": """
+class Named { constructor() { this.first = "Ada"; this.last = "Lovelace"; } }
+var n = new Named();
+var out = "";
+for (var i = 0; i < 3; i++) { out = out + n.first + " " + n.last + ";"; }
+print out;
+print n.first + n.last == n.first + n.last;
+""",
+    "loop variable updated in the increment": """
+var total = 0;
+var step = 2;
+for (var i = 0; i < 10; i = i + step * 1) { total = total + i; }
+print total;
+""",
+    "function declared in the loop": """
+var results = [];
+for (var i = 0; i < 3; i++) { function get() { return i * 2; } results.push(get() + i * 2); }
+print results;
+""",
+}
+
+
+def run(source, optimize):
+    context = Engine(optimize=optimize).create_context(CapturedOutput())
+    context.run(source)
+    return context.output.getvalue()
+
+
+def count_cached(node):
+    if isinstance(node, list):
+        return sum(count_cached(element) for element in node)
+    if isinstance(node, (Expr.Expr, Stmt.Stmt)):
+        return int(isinstance(node, Expr.Cached)) + sum(count_cached(value) for value in vars(node).values())
+    return 0
+
+
+def cached(source):
+    context = Engine(optimize=True).create_context(CapturedOutput())
+    return count_cached(context.compile(source).statements)
+
+
+class TestOptimizer(unittest.TestCase):
+
+    def test_corpus_prints_the_same_with_and_without_the_optimizer(self):
+        for name, source in CORPUS.items():
+            with self.subTest(name):
+                self.assertEqual(run(source, True), run(source, False))
+
+    def test_optimizer_is_opt_in(self):
+        self.assertEqual(cached(CORPUS["invariant property chain"]), 1)
+        context = Engine().create_context(CapturedOutput())
+        self.assertEqual(count_cached(context.compile(CORPUS["invariant property chain"]).statements), 0)
+
+    def test_written_properties_and_calls_prevent_hoisting(self):
+        self.assertEqual(cached(CORPUS["property written in the loop"]), 0)
+        self.assertEqual(cached(CORPUS["property written by a call"]), 0)
+        self.assertEqual(cached(CORPUS["local assigned by a closure"]), 0)
+
+    def test_locals_survive_calls(self):
+        # `k * 100 + k` is hoisted even though the loop calls a function.
+        self.assertEqual(cached(CORPUS["local never assigned by a call"]), 1)
+
+    def test_repeated_expressions_are_shared(self):
+        # (p.x - q.x) and (p.y - q.y) before the write to q.x, and (p.x - q.x) after it.
+        self.assertEqual(cached(CORPUS["common subexpressions"]), 6)
+
+    def test_generator_bodies_are_left_alone(self):
+        source = "function* g(b) { var i = 0; while (i < 3) { yield b.v * 2; i = i + 1; } }"
+        self.assertEqual(cached(source), 0)
+
+    def test_optimized_modules(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "shapes.js"), "w") as file:
+                file.write("""
+class Box { constructor() { this.v = 2; } }
+var box = new Box();
+export function total(n) { var t = 0; for (var i = 0; i < n; i++) { t = t + box.v * box.v; } return t; }
+export var twice = box.v * box.v + box.v * box.v;
+""")
+            source = 'import { total, twice } from "./shapes.js"; print total(5); print twice;'
+            path = os.path.join(directory, "main.js")
+            for optimize in (False, True):
+                context = Engine(optimize=optimize).create_context(CapturedOutput())
+                context.run(source, path)
+                self.assertEqual(context.output.getvalue(), "20\n8\n")
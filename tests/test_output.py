@@ -0,0 +1,44 @@
+import io
+import unittest
+from Output import Output, BufferedOutput, CapturedOutput
+from Engine import Engine
+
+
+class TestOutput(unittest.TestCase):
+
+    def test_output_writes_through(self):
+        stream = io.StringIO()
+        output = Output(stream)
+        output.write("a\n")
+        self.assertEqual(stream.getvalue(), "a\n")
+
+    def test_buffered_output_waits_for_flush(self):
+        stream = io.StringIO()
+        output = BufferedOutput(stream, buffer_size=10)
+        output.write("abc\n")
+        self.assertEqual(stream.getvalue(), "")
+        output.write("defghij\n")
+        self.assertEqual(stream.getvalue(), "abc\ndefghij\n")
+        output.write("k\n")
+        output.flush()
+        self.assertEqual(stream.getvalue(), "abc\ndefghij\nk\n")
+
+    def test_run_flushes_at_end(self):
+        stream = io.StringIO()
+        context = Engine().create_context(BufferedOutput(stream))
+        context.run("for (var i = 0; i < 3; i = i + 1) { console.log(i); }")
+        self.assertEqual(stream.getvalue(), "0\n1\n2\n")
+
+    def test_output_is_flushed_before_runtime_error(self):
+        stream = io.StringIO()
+        context = Engine().create_context(BufferedOutput(stream))
+        context.run("print 1;\nprint missing;")
+        self.assertEqual(stream.getvalue(), "1\nUndefined variable 'missing'.\n[line 2]\n")
+
+    def test_captured_output(self):
+        output = CapturedOutput()
+        context = Engine().create_context(output)
+        context.run("print \"a\"; console.log(\"b\");")
+        self.assertEqual(output.getvalue(), "a\nb\n")
+        context.run("print;")
+        self.assertTrue(output.getvalue().endswith("Error at ';': Expect expression.\n"))
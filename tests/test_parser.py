@@ -1,5 +1,6 @@
 import unittest
 from Parser import Parser
+from Scanner import Scanner
 from Token import Token, TokenType
 import Expr
 import Stmt
@@ -116,4 +117,44 @@ class TestParser(unittest.TestCase):
         self.assertEqual(stmt.condition.value, True)
         self.assertIsInstance(stmt.body, Stmt.Expression)
         self.assertIsInstance(stmt.body.expression, Expr.Literal)
-        self.assertEqual(stmt.body.expression.value, 1)
\ No newline at end of file
+        self.assertEqual(stmt.body.expression.value, 1)
+
+    def test_parser_array_literal(self):
+        tokens = Scanner("[1, 2, 3];").scan_tokens()
+        stmt = Parser(tokens).statement()
+        self.assertIsInstance(stmt.expression, Expr.Array)
+        self.assertEqual([element.value for element in stmt.expression.elements], [1, 2, 3])
+
+    def test_parser_index_assignment(self):
+        tokens = Scanner("a[0] = a[1];").scan_tokens()
+        stmt = Parser(tokens).statement()
+        self.assertIsInstance(stmt.expression, Expr.SetIndex)
+        self.assertEqual(stmt.expression.object.name.lexeme, "a")
+        self.assertIsInstance(stmt.expression.value, Expr.Index)
+        self.assertEqual(stmt.expression.value.index.value, 1)
+
+    def test_parser_for_of(self):
+        stmt = Parser(Scanner("for (var of of items) print of;").scan_tokens()).statement()
+        self.assertIsInstance(stmt, Stmt.ForOf)
+        self.assertTrue(stmt.declare)
+        self.assertEqual(stmt.name.lexeme, "of")
+        self.assertEqual(stmt.iterable.name.lexeme, "items")
+
+    def test_parser_generator_function(self):
+        statements = Parser(Scanner("function* g() { yield 1; }").scan_tokens()).parse()
+        self.assertTrue(statements[0].is_generator)
+        self.assertIsInstance(statements[0].body[0], Stmt.Yield)
+
+    def test_parser_import_export(self):
+        statements = Parser(Scanner("""
+import { a, b as c } from "./lib.js";
+import * as lib from "./lib.js";
+export function* from() { yield 1; }
+export { a as as };
+""").scan_tokens()).parse()
+        self.assertEqual([name.lexeme for name in statements[0].aliases], ["a", "c"])
+        self.assertEqual(statements[0].path.literal, "./lib.js")
+        self.assertEqual(statements[1].namespace.lexeme, "lib")
+        self.assertTrue(statements[2].declaration.is_generator)
+        self.assertEqual(statements[2].names[0].lexeme, "from")
+        self.assertEqual(statements[3].aliases[0].lexeme, "as")
@@ -0,0 +1,48 @@
+import unittest
+import Rope
+from Rope import concat, flatten
+from tests.test_interpreter import run
+
+
+class TestRope(unittest.TestCase):
+
+    def test_short_strings_are_concatenated_eagerly(self):
+        self.assertEqual(concat("ab", "cd"), "abcd")
+
+    def test_appends_share_parts(self):
+        chunk = "x" * Rope.MIN_ROPE_LENGTH
+        first = concat(chunk, "a")
+        second = concat(first, "b")
+        third = concat(second, "c")
+        self.assertIsInstance(third, Rope.Rope)
+        self.assertIs(first.parts, third.parts)
+        self.assertEqual(flatten(third), chunk + "abc")
+        self.assertEqual(flatten(first), chunk + "a")
+        self.assertEqual(third.length, len(chunk) + 3)
+
+    def test_branching_does_not_corrupt_earlier_ropes(self):
+        base = concat("y" * Rope.MIN_ROPE_LENGTH, "-")
+        left = concat(base, "left")
+        right = concat(base, "right")
+        self.assertEqual(flatten(left), "y" * Rope.MIN_ROPE_LENGTH + "-left")
+        self.assertEqual(flatten(right), "y" * Rope.MIN_ROPE_LENGTH + "-right")
+        self.assertEqual(flatten(concat("<", right)), "<" + "y" * Rope.MIN_ROPE_LENGTH + "-right")
+
+    def test_ropes_in_scripts(self):
+        source = """
+        var s = "";
+        for (var i = 0; i < 100; i = i + 1) { s = s + "ab"; }
+        var t = "";
+        for (var i = 0; i < 100; i = i + 1) { t = t + "ab"; }
+        print s == t;
+        print s == "ab";
+        var a = [];
+        a.push(s);
+        print a.pop() == t;
+        """
+        self.assertEqual(run(source), "True\nFalse\nTrue\n")
+        self.assertEqual(run("var s = \"\"; for (var i = 0; i < 40; i = i + 1) { s = s + \"ab\"; } print s;"), "ab" * 40 + "\n")
+
+    def test_repeated_doubling_does_not_overflow(self):
+        source = "var s = \"x\"; for (var i = 0; i < 200; i = i + 1) { s = s + s; } print \"done\";"
+        self.assertEqual(run(source), "done\n")
@@ -214,4 +214,11 @@ class TestScanner(unittest.TestCase):
         self.assertEqual(len(scanner.tokens), 2)
         self.assertEqual(scanner.tokens[0].type, TokenType.STRING)
         self.assertEqual(scanner.tokens[1].type, TokenType.EOF)
-        self.assertEqual(scanner.tokens[0].literal, "test\nstring")
\ No newline at end of file
+        self.assertEqual(scanner.tokens[0].literal, "test\nstring")
+    def test_scanner_compound_operators(self):
+        scanner = Scanner("+= -= *= /= %= ++ -- + -")
+        scanner.scan_tokens()
+        self.assertEqual([token.type for token in scanner.tokens], [
+            TokenType.PLUS_EQUAL, TokenType.MINUS_EQUAL, TokenType.STAR_EQUAL, TokenType.SLASH_EQUAL,
+            TokenType.MODULO_EQUAL, TokenType.PLUS_PLUS, TokenType.MINUS_MINUS, TokenType.PLUS, TokenType.MINUS,
+            TokenType.EOF])
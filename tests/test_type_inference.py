@@ -0,0 +1,105 @@
+import unittest
+import operator
+import os
+import tempfile
+import Expr
+import Stmt
+import JSNumber
+from Engine import Engine
+from Output import CapturedOutput
+from ModuleLoader import compile_module
+
+
+def compile(source):
+    context = Engine().create_context(CapturedOutput())
+    return context, context.compile(source)
+
+
+def run(source):
+    context, script = compile(source)
+    context.execute(script)
+    return context.output.getvalue()
+
+
+def binaries(node, found=None):
+    """Returns the binary nodes under `node` in source order."""
+    if found is None:
+        found = []
+    if isinstance(node, list):
+        for element in node:
+            binaries(element, found)
+    elif isinstance(node, (Expr.Expr, Stmt.Stmt)):
+        if isinstance(node, Expr.Binary):
+            found.append(node)
+        for value in vars(node).values():
+            binaries(value, found)
+    return found
+
+
+class TestTypeInference(unittest.TestCase):
+
+    def test_loop_counters_and_arithmetic_are_unchecked(self):
+        _, script = compile("""
+{
+    var total = 0;
+    for (var i = 0; i < 10; i++) { total += i * 2.5; }
+}
+""")
+        self.assertEqual(str(script.types), "2/2 locals, 11/11 expressions typed, 4/4 operations unchecked")
+        less, times = binaries(script.statements)
+        self.assertIs(less.operation, operator.lt)
+        self.assertIs(times.operation, JSNumber.multiply)
+
+    def test_globals_are_not_typed(self):
+        _, script = compile("var n = 1; print n + 1;")
+        self.assertIsNone(binaries(script.statements)[0].operation)
+        self.assertEqual(run("var n = 1; n = \"a\"; print n + \"b\";"), "ab\n")
+
+    def test_every_assignment_counts(self):
+        source = """
+{
+    var n = 0;
+    function reset() { n = "none"; }
+    reset();
+    print n + "!";
+}
+"""
+        _, script = compile(source)
+        self.assertTrue(all(binary.operation is None for binary in binaries(script.statements)))
+        self.assertEqual(run(source), "none!\n")
+        self.assertEqual(run("{ var s = \"a\"; var t = s + 1; }"),
+                         "Operands must be two numbers or two strings.\n[line 1]\n")
+
+    def test_strings_and_booleans(self):
+        _, script = compile("""
+{
+    var s = "a";
+    s += "b";
+    var done = 1 < 2;
+    var mixed = s || 1;
+}
+""")
+        self.assertEqual(script.types.typed_locals, 2)
+
+    def test_unchecked_operations_keep_number_semantics(self):
+        self.assertEqual(run("""
+{
+    var big = 9007199254740992;
+    var zero = 0;
+    var i = 5;
+    var j = i++;
+    print big + big; print -7 % 2; print zero * -1; print 1 / zero; print 7 / 2; print j + i;
+}
+"""), "1.8014398509481984e+16\n-1\n-0\nInfinity\n3.5\n11\n")
+
+    def test_module_top_level_is_not_typed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "module.js")
+            with open(path, "w") as file:
+                file.write("export var x = 1; x = x + 1; function f() { var y = 2; return y * y; }")
+            module = compile_module(path, 0)
+        self.assertEqual(module.types.locals, 3)
+        self.assertEqual(module.types.typed_locals, 1)
+        add, times = binaries(module.statements)
+        self.assertIsNone(add.operation)
+        self.assertIs(times.operation, JSNumber.multiply)
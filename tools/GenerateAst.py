@@ -69,29 +69,45 @@ if __name__ == '__main__':
     output_dir = args[0]
 
     define_ast(output_dir, 'Expr', [
-        'Assign   : Token name, Expr value',
-        'Call     : Expr callee, Token paren, List[Expr] arguments, bool has_new_keyword',
-        'Get      : Expr object, Token name',
-        'Binary   : Expr left, Token operator, Expr right',
-        'Grouping : Expr expression',
-        'Literal  : object value',
-        'Logical  : Expr left, Token operator, Expr right',
-        'Set      : Expr object, Token name, Expr value',
-        'Super    : Token keyword, Token method',
-        'This     : Token keyword',
-        'Unary    : Token operator, Expr right',
-        'Variable : Token name',
+        'Array            : Token bracket, List[Expr] elements',
+        'Assign           : Token name, Expr value',
+        'Cached           : Token name, Expr expression',
+        'Call             : Expr callee, Token paren, List[Expr] arguments, bool has_new_keyword',
+        'CompoundAssign   : Token name, Token operator, Expr value, bool postfix, object operation',
+        'CompoundSet      : Expr object, Token name, Token operator, Expr value, bool postfix',
+        'CompoundSetIndex : Expr object, Token bracket, Expr index, Token operator, Expr value, bool postfix',
+        'Get              : Expr object, Token name',
+        'Binary           : Expr left, Token operator, Expr right, object operation',
+        'Grouping         : Expr expression',
+        'Index            : Expr object, Token bracket, Expr index',
+        'Inlined          : Expr.Call call, Stmt.Function function, Expr body',
+        'Literal          : object value',
+        'Logical          : Expr left, Token operator, Expr right',
+        'Parameter        : Token name, int index',
+        'Set              : Expr object, Token name, Expr value',
+        'SetIndex         : Expr object, Token bracket, Expr index, Expr value',
+        'Super            : Token keyword, Token method',
+        'This             : Token keyword',
+        'Unary            : Token operator, Expr right',
+        'Variable         : Token name',
     ])
 
     define_ast(output_dir, 'Stmt', [
         'Block      : List[Stmt] statements',
+        'Break      : Token keyword',
+        'CacheScope : List[Token] names, List[Stmt] body',
         'Class      : Token name, Expr.Variable superclass, List[Stmt.Function] methods',
+        'Continue   : Token keyword',
+        'Export     : Token keyword, Stmt declaration, List[Token] names, List[Token] aliases',
         'Expression : Expr expression',
-        'Function   : Token name, List[Token] params, List[Stmt] body',
+        'ForOf      : Token keyword, Token name, bool declare, Expr iterable, Stmt body',
+        'Function   : Token name, List[Token] params, List[Stmt] body, bool is_generator',
         'If         : Expr condition, Stmt then_branch, Stmt else_branch',
+        'Import     : Token keyword, List[Token] names, List[Token] aliases, Token namespace, Token path',
         'Print      : Expr expression',
-        'Return     : Token keyword, Expr value',
+        'Return     : Token keyword, Expr value, bool tail_call',
         'Var        : Token name, Expr initializer',
-        'While      : Expr condition, Stmt body',
+        'While      : Token keyword, Expr condition, Stmt body, Expr increment',
+        'Yield      : Token keyword, Expr value',
     ])
 